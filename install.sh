@@ -97,6 +97,13 @@ else
     ollama pull llama3.2:3b
     echo -e "${GREEN}✓ Model downloaded${NC}"
 fi
+if ollama list | grep -q "llama3.2:1b"; then
+    echo -e "${GREEN}✓ Llama 3.2 1B model already downloaded${NC}"
+else
+    echo "Downloading Llama 3.2 1B model for intent classification (1.3GB)..."
+    ollama pull llama3.2:1b
+    echo -e "${GREEN}✓ Model downloaded${NC}"
+fi
 echo ""
 
 # Create virtual environment
@@ -2,6 +2,13 @@
 
 __version__ = "1.0.0"
 
-from kai.core.assistant import Assistant
-
 __all__ = ["Assistant"]
+
+
+def __getattr__(name):
+    # Imported on first use so thin clients (kai query talking to the
+    # daemon) do not load the LLM, plugin and config stack
+    if name == "Assistant":
+        from kai.core.assistant import Assistant
+        return Assistant
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,385 @@
+"""LLM server backends.
+
+LLMEngine talks to its server through the subset of the ``ollama.Client``
+interface it needs: ``chat``, ``embed``, ``generate`` (warm-up) and ``ps``,
+with Ollama-shaped responses. The ``ollama`` backend uses the official
+clients directly. The ``openai`` backend adapts OpenAI-compatible servers
+(llama.cpp server, vLLM, LocalAI) to the same interface over a pooled httpx
+client, so caching, routing, host pools and metrics work unchanged.
+"""
+
+import json
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+import httpx
+import ollama
+
+BACKENDS = ("ollama", "openai")
+
+# Default server URL when no host is given (llama.cpp server's default port)
+OPENAI_DEFAULT_HOST = "http://127.0.0.1:8080"
+
+# Path probed by host pool health checks
+HEALTH_PATHS = {"ollama": "/api/version", "openai": "/v1/models"}
+
+
+def auth_headers(backend: str, api_key: Optional[str] = None) -> Dict[str, str]:
+    """Get the headers that authenticate requests to a backend's servers.
+
+    Args:
+        backend: "ollama" or "openai"
+        api_key: Bearer token, defaults to OPENAI_API_KEY for the openai backend
+
+    Returns:
+        Header dict, empty if the server needs no authentication
+    """
+    if backend != "openai":
+        return {}
+    api_key = api_key or os.environ.get("OPENAI_API_KEY")
+    return {"Authorization": f"Bearer {api_key}"} if api_key else {}
+
+
+def create_client(backend: str, host: Optional[str] = None, api_key: Optional[str] = None, **kwargs):
+    """Create a synchronous client for a backend.
+
+    Args:
+        backend: "ollama" or "openai"
+        host: Server URL, defaults to the backend's default
+        api_key: Bearer token for OpenAI-compatible servers that require one
+        **kwargs: httpx client options (limits, event_hooks, ...)
+
+    Returns:
+        Client with the ollama.Client chat/embed/generate/ps interface
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "ollama":
+        return ollama.Client(host=host, **kwargs)
+    if backend == "openai":
+        return OpenAIClient(host=host, api_key=api_key, **kwargs)
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+def create_async_client(backend: str, host: Optional[str] = None, api_key: Optional[str] = None, **kwargs):
+    """Create an async client for a backend.
+
+    Args:
+        backend: "ollama" or "openai"
+        host: Server URL, defaults to the backend's default
+        api_key: Bearer token for OpenAI-compatible servers that require one
+        **kwargs: httpx client options (limits, event_hooks, ...)
+
+    Returns:
+        Client with the ollama.AsyncClient chat/embed/generate/ps interface
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    if backend == "ollama":
+        return ollama.AsyncClient(host=host, **kwargs)
+    if backend == "openai":
+        return AsyncOpenAIClient(host=host, api_key=api_key, **kwargs)
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+
+class _OpenAIBase:
+    """Request building and response translation shared by both clients."""
+
+    def __init__(self, host: Optional[str], api_key: Optional[str]):
+        host = (host or os.environ.get("OPENAI_BASE_URL") or OPENAI_DEFAULT_HOST).rstrip("/")
+        # Accept base URLs given with or without the /v1 suffix
+        self.host = host[:-3] if host.endswith("/v1") else host
+        self.headers = auth_headers("openai", api_key)
+
+    @staticmethod
+    def _chat_body(model: str, messages: list, format: Optional[Any], options: Optional[Dict[str, Any]],
+                   stream: bool) -> dict:
+        """Translate Ollama chat arguments into a /v1/chat/completions body."""
+        body = {"model": model, "messages": messages, "stream": stream}
+        options = options or {}
+        if options.get("num_predict") is not None:
+            body["max_tokens"] = options["num_predict"]
+        for name in ("temperature", "top_p", "stop"):
+            if options.get(name) is not None:
+                body[name] = options[name]
+        # num_ctx is fixed when an OpenAI-compatible server starts
+
+        if format == "json":
+            body["response_format"] = {"type": "json_object"}
+        elif isinstance(format, dict):
+            body["response_format"] = {"type": "json_schema", "json_schema": {"name": "response", "schema": format}}
+
+        if stream:
+            body["stream_options"] = {"include_usage": True}
+        return body
+
+    @staticmethod
+    def _usage(model: str, payload: dict) -> dict:
+        """Translate token usage (and llama.cpp timings) into Ollama's final-response fields."""
+        usage = payload.get("usage") or {}
+        timings = payload.get("timings") or {}
+        return {
+            "model": model,
+            "done": True,
+            "prompt_eval_count": timings.get("prompt_n", usage.get("prompt_tokens", 0)),
+            "prompt_eval_duration": int(timings.get("prompt_ms", 0) * 1e6),
+            "eval_count": timings.get("predicted_n", usage.get("completion_tokens", 0)),
+            "eval_duration": int(timings.get("predicted_ms", 0) * 1e6),
+        }
+
+    def _chat_response(self, model: str, payload: dict) -> dict:
+        """Translate a non-streaming completion."""
+        response = self._usage(model, payload)
+        response["message"] = {"role": "assistant", "content": payload["choices"][0]["message"].get("content") or ""}
+        return response
+
+    @staticmethod
+    def _delta(model: str, payload: dict) -> Optional[dict]:
+        """Translate a streamed chunk into an Ollama stream part, or None if it carries no text."""
+        choices = payload.get("choices") or []
+        content = (choices[0].get("delta") or {}).get("content") if choices else None
+        if not content:
+            return None
+        return {"model": model, "done": False, "message": {"role": "assistant", "content": content}}
+
+    def _final(self, model: str, payload: dict) -> dict:
+        """Build the closing stream part from the last chunk seen."""
+        response = self._usage(model, payload)
+        response["message"] = {"role": "assistant", "content": ""}
+        return response
+
+    @staticmethod
+    def _events(lines) -> Iterator[dict]:
+        """Decode server-sent event lines into JSON payloads."""
+        for line in lines:
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            yield json.loads(data)
+
+    @staticmethod
+    def _models(payload: dict) -> dict:
+        """Translate /v1/models into an Ollama /api/ps response."""
+        return {"models": [{"name": m["id"], "model": m["id"]} for m in payload.get("data", [])]}
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response):
+        """Raise ollama.ResponseError like the Ollama clients, so failover logic applies."""
+        if response.is_error:
+            try:
+                error = response.json().get("error") or response.text
+            except ValueError:
+                error = response.text
+            if isinstance(error, dict):
+                error = error.get("message", str(error))
+            raise ollama.ResponseError(error, response.status_code)
+
+
+class OpenAIClient(_OpenAIBase):
+    """OpenAI-compatible server behind the ollama.Client interface."""
+
+    def __init__(self, host: Optional[str] = None, api_key: Optional[str] = None, **kwargs):
+        """Initialize OpenAI-compatible client.
+
+        Args:
+            host: Server URL, defaults to OPENAI_BASE_URL or http://127.0.0.1:8080
+            api_key: Bearer token, defaults to OPENAI_API_KEY
+            **kwargs: httpx.Client options (limits, event_hooks, timeout, ...)
+        """
+        super().__init__(host, api_key)
+        kwargs.setdefault("timeout", None)
+        self._client = httpx.Client(base_url=self.host, headers=self.headers, **kwargs)
+
+    def chat(self, model: str, messages: list, format: Optional[Any] = None,
+             options: Optional[Dict[str, Any]] = None, stream: bool = False, keep_alive=None):
+        """Run a chat completion.
+
+        Args:
+            model: Model name
+            messages: List of message dicts
+            format: "json" or a JSON schema dict
+            options: Ollama generation options
+            stream: Return an iterator of parts instead of the full response
+            keep_alive: Ignored; OpenAI-compatible servers manage residency
+
+        Returns:
+            Ollama-shaped response dict, or an iterator of stream parts
+        """
+        body = self._chat_body(model, messages, format, options, stream)
+        if stream:
+            return self._stream(model, body)
+
+        response = self._client.post("/v1/chat/completions", json=body)
+        self._raise_for_status(response)
+        return self._chat_response(model, response.json())
+
+    def _stream(self, model: str, body: dict) -> Iterator[dict]:
+        with self._client.stream("POST", "/v1/chat/completions", json=body) as response:
+            if response.is_error:
+                response.read()
+                self._raise_for_status(response)
+            last = {}
+            for payload in self._events(response.iter_lines()):
+                last = payload if payload.get("usage") or payload.get("timings") else last
+                part = self._delta(model, payload)
+                if part:
+                    yield part
+            yield self._final(model, last)
+
+    def embed(self, model: str, input: List[str], keep_alive=None) -> dict:
+        """Embed texts.
+
+        Args:
+            model: Embedding model name
+            input: Strings to embed
+            keep_alive: Ignored
+
+        Returns:
+            Dict with "embeddings", one vector per text
+        """
+        response = self._client.post("/v1/embeddings", json={"model": model, "input": input})
+        self._raise_for_status(response)
+        data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+        return {"model": model, "embeddings": [item["embedding"] for item in data]}
+
+    def generate(self, model: str, prompt: str = "", keep_alive=None) -> dict:
+        """Load a model with a one-token completion (used for warm-up).
+
+        Args:
+            model: Model name
+            prompt: Prompt text, may be empty
+            keep_alive: Ignored
+
+        Returns:
+            Ollama-shaped response dict
+        """
+        return self.chat(model, [{"role": "user", "content": prompt or " "}], options={"num_predict": 1})
+
+    def ps(self) -> dict:
+        """List models the server serves.
+
+        Returns:
+            Dict with "models" in Ollama /api/ps shape
+        """
+        response = self._client.get("/v1/models")
+        self._raise_for_status(response)
+        return self._models(response.json())
+
+    def list(self) -> dict:
+        """List models the server can serve; the same as ps() for these servers.
+
+        Returns:
+            Dict with "models" in Ollama /api/tags shape
+        """
+        return self.ps()
+
+    def close(self):
+        """Close pooled connections."""
+        self._client.close()
+
+
+class AsyncOpenAIClient(_OpenAIBase):
+    """OpenAI-compatible server behind the ollama.AsyncClient interface."""
+
+    def __init__(self, host: Optional[str] = None, api_key: Optional[str] = None, **kwargs):
+        """Initialize async OpenAI-compatible client.
+
+        Args:
+            host: Server URL, defaults to OPENAI_BASE_URL or http://127.0.0.1:8080
+            api_key: Bearer token, defaults to OPENAI_API_KEY
+            **kwargs: httpx.AsyncClient options (limits, event_hooks, timeout, ...)
+        """
+        super().__init__(host, api_key)
+        kwargs.setdefault("timeout", None)
+        self._client = httpx.AsyncClient(base_url=self.host, headers=self.headers, **kwargs)
+
+    async def chat(self, model: str, messages: list, format: Optional[Any] = None,
+                   options: Optional[Dict[str, Any]] = None, stream: bool = False, keep_alive=None):
+        """Async variant of OpenAIClient.chat.
+
+        Args:
+            model: Model name
+            messages: List of message dicts
+            format: "json" or a JSON schema dict
+            options: Ollama generation options
+            stream: Return an async iterator of parts instead of the full response
+            keep_alive: Ignored
+
+        Returns:
+            Ollama-shaped response dict, or an async iterator of stream parts
+        """
+        body = self._chat_body(model, messages, format, options, stream)
+        if stream:
+            return self._stream(model, body)
+
+        response = await self._client.post("/v1/chat/completions", json=body)
+        self._raise_for_status(response)
+        return self._chat_response(model, response.json())
+
+    async def _stream(self, model: str, body: dict) -> AsyncIterator[dict]:
+        async with self._client.stream("POST", "/v1/chat/completions", json=body) as response:
+            if response.is_error:
+                await response.aread()
+                self._raise_for_status(response)
+            last = {}
+            async for line in response.aiter_lines():
+                for payload in self._events([line]):
+                    last = payload if payload.get("usage") or payload.get("timings") else last
+                    part = self._delta(model, payload)
+                    if part:
+                        yield part
+            yield self._final(model, last)
+
+    async def embed(self, model: str, input: List[str], keep_alive=None) -> dict:
+        """Async variant of OpenAIClient.embed.
+
+        Args:
+            model: Embedding model name
+            input: Strings to embed
+            keep_alive: Ignored
+
+        Returns:
+            Dict with "embeddings", one vector per text
+        """
+        response = await self._client.post("/v1/embeddings", json={"model": model, "input": input})
+        self._raise_for_status(response)
+        data = sorted(response.json()["data"], key=lambda item: item.get("index", 0))
+        return {"model": model, "embeddings": [item["embedding"] for item in data]}
+
+    async def generate(self, model: str, prompt: str = "", keep_alive=None) -> dict:
+        """Async variant of OpenAIClient.generate.
+
+        Args:
+            model: Model name
+            prompt: Prompt text, may be empty
+            keep_alive: Ignored
+
+        Returns:
+            Ollama-shaped response dict
+        """
+        return await self.chat(model, [{"role": "user", "content": prompt or " "}], options={"num_predict": 1})
+
+    async def ps(self) -> dict:
+        """Async variant of OpenAIClient.ps.
+
+        Returns:
+            Dict with "models" in Ollama /api/ps shape
+        """
+        response = await self._client.get("/v1/models")
+        self._raise_for_status(response)
+        return self._models(response.json())
+
+    async def list(self) -> dict:
+        """Async variant of OpenAIClient.list.
+
+        Returns:
+            Dict with "models" in Ollama /api/tags shape
+        """
+        return await self.ps()
+
+    async def close(self):
+        """Close pooled connections."""
+        await self._client.aclose()
@@ -0,0 +1,369 @@
+"""LLM response cache.
+
+Two tiers sit in front of the model: an in-memory LRU for the current
+process and a SQLite file shared across runs. Entries are keyed on model,
+messages and generation options, and expire after a per-task TTL.
+
+The async methods never touch SQLite on the event loop: disk lookups run on
+a worker thread and writes are queued to a single writer thread. Access
+times of disk hits are batched and written with the next write.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+_open_caches: "weakref.WeakSet[ResponseCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_caches():
+    for cache in list(_open_caches):
+        cache.close()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of LLM responses."""
+
+    # Flush counters to disk after this many lookups
+    STATS_FLUSH_INTERVAL = 50
+
+    def __init__(self, path: Optional[str] = None, memory_entries: int = 256,
+                 disk_entries: int = 5000, ttls: Optional[Dict[str, float]] = None):
+        """Initialize response cache.
+
+        Args:
+            path: SQLite database file, or None for a memory-only cache
+            memory_entries: Maximum entries in the in-memory LRU tier
+            disk_entries: Maximum entries in the on-disk tier
+            ttls: Seconds to keep a response per task, with a "default" key
+        """
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttls = ttls or {}
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()  # Memory tier and counters
+        self._db_lock = threading.Lock()  # SQLite connection, touched and stale
+        self._counters = self._empty_counters()
+        self._pending = self._empty_counters()
+        self._touched: Dict[str, float] = {}  # Disk hits whose access time is not written yet
+        self._stale = set()  # Expired disk rows to delete with the next write
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._db = None
+
+        if path:
+            self.path = Path(path).expanduser()
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    task TEXT,
+                    value TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+                CREATE TABLE IF NOT EXISTS stats (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+            """)
+            self._db.commit()
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="kai-cache")
+            _open_caches.add(self)
+        else:
+            self.path = None
+
+    @classmethod
+    def from_config(cls, config) -> Optional["ResponseCache"]:
+        """Create a cache from the ``cache.*`` configuration.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Response cache, or None if caching is disabled
+        """
+        if not config.get("cache.enabled", True):
+            return None
+
+        path = config.get("cache.path")
+        if path is None:
+            path = config.config_path.parent / "llm_cache.db"
+
+        return cls(
+            path=str(path) if config.get("cache.persistent", True) else None,
+            memory_entries=config.get("cache.memory_entries", 256),
+            disk_entries=config.get("cache.disk_entries", 5000),
+            ttls=config.get("cache.ttl", {})
+        )
+
+    @staticmethod
+    def make_key(model: str, messages: list, options: Optional[Dict[str, Any]] = None) -> str:
+        """Build a cache key.
+
+        Args:
+            model: Model name
+            messages: Chat messages
+            options: Generation options (temperature, num_predict, format, ...)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {"model": model, "messages": messages, "options": options or {}},
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, task: Optional[str]) -> float:
+        """Get the TTL for a task.
+
+        Args:
+            task: Call-site task name
+
+        Returns:
+            TTL in seconds; 0 disables caching for the task
+        """
+        return self.ttls.get(task, self.ttls.get("default", 0))
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None or self._db is None:
+            return value
+        return self._get_disk(key, now)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """Look up a cached response without blocking the event loop on disk.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+        value = self._get_memory(key, now)
+        if value is not None or self._db is None:
+            return value
+        return await asyncio.to_thread(self._get_disk, key, now)
+
+    def put(self, key: str, value: str, task: Optional[str] = None):
+        """Store a response.
+
+        Args:
+            key: Cache key from make_key
+            value: Response text
+            task: Call-site task name, selects the TTL
+        """
+        expires = self._put_memory(key, value, task)
+        if expires is not None and self._db is not None:
+            self._put_disk(key, value, task, expires)
+
+    def aput(self, key: str, value: str, task: Optional[str] = None):
+        """Store a response, queueing the disk write for the writer thread.
+
+        Args:
+            key: Cache key from make_key
+            value: Response text
+            task: Call-site task name, selects the TTL
+        """
+        expires = self._put_memory(key, value, task)
+        if expires is not None and self._db is not None:
+            try:
+                self._writer.submit(self._put_disk, key, value, task, expires)
+            except RuntimeError:
+                pass  # Closed while the response was generated
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache statistics.
+
+        Returns:
+            Counters for this process plus persisted totals and entry counts
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+        with self._db_lock:
+            if self._db is not None:
+                self._flush_writes()
+                self._flush_stats()
+                stats["disk_entries"] = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+                for name, value in self._db.execute("SELECT name, value FROM stats"):
+                    stats[f"total_{name}"] = value
+
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """Remove all cached responses."""
+        with self._lock:
+            self._memory.clear()
+        with self._db_lock:
+            if self._db is not None:
+                self._touched.clear()
+                self._stale.clear()
+                self._db.execute("DELETE FROM entries")
+                self._db.commit()
+
+    def close(self):
+        """Finish queued writes, flush statistics and close the database."""
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+        with self._db_lock:
+            if self._db is not None:
+                self._flush_writes()
+                self._flush_stats()
+                self._db.close()
+                self._db = None
+        _open_caches.discard(self)
+
+    def _get_memory(self, key: str, now: float) -> Optional[str]:
+        """Look up the memory tier; counts a miss when there is no disk tier."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires > now:
+                    self._memory.move_to_end(key)
+                    self._count("memory_hits")
+                    return value
+                del self._memory[key]
+                self._count("expired")
+            if self._db is None:
+                self._count("misses")
+            return None
+
+    def _get_disk(self, key: str, now: float) -> Optional[str]:
+        """Look up the disk tier (blocking)."""
+        with self._db_lock:
+            row = None
+            if self._db is not None:
+                row = self._db.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] > now:
+                self._touched[key] = now
+            elif row is not None:
+                self._stale.add(key)
+            if self._db is not None and len(self._touched) + len(self._stale) >= self.STATS_FLUSH_INTERVAL:
+                self._flush_writes()
+                self._db.commit()
+
+        with self._lock:
+            if row is not None and row[1] > now:
+                self._remember(key, row[0], row[1])
+                self._count("disk_hits")
+                return row[0]
+            if row is not None:
+                self._count("expired")
+            self._count("misses")
+            return None
+
+    def _put_memory(self, key: str, value: str, task: Optional[str]) -> Optional[float]:
+        """Store in the memory tier.
+
+        Returns:
+            Expiry time, or None if the task is not cached
+        """
+        ttl = self.ttl_for(task)
+        if ttl <= 0:
+            return None
+        expires = time.time() + ttl
+        with self._lock:
+            self._remember(key, value, expires)
+        return expires
+
+    def _put_disk(self, key: str, value: str, task: Optional[str], expires: float):
+        """Store in the disk tier with the batched access times (blocking)."""
+        now = time.time()
+        with self._db_lock:
+            if self._db is None:
+                return
+            self._flush_writes()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, task, value, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, task, value, expires, now)
+            )
+            self._prune_disk(now)
+            with self._lock:
+                flush = sum(self._pending.values()) >= self.STATS_FLUSH_INTERVAL
+            if flush:
+                self._flush_stats()
+            self._db.commit()
+
+    def _remember(self, key: str, value: str, expires: float):
+        """Insert into the memory tier, evicting least recently used."""
+        self._memory[key] = (value, expires)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._count("evictions")
+
+    def _prune_disk(self, now: float):
+        """Drop expired rows and trim the disk tier to its size limit (caller holds the db lock)."""
+        expired = self._db.execute("DELETE FROM entries WHERE expires <= ?", (now,)).rowcount
+        if expired:
+            with self._lock:
+                self._count("expired", expired)
+
+        count = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        excess = count - self.disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY accessed LIMIT ?)",
+                (excess,)
+            )
+            with self._lock:
+                self._count("evictions", excess)
+
+    def _count(self, name: str, amount: int = 1):
+        """Increment a counter (caller holds the lock); persisted by the next disk write."""
+        self._counters[name] += amount
+        self._pending[name] += amount
+
+    def _flush_writes(self):
+        """Write batched access times and delete stale rows (caller holds the db lock and commits)."""
+        if self._touched:
+            self._db.executemany("UPDATE entries SET accessed = ? WHERE key = ?",
+                                 [(accessed, key) for key, accessed in self._touched.items()])
+            self._touched.clear()
+        if self._stale:
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in self._stale])
+            self._stale.clear()
+
+    def _flush_stats(self):
+        """Add pending counter deltas to the persisted totals (caller holds the db lock)."""
+        with self._lock:
+            pending, self._pending = self._pending, self._empty_counters()
+        for name, value in pending.items():
+            if value:
+                self._db.execute(
+                    "INSERT INTO stats (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, value)
+                )
+        self._db.commit()
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expired": 0}
@@ -0,0 +1,318 @@
+"""Shared, pooled LLM clients.
+
+Constructing a client (``ollama.Client`` or an OpenAI-compatible one, see
+kai.ai.backends) opens a fresh HTTP connection pool, so
+creating one per request throws away keep-alive connections. The registry
+hands out one client per host and one engine per (model, host), shared by
+every caller in the process. Async clients are additionally keyed by event
+loop, since an httpx connection pool cannot be shared between loops.
+"""
+
+import asyncio
+import threading
+import weakref
+import httpx
+import ollama
+from kai.ai import backends
+from typing import Dict, List, Optional, Tuple
+
+
+class ClientRegistry:
+    """Process-wide registry of Ollama clients and LLM engines."""
+
+    def __init__(self, max_connections: int = 10, max_keepalive: int = 5, keepalive_expiry: float = 60.0):
+        """Initialize client registry.
+
+        Args:
+            max_connections: Maximum open connections per host
+            max_keepalive: Maximum idle connections kept per host
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expiry
+        )
+        self._clients: Dict[Optional[str], ollama.Client] = {}
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._engines: Dict[Tuple[str, Optional[str]], object] = {}
+        self.cache = None
+        self.keep_alive = None
+        self.profiles: Dict[str, dict] = {}
+        self.pool = None
+        self.scheduler = None
+        self.backend = "ollama"
+        self.api_key = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "clients_created": 0,
+            "engines_created": 0,
+            "engines_reused": 0,
+            "requests": 0,
+            "connections_opened": 0,
+        }
+
+    def client(self, host: Optional[str] = None) -> ollama.Client:
+        """Get the shared client for a host.
+
+        Args:
+            host: Server URL, defaults to the backend's default (OLLAMA_HOST or localhost)
+
+        Returns:
+            Shared client of the configured backend (httpx clients are thread-safe)
+        """
+        with self._lock:
+            client = self._clients.get(host)
+            if client is None:
+                client = backends.create_client(
+                    self.backend,
+                    host=host,
+                    api_key=self.api_key,
+                    limits=self.limits,
+                    event_hooks={"request": [self._on_request]}
+                )
+                self._clients[host] = client
+                self._counters["clients_created"] += 1
+            return client
+
+    def async_client(self, host: Optional[str] = None) -> ollama.AsyncClient:
+        """Get the shared async client for a host on the running loop.
+
+        Args:
+            host: Server URL, defaults to the backend's default (OLLAMA_HOST or localhost)
+
+        Returns:
+            Shared async client of the configured backend for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(host)
+            if client is None:
+                client = backends.create_async_client(
+                    self.backend,
+                    host=host,
+                    api_key=self.api_key,
+                    limits=self.limits,
+                    event_hooks={"request": [self._aon_request]}
+                )
+                clients[host] = client
+                self._counters["clients_created"] += 1
+            return client
+
+    def engine(self, model: str, host: Optional[str] = None):
+        """Get the shared LLM engine for a model and host.
+
+        Args:
+            model: Model name
+            host: Server URL
+
+        Returns:
+            Shared LLMEngine instance
+        """
+        from kai.ai.llm import LLMEngine
+
+        key = (model, host)
+        with self._lock:
+            engine = self._engines.get(key)
+            if engine is not None:
+                self._counters["engines_reused"] += 1
+                return engine
+
+        engine = LLMEngine(model=model, host=host, client=self.client(host), cache=self.cache)
+        engine.keep_alive = self.keep_alive
+        engine.profiles = self.profiles
+        engine.scheduler = self.scheduler
+        if host is None:
+            engine.pool = self.pool
+        with self._lock:
+            if key in self._engines:
+                # Another thread won the race
+                self._counters["engines_reused"] += 1
+                return self._engines[key]
+            self._engines[key] = engine
+            self._counters["engines_created"] += 1
+        return engine
+
+    def set_cache(self, cache):
+        """Install the response cache used by shared engines, closing the one it replaces.
+
+        Args:
+            cache: ResponseCache, or None to disable caching
+        """
+        with self._lock:
+            old, self.cache = self.cache, cache
+            for engine in self._engines.values():
+                engine.cache = cache
+        if old is not None and old is not cache:
+            old.close()
+
+    def set_keep_alive(self, keep_alive):
+        """Set how long Ollama keeps models loaded after each request.
+
+        Args:
+            keep_alive: Duration such as "30m" or seconds, None for the server default
+        """
+        with self._lock:
+            self.keep_alive = keep_alive
+            for engine in self._engines.values():
+                engine.keep_alive = keep_alive
+
+    def set_profiles(self, profiles: Dict[str, dict]):
+        """Set the per-task generation profiles used by shared engines.
+
+        Args:
+            profiles: Task name to Ollama options (num_predict, stop, ...) and format
+        """
+        with self._lock:
+            self.profiles = profiles
+            for engine in self._engines.values():
+                engine.profiles = profiles
+
+    def set_scheduler(self, scheduler):
+        """Install the priority scheduler used by shared engines.
+
+        Args:
+            scheduler: LLMScheduler, or None to send requests immediately
+        """
+        with self._lock:
+            self.scheduler = scheduler
+            for engine in self._engines.values():
+                engine.scheduler = scheduler
+
+    def set_backend(self, backend: str, api_key: Optional[str] = None):
+        """Switch the server backend used by shared clients and engines.
+
+        Args:
+            backend: "ollama" or "openai" (OpenAI-compatible servers such as llama.cpp)
+            api_key: Bearer token for OpenAI-compatible servers that require one
+
+        Raises:
+            ValueError: If the backend is unknown
+        """
+        if backend not in backends.BACKENDS:
+            raise ValueError(f"Unknown LLM backend: {backend}")
+        if backend == self.backend and api_key == self.api_key:
+            return
+
+        with self._lock:
+            self.backend = backend
+            self.api_key = api_key
+            old = list(self._clients.values())
+            self._clients.clear()
+            engines = list(self._engines.items())
+            # Old async clients close with their event loops
+            self._async_clients = weakref.WeakKeyDictionary()
+        for (_, host), engine in engines:
+            engine.client = self.client(host)
+        for client in old:
+            try:
+                client.close()
+            except Exception:
+                pass
+        if self.pool is not None:
+            self.pool.health_path = backends.HEALTH_PATHS[backend]
+            self.pool.headers = backends.auth_headers(backend, api_key)
+
+    def set_hosts(self, hosts: Optional[List[str]], check_interval: float = 30.0):
+        """Spread requests of engines without an explicit host over several hosts.
+
+        Args:
+            hosts: Server URLs; None or empty uses the default host
+            check_interval: Seconds between background health checks
+
+        Returns:
+            The HostPool in use, or None
+        """
+        from kai.ai.hosts import HostPool
+
+        pool = None
+        if hosts:
+            pool = HostPool(hosts, check_interval=check_interval, health_path=backends.HEALTH_PATHS[self.backend],
+                            headers=backends.auth_headers(self.backend, self.api_key))
+        with self._lock:
+            old, self.pool = self.pool, pool
+            for (_, host), engine in self._engines.items():
+                if host is None:
+                    engine.pool = pool
+        if old is not None:
+            old.stop()
+        if pool is not None:
+            pool.start()
+        return pool
+
+    def stats(self) -> Dict[str, int]:
+        """Get connection and reuse counters.
+
+        Returns:
+            Dict of counter name to value, including reused connections
+        """
+        with self._lock:
+            stats = dict(self._counters)
+        stats["connections_reused"] = max(stats["requests"] - stats["connections_opened"], 0)
+        return stats
+
+    def close(self):
+        """Close all pooled connections and the response cache, and forget cached clients."""
+        if self.pool is not None:
+            self.pool.stop()
+        self.set_cache(None)
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._engines.clear()
+        for client in clients:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    async def aclose(self):
+        """Close async clients bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = list(self._async_clients.pop(loop, {}).values())
+        for client in clients:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def _on_request(self, request: httpx.Request):
+        """Count requests and attach a connection tracer."""
+        with self._lock:
+            self._counters["requests"] += 1
+        request.extensions["trace"] = self._trace
+
+    def _trace(self, event_name: str, info: dict):
+        """Count new TCP connections reported by the transport."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self._counters["connections_opened"] += 1
+
+    async def _aon_request(self, request: httpx.Request):
+        """Async variant of _on_request for httpx.AsyncClient."""
+        with self._lock:
+            self._counters["requests"] += 1
+        request.extensions["trace"] = self._atrace
+
+    async def _atrace(self, event_name: str, info: dict):
+        """Async variant of _trace for httpx.AsyncClient."""
+        self._trace(event_name, info)
+
+
+# Process-wide registry
+registry = ClientRegistry()
+
+
+def get_llm(model: str, host: Optional[str] = None):
+    """Get the shared LLM engine for a model.
+
+    Args:
+        model: Model name
+        host: Optional server URL
+
+    Returns:
+        Shared LLMEngine instance
+    """
+    return registry.engine(model, host)
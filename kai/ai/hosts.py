@@ -0,0 +1,226 @@
+"""Pool of LLM server hosts.
+
+With ``models.llm_hosts`` set, engines are not tied to one server. Each
+request goes to the healthy host with the lowest expected latency, counting
+the requests it is already serving, and moves on to the next host if the
+connection fails or the host answers with a server error. A background
+thread health-checks every host so failed hosts rejoin once they are back.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import httpx
+import ollama
+
+
+@dataclass
+class HostState:
+    """Live statistics for one host."""
+
+    healthy: bool = True
+    in_flight: int = 0
+    latency: Optional[float] = None  # Moving average seconds to first response
+    requests: int = 0
+    failures: int = 0
+    failovers: int = 0
+    down_since: Optional[float] = None
+
+
+class HostPool:
+    """Least-latency selection, failover and health checks across hosts."""
+
+    # Weight of the newest sample in the latency moving average
+    LATENCY_SMOOTHING = 0.3
+
+    def __init__(self, hosts: List[str], check_interval: float = 30.0, check_timeout: float = 2.0,
+                 health_path: str = "/api/version", headers: Optional[Dict[str, str]] = None):
+        """Initialize host pool.
+
+        Args:
+            hosts: Server base URLs
+            check_interval: Seconds between background health checks
+            check_timeout: Seconds a health check may take
+            health_path: Path a healthy server answers with 2xx
+            headers: Headers sent with health checks, e.g. the backend's Authorization
+        """
+        self.hosts = list(hosts)
+        self.health_path = health_path
+        self.headers = dict(headers or {})
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._state = {host: HostState() for host in self.hosts}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def candidates(self) -> List[str]:
+        """Order hosts for the next request.
+
+        Healthy hosts come first, cheapest first: the latency average scaled
+        by the requests already in flight. Hosts never measured sort first so
+        every host gets sampled. Unhealthy hosts follow as a last resort.
+
+        Returns:
+            Host URLs in the order they should be tried
+        """
+        with self._lock:
+            def cost(host):
+                state = self._state[host]
+                return (state.latency or 0.0) * (1 + state.in_flight), state.in_flight
+
+            healthy = sorted((h for h in self.hosts if self._state[h].healthy), key=cost)
+            unhealthy = [h for h in self.hosts if not self._state[h].healthy]
+            return healthy + unhealthy
+
+    @contextmanager
+    def lease(self, host: str):
+        """Count a request as in flight on a host for the duration of the block.
+
+        Args:
+            host: Host URL
+        """
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+    def acquire(self, host: str):
+        """Mark a request as started on a host.
+
+        Args:
+            host: Host URL
+        """
+        with self._lock:
+            state = self._state[host]
+            state.in_flight += 1
+            state.requests += 1
+
+    def release(self, host: str):
+        """Mark a request as finished on a host.
+
+        Args:
+            host: Host URL
+        """
+        with self._lock:
+            self._state[host].in_flight -= 1
+
+    def record_success(self, host: str, seconds: float):
+        """Record the time a host took to start answering.
+
+        Args:
+            host: Host URL
+            seconds: Seconds to the first response byte or complete response
+        """
+        with self._lock:
+            state = self._state[host]
+            if state.latency is None:
+                state.latency = seconds
+            else:
+                state.latency += self.LATENCY_SMOOTHING * (seconds - state.latency)
+            self._mark_up(state)
+
+    def record_error(self, host: str, error: Exception) -> bool:
+        """Record a failed request and decide whether to try another host.
+
+        Args:
+            host: Host URL
+            error: Exception raised by the request
+
+        Returns:
+            True if the request should fail over to the next host
+        """
+        status = getattr(error, "status_code", None)
+        host_down = isinstance(error, (ConnectionError, httpx.TransportError)) or (
+            isinstance(error, ollama.ResponseError) and status is not None and status >= 500
+        )
+        # The model may simply not be pulled on this host
+        missing_model = isinstance(error, ollama.ResponseError) and status == 404
+
+        with self._lock:
+            state = self._state[host]
+            if host_down or missing_model:
+                state.failovers += 1
+            if host_down:
+                state.failures += 1
+                if state.healthy:
+                    state.healthy = False
+                    state.down_since = time.monotonic()
+        return host_down or missing_model
+
+    def check(self) -> Dict[str, bool]:
+        """Probe every host.
+
+        Returns:
+            Dict of host URL to whether it answered
+        """
+        results = {}
+        for host in self.hosts:
+            try:
+                httpx.get(f"{host.rstrip('/')}{self.health_path}", headers=self.headers,
+                          timeout=self.check_timeout).raise_for_status()
+            except Exception:
+                with self._lock:
+                    state = self._state[host]
+                    if state.healthy:
+                        state.healthy = False
+                        state.down_since = time.monotonic()
+                results[host] = False
+                continue
+
+            with self._lock:
+                state = self._state[host]
+                if not state.healthy:
+                    # Re-measure a returning host from scratch
+                    state.latency = None
+                    self._mark_up(state)
+            results[host] = True
+        return results
+
+    def start(self):
+        """Start background health checks."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._check_loop, daemon=True, name="kai-host-checks")
+        self._thread.start()
+
+    def stop(self):
+        """Stop background health checks."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def stats(self) -> Dict[str, dict]:
+        """Get per-host statistics.
+
+        Returns:
+            Dict of host URL to health, in-flight count, latency average,
+            request, failure and failover counts
+        """
+        with self._lock:
+            return {
+                host: {
+                    "healthy": state.healthy,
+                    "in_flight": state.in_flight,
+                    "latency": state.latency,
+                    "requests": state.requests,
+                    "failures": state.failures,
+                    "failovers": state.failovers,
+                }
+                for host, state in self._state.items()
+            }
+
+    def _mark_up(self, state: HostState):
+        """Mark a host healthy (caller holds the lock)."""
+        state.healthy = True
+        state.down_since = None
+
+    def _check_loop(self):
+        """Health-check every interval until stopped."""
+        while not self._stop.wait(self.check_interval):
+            self.check()
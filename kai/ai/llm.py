@@ -1,20 +1,61 @@
 """LLM integration for Kai."""
 
-import ollama
-from typing import Optional, Dict, Any
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple
+from kai.ai.cache import ResponseCache
+from kai.ai.clients import registry
+from kai.ai.scheduler import Preempted
+from kai.core.tracing import tracer
+
+
+# Profile keys passed to Ollama as generation options
+PROFILE_OPTIONS = ("num_predict", "num_ctx", "temperature", "top_p", "stop")
+
+
+class _Abandoned(Exception):
+    """The request a caller was waiting on was cancelled; the caller sends its own."""
 
 
 class LLMEngine:
-    """Handles LLM interactions using Ollama."""
+    """Handles LLM interactions using Ollama or an OpenAI-compatible server."""
     
-    def __init__(self, model: str = "llama3.2:3b"):
+    def __init__(self, model: str = "llama3.2:3b", host: Optional[str] = None, client=None,
+                 cache: Optional[ResponseCache] = None):
         """Initialize LLM engine.
         
         Args:
             model: Model name to use
+            host: Server URL, defaults to the backend's default (OLLAMA_HOST or localhost)
+            client: Backend client to use (see kai.ai.backends), defaults to the shared one for host
+            cache: Response cache consulted for calls that name a task
         """
         self.model = model
-        self.client = ollama.Client()
+        self.host = host
+        self.client = client or registry.client(host)
+        self.cache = cache
+        self.keep_alive = None  # How long Ollama keeps the model loaded, e.g. "30m"
+        self.load_state = "unknown"  # unknown, loading, loaded, failed
+        self.load_seconds = None
+        self.usage: Dict[str, Dict[str, float]] = {}  # Token counts of the last call per task
+        self.profiles: Dict[str, dict] = {}  # Generation options and format per task
+        self.performance_window = 10  # Calls per task in the rolling TTFT / speed window
+        self.pool = None  # HostPool spreading requests over several hosts, replaces host
+        self.scheduler = None  # LLMScheduler queueing requests by priority
+        self.max_preemptions = 3  # Times a background request is requeued before giving up
+        self.coalesce = True  # Share one generation between identical concurrent requests
+        self.coalesced: Dict[str, int] = {}  # Requests per task answered by an identical in-flight one
+        self._flights: Dict[str, Future] = {}
+        self._flights_lock = threading.Lock()
+        self._latency: Dict[str, Dict[str, float]] = {}
+        self._performance: Dict[str, deque] = {}
+        self._latency_lock = threading.Lock()
+        self.installed: Optional[bool] = None  # Last is_installed() answer, None until known
         self.default_system_prompt = """You are Kai, a helpful voice assistant for Linux users.
 
 CRITICAL RULES FOR VOICE RESPONSES:
@@ -33,15 +74,15 @@ Example BAD response: "Here's how to update:\n* First, run `sudo apt update`\n*
 
 Remember: You're SPEAKING to someone, not writing documentation."""
         
-    def generate(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Generate response from LLM.
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> list:
+        """Build chat messages for a single prompt.
         
         Args:
             prompt: User prompt
-            system_prompt: Optional system prompt
+            system_prompt: Optional system prompt, defaults to the voice prompt
             
         Returns:
-            Generated response text
+            List of message dicts
         """
         messages = []
         
@@ -59,30 +100,928 @@ Remember: You're SPEAKING to someone, not writing documentation."""
             "role": "user",
             "content": prompt
         })
+        return messages
+    
+    @property
+    def async_client(self):
+        """Shared async client for this host, bound to the running loop."""
+        return registry.async_client(self.host)
+    
+    def _clients(self) -> list:
+        """Get the client of every host this engine talks to.
+        
+        Returns:
+            One client per pool host, or just this engine's client
+        """
+        if self.pool is None:
+            return [self.client]
+        return [registry.client(host) for host in self.pool.hosts]
+    
+    def _request(self, call):
+        """Send a request, failing over to the next pool host on host errors.
+        
+        Args:
+            call: Function taking an Ollama client and making the request
+            
+        Returns:
+            The request's response
+        """
+        if self.pool is None:
+            return call(self.client)
+        
+        error = None
+        for host in self.pool.candidates():
+            start = time.monotonic()
+            with self.pool.lease(host):
+                try:
+                    response = call(registry.client(host))
+                except Exception as e:
+                    if not self.pool.record_error(host, e):
+                        raise
+                    error = e
+                    continue
+            self.pool.record_success(host, time.monotonic() - start)
+            return response
+        raise error
+    
+    async def _arequest(self, call):
+        """Async variant of _request.
+        
+        Args:
+            call: Function taking an async Ollama client and returning the request awaitable
+            
+        Returns:
+            The request's response
+        """
+        if self.pool is None:
+            return await call(self.async_client)
+        
+        error = None
+        for host in self.pool.candidates():
+            start = time.monotonic()
+            with self.pool.lease(host):
+                try:
+                    response = await call(registry.async_client(host))
+                except Exception as e:
+                    if not self.pool.record_error(host, e):
+                        raise
+                    error = e
+                    continue
+            self.pool.record_success(host, time.monotonic() - start)
+            return response
+        raise error
+    
+    def _stream(self, call) -> Iterator:
+        """Open a streaming request, failing over until a host sends the first part.
+        
+        Once a part has been yielded the stream is committed to its host.
+        
+        Args:
+            call: Function taking an Ollama client and returning the stream
+            
+        Yields:
+            Stream parts
+        """
+        if self.pool is None:
+            yield from call(self.client)
+            return
+        
+        error = None
+        for host in self.pool.candidates():
+            start = time.monotonic()
+            self.pool.acquire(host)
+            try:
+                try:
+                    parts = call(registry.client(host))
+                    first = next(parts)
+                except StopIteration:
+                    return
+                except Exception as e:
+                    if not self.pool.record_error(host, e):
+                        raise
+                    error = e
+                    continue
+                self.pool.record_success(host, time.monotonic() - start)
+                yield first
+                yield from parts
+                return
+            finally:
+                self.pool.release(host)
+        raise error
+    
+    async def _astream(self, call) -> AsyncIterator:
+        """Async variant of _stream.
+        
+        Args:
+            call: Function taking an async Ollama client and returning the stream awaitable
+            
+        Yields:
+            Stream parts
+        """
+        if self.pool is None:
+            async for part in await call(self.async_client):
+                yield part
+            return
+        
+        error = None
+        for host in self.pool.candidates():
+            start = time.monotonic()
+            self.pool.acquire(host)
+            try:
+                try:
+                    parts = await call(registry.async_client(host))
+                    first = await parts.__anext__()
+                except StopAsyncIteration:
+                    return
+                except Exception as e:
+                    if not self.pool.record_error(host, e):
+                        raise
+                    error = e
+                    continue
+                self.pool.record_success(host, time.monotonic() - start)
+                yield first
+                async for part in parts:
+                    yield part
+                return
+            finally:
+                self.pool.release(host)
+        raise error
+
+    def generate(self, prompt: str, system_prompt: Optional[str] = None, task: Optional[str] = None,
+                 choices: Optional[List[str]] = None, raise_errors: bool = False) -> str:
+        """Generate response from LLM.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            task: Call-site task name (e.g. "classify"); selects the generation
+                profile and enables response caching
+            choices: Allowed answers, enforced if the task's profile format is "enum"
+            raise_errors: Raise failures instead of returning them as the response text
+            
+        Returns:
+            Generated response text
+        """
+        messages = self._build_messages(prompt, system_prompt)
         
         try:
-            response = self.client.chat(
-                model=self.model,
-                messages=messages
-            )
-            return response['message']['content']
+            return self._complete(messages, task, choices=choices)
         except Exception as e:
+            if raise_errors:
+                raise
             return f"Error generating response: {str(e)}"
     
-    def chat(self, messages: list) -> str:
+    def chat(self, messages: list, task: Optional[str] = None, format: Optional[Any] = None) -> str:
         """Continue a conversation.
         
         Args:
             messages: List of message dicts with 'role' and 'content'
+            task: Call-site task name; selects the generation profile and
+                enables response caching
+            format: Optional output constraint, "json" or a JSON schema dict;
+                overrides the profile's format
             
         Returns:
             Generated response text
         """
         try:
-            response = self.client.chat(
-                model=self.model,
-                messages=messages
+            return self._complete(messages, task, format)
+        except Exception as e:
+            return f"Error in chat: {str(e)}"
+    
+    def _complete(self, messages: list, task: Optional[str] = None, format: Optional[Any] = None,
+                   choices: Optional[List[str]] = None) -> str:
+        """Run a non-streaming completion through the response cache.
+        
+        Identical requests already in flight (same model, messages, options
+        and format) are not sent again; they wait for the running one.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name
+            format: Optional output constraint
+            choices: Allowed answers for an "enum" profile format
+            
+        Returns:
+            Generated response text
+        """
+        options, format = self._generation_args(task, format, choices)
+        key = self._cache_key(messages, task, format, options)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                tracer.record("llm", time.monotonic(), model=self.model, task=task or "chat", cached=True)
+                return cached
+        
+        while True:
+            flight_key, flight, leader = self._join_flight(messages, task, format, options)
+            if leader:
+                break
+            try:
+                return flight.result()
+            except _Abandoned:
+                continue
+        
+        try:
+            content = self._send(messages, task, format, options)
+            if key:
+                self.cache.put(key, content, task)
+        except BaseException as e:
+            self._land(flight_key, flight, error=e)
+            raise
+        self._land(flight_key, flight, content)
+        return content
+    
+    def _send(self, messages: list, task: Optional[str], format: Optional[Any],
+              options: Optional[Dict[str, Any]]) -> str:
+        """Run one completion through the scheduler and host pool.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name
+            format: Resolved output constraint
+            options: Resolved generation options
+            
+        Returns:
+            Generated response text
+        """
+        waited = 0.0
+        for attempt in range(self.max_preemptions + 1):
+            with self._scheduled(task) as lease:
+                waited += lease.wait_seconds if lease else 0.0
+                start = time.monotonic()
+                try:
+                    response = self._request(lambda client: self._chat_call(
+                        client, lease, messages, format, options
+                    ))
+                except Preempted:
+                    if attempt == self.max_preemptions:
+                        raise
+                    continue
+            break
+        content = self._decode(response['message']['content'], format)
+        self._finish(task, response, start, wait=waited)
+        return content
+    
+    async def _acomplete(self, messages: list, task: Optional[str] = None, format: Optional[Any] = None,
+                    choices: Optional[List[str]] = None) -> str:
+        """Async variant of _complete.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name
+            format: Optional output constraint
+            choices: Allowed answers for an "enum" profile format
+            
+        Returns:
+            Generated response text
+        """
+        options, format = self._generation_args(task, format, choices)
+        key = self._cache_key(messages, task, format, options)
+        if key:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                tracer.record("llm", time.monotonic(), model=self.model, task=task or "chat", cached=True)
+                return cached
+        
+        while True:
+            flight_key, flight, leader = self._join_flight(messages, task, format, options)
+            if leader:
+                break
+            try:
+                # Shielded so a cancelled follower leaves the shared generation alone
+                return await asyncio.shield(asyncio.wrap_future(flight))
+            except _Abandoned:
+                continue
+        
+        try:
+            content = await self._asend(messages, task, format, options)
+            if key:
+                self.cache.aput(key, content, task)
+        except BaseException as e:
+            self._land(flight_key, flight, error=e)
+            raise
+        self._land(flight_key, flight, content)
+        return content
+    
+    async def _asend(self, messages: list, task: Optional[str], format: Optional[Any],
+                     options: Optional[Dict[str, Any]]) -> str:
+        """Async variant of _send.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name
+            format: Resolved output constraint
+            options: Resolved generation options
+            
+        Returns:
+            Generated response text
+        """
+        waited = 0.0
+        for attempt in range(self.max_preemptions + 1):
+            async with self._ascheduled(task) as lease:
+                waited += lease.wait_seconds if lease else 0.0
+                start = time.monotonic()
+                try:
+                    response = await self._arequest(lambda client: self._achat_call(
+                        client, lease, messages, format, options
+                    ))
+                except Preempted:
+                    if attempt == self.max_preemptions:
+                        raise
+                    continue
+            break
+        content = self._decode(response['message']['content'], format)
+        self._finish(task, response, start, wait=waited)
+        return content
+    
+    def _join_flight(self, messages: list, task: Optional[str], format: Optional[Any],
+                     options: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Future, bool]:
+        """Find an identical request in flight, or register this one.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name, for the coalescing counter
+            format: Resolved output constraint
+            options: Resolved generation options
+            
+        Returns:
+            Tuple of (flight key, future of the response text, whether the
+            caller leads the flight and must generate and land it)
+        """
+        if not self.coalesce:
+            return None, Future(), True
+        
+        key_options = dict(options or {})
+        if format:
+            key_options["format"] = format
+        flight_key = ResponseCache.make_key(self.model, messages, key_options)
+        
+        with self._flights_lock:
+            flight = self._flights.get(flight_key)
+            if flight is not None:
+                self.coalesced[task or "chat"] = self.coalesced.get(task or "chat", 0) + 1
+                return flight_key, flight, False
+            flight = self._flights[flight_key] = Future()
+            return flight_key, flight, True
+    
+    def _land(self, flight_key: Optional[str], flight: Future, content: Optional[str] = None,
+              error: Optional[BaseException] = None):
+        """Hand the leader's result to every caller waiting on the flight.
+        
+        Args:
+            flight_key: Key returned by _join_flight
+            flight: Future returned by _join_flight
+            content: Response text
+            error: Exception the leader failed with
+        """
+        if flight_key is not None:
+            with self._flights_lock:
+                self._flights.pop(flight_key, None)
+        if error is None:
+            flight.set_result(content)
+        elif isinstance(error, Exception):
+            flight.set_exception(error)
+        else:
+            # Cancelled or interrupted leader: waiters retry on their own
+            flight.set_exception(_Abandoned())
+    
+    @contextmanager
+    def _scheduled(self, task: Optional[str]):
+        """Hold a scheduler slot for a request.
+        
+        Args:
+            task: Call-site task name, decides the priority class
+            
+        Yields:
+            Granted Lease, or None without a scheduler
+        """
+        if self.scheduler is None:
+            yield None
+            return
+        lease = self.scheduler.acquire(self.host, self.scheduler.priority_for(task))
+        try:
+            yield lease
+        finally:
+            self.scheduler.release(lease)
+    
+    @asynccontextmanager
+    async def _ascheduled(self, task: Optional[str]):
+        """Async variant of _scheduled.
+        
+        Args:
+            task: Call-site task name, decides the priority class
+            
+        Yields:
+            Granted Lease, or None without a scheduler
+        """
+        if self.scheduler is None:
+            yield None
+            return
+        lease = await self.scheduler.aacquire(self.host, self.scheduler.priority_for(task))
+        try:
+            yield lease
+        finally:
+            self.scheduler.release(lease)
+    
+    def _chat_call(self, client, lease, messages: list, format: Optional[Any], options: Optional[Dict[str, Any]]):
+        """Send a non-streaming chat request.
+        
+        Preemptible requests are streamed and collected instead, so they can
+        be abandoned between tokens when an interactive request arrives.
+        
+        Args:
+            client: Backend client
+            lease: Scheduler lease of the request, or None
+            messages: List of message dicts
+            format: Output constraint
+            options: Generation options
+            
+        Returns:
+            Chat response
+            
+        Raises:
+            Preempted: If the lease was preempted
+        """
+        if lease is None or not lease.preemptible:
+            return client.chat(
+                model=self.model, messages=messages, format=format, options=options, keep_alive=self.keep_alive
+            )
+        
+        parts = client.chat(
+            model=self.model, messages=messages, format=format, options=options, keep_alive=self.keep_alive,
+            stream=True
+        )
+        content, final = [], {}
+        try:
+            for part in parts:
+                lease.check()
+                content.append(part['message']['content'])
+                if part.get('done'):
+                    final = part
+        finally:
+            # Stops reading, which closes the connection and ends generation
+            parts.close()
+        return self._collected(content, final)
+    
+    async def _achat_call(self, client, lease, messages: list, format: Optional[Any],
+                          options: Optional[Dict[str, Any]]):
+        """Async variant of _chat_call.
+        
+        Args:
+            client: Async backend client
+            lease: Scheduler lease of the request, or None
+            messages: List of message dicts
+            format: Output constraint
+            options: Generation options
+            
+        Returns:
+            Chat response
+            
+        Raises:
+            Preempted: If the lease was preempted
+        """
+        if lease is None or not lease.preemptible:
+            return await client.chat(
+                model=self.model, messages=messages, format=format, options=options, keep_alive=self.keep_alive
             )
-            return response['message']['content']
+        
+        parts = await client.chat(
+            model=self.model, messages=messages, format=format, options=options, keep_alive=self.keep_alive,
+            stream=True
+        )
+        content, final = [], {}
+        try:
+            async for part in parts:
+                lease.check()
+                content.append(part['message']['content'])
+                if part.get('done'):
+                    final = part
+        finally:
+            await parts.aclose()
+        return self._collected(content, final)
+    
+    @staticmethod
+    def _collected(content: List[str], final) -> dict:
+        """Build a chat response from collected stream parts.
+        
+        Args:
+            content: Text deltas
+            final: Closing stream part with the token counts
+            
+        Returns:
+            Response dict shaped like a non-streaming chat response
+        """
+        response = {
+            name: final.get(name)
+            for name in ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration")
+        }
+        response["message"] = {"role": "assistant", "content": "".join(content)}
+        return response
+    
+    def _cache_key(self, messages: list, task: Optional[str], format: Optional[Any] = None,
+                   options: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Get the cache key for a call, or None if it should not be cached.
+        
+        Args:
+            messages: List of message dicts
+            task: Call-site task name
+            format: Output constraint, part of the key
+            options: Generation options, part of the key
+            
+        Returns:
+            Cache key or None
+        """
+        if self.cache is None or task is None or self.cache.ttl_for(task) <= 0:
+            return None
+        key_options = dict(options or {})
+        if format:
+            key_options["format"] = format
+        return self.cache.make_key(self.model, messages, key_options or None)
+    
+    def _generation_args(self, task: Optional[str], format: Optional[Any] = None,
+                         choices: Optional[List[str]] = None) -> Tuple[Optional[Dict[str, Any]], Optional[Any]]:
+        """Resolve Ollama options and output format from the task's profile.
+        
+        Args:
+            task: Call-site task name
+            format: Output constraint given by the caller, wins over the profile
+            choices: Allowed answers for an "enum" profile format
+            
+        Returns:
+            Tuple of (options or None, format or None)
+        """
+        profile = (self.profiles.get(task) or {}) if task else {}
+        options = {name: profile[name] for name in PROFILE_OPTIONS if profile.get(name) is not None}
+        
+        if format is None:
+            format = profile.get("format")
+            if format == "enum":
+                format = {"type": "string", "enum": list(choices)} if choices else None
+        return options or None, format
+    
+    @staticmethod
+    def _decode(content: str, format: Optional[Any]) -> str:
+        """Unwrap a JSON string produced under a string/enum schema.
+        
+        Args:
+            content: Raw response text
+            format: Output constraint the response was generated under
+            
+        Returns:
+            Plain response text
+        """
+        if isinstance(format, dict) and format.get("type") == "string":
+            try:
+                value = json.loads(content)
+            except ValueError:
+                return content
+            if isinstance(value, str):
+                return value
+        return content
+    
+    def stream_chat(self, messages: list, task: Optional[str] = None) -> Iterator[str]:
+        """Continue a conversation, yielding tokens as they are generated.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            task: Call-site task name; selects the generation profile
+            
+        Yields:
+            Response text deltas
+            
+        Raises:
+            Exception: If generation fails or is preempted, also after some
+                deltas were yielded; errors are never yielded as text
+        """
+        options, _ = self._generation_args(task)
+        first_token_at, deltas = None, 0
+        with self._scheduled(task) as lease:
+            start = time.monotonic()
+            for part in self._stream(lambda client: client.chat(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                options=options,
+                keep_alive=self.keep_alive
+            )):
+                if lease:
+                    lease.check()
+                if part.get('done'):
+                    self._finish(task, part, start, first_token_at, deltas, lease.wait_seconds if lease else 0.0)
+                content = part['message']['content']
+                if content:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    deltas += 1
+                    yield content
+    
+    async def agenerate(self, prompt: str, system_prompt: Optional[str] = None, task: Optional[str] = None,
+                        choices: Optional[List[str]] = None, raise_errors: bool = False) -> str:
+        """Generate response from LLM without blocking the event loop.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            task: Call-site task name (e.g. "classify"); selects the generation
+                profile and enables response caching
+            choices: Allowed answers, enforced if the task's profile format is "enum"
+            raise_errors: Raise failures instead of returning them as the response text
+            
+        Returns:
+            Generated response text
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        
+        try:
+            return await self._acomplete(messages, task, choices=choices)
+        except Exception as e:
+            if raise_errors:
+                raise
+            return f"Error generating response: {str(e)}"
+    
+    async def achat(self, messages: list, task: Optional[str] = None, format: Optional[Any] = None) -> str:
+        """Continue a conversation without blocking the event loop.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            task: Call-site task name; selects the generation profile and
+                enables response caching
+            format: Optional output constraint, "json" or a JSON schema dict;
+                overrides the profile's format
+            
+        Returns:
+            Generated response text
+        """
+        try:
+            return await self._acomplete(messages, task, format)
         except Exception as e:
             return f"Error in chat: {str(e)}"
+    
+    async def astream_chat(self, messages: list, task: Optional[str] = None) -> AsyncIterator[str]:
+        """Async variant of stream_chat.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            task: Call-site task name; selects the generation profile
+            
+        Yields:
+            Response text deltas
+            
+        Raises:
+            Exception: If generation fails or is preempted, also after some
+                deltas were yielded; errors are never yielded as text
+        """
+        options, _ = self._generation_args(task)
+        first_token_at, deltas = None, 0
+        async with self._ascheduled(task) as lease:
+            start = time.monotonic()
+            async for part in self._astream(lambda client: client.chat(
+                model=self.model,
+                messages=messages,
+                stream=True,
+                options=options,
+                keep_alive=self.keep_alive
+            )):
+                if lease:
+                    lease.check()
+                if part.get('done'):
+                    self._finish(task, part, start, first_token_at, deltas, lease.wait_seconds if lease else 0.0)
+                content = part['message']['content']
+                if content:
+                    if first_token_at is None:
+                        first_token_at = time.monotonic()
+                    deltas += 1
+                    yield content
+    
+    def _finish(self, task: Optional[str], response, start: float, first_token_at: Optional[float] = None,
+                deltas: int = 0, wait: float = 0.0):
+        """Record usage, latency and speed of a completed model call.
+        
+        Args:
+            task: Call-site task name
+            response: Final chat response or stream part
+            start: Monotonic time the request was sent
+            first_token_at: Monotonic time of the first streamed token
+            deltas: Number of streamed text deltas
+            wait: Seconds the request queued for a scheduler slot
+        """
+        end = time.monotonic()
+        self._record_usage(task, response)
+        self._record_latency(task, end - start, wait)
+        
+        eval_seconds = (response.get('eval_duration') or 0) / 1e9
+        eval_count = response.get('eval_count') or 0
+        if first_token_at is not None:
+            ttft = first_token_at - start
+        else:
+            # Without streaming, everything before generation counts as waiting
+            ttft = end - start - eval_seconds
+        
+        if eval_count and eval_seconds:
+            tokens_per_second = eval_count / eval_seconds
+        elif first_token_at is not None and deltas > 1 and end > first_token_at:
+            tokens_per_second = (deltas - 1) / (end - first_token_at)
+        else:
+            tokens_per_second = None
+        
+        with self._latency_lock:
+            window = self._performance.setdefault(task or "chat", deque(maxlen=self.performance_window))
+            window.append((ttft, tokens_per_second))
+        
+        tracer.record(
+            "llm", start - wait, end, model=self.model, task=task or "chat", wait=wait, ttft=ttft,
+            tokens_per_second=tokens_per_second, prompt_tokens=response.get('prompt_eval_count') or 0,
+            output_tokens=eval_count, cached=False
+        )
+    
+    def performance(self, task: Optional[str]) -> Dict[str, Any]:
+        """Get rolling time-to-first-token and generation speed for a task.
+        
+        Args:
+            task: Call-site task name
+            
+        Returns:
+            Dict with sample count, mean ttft seconds and mean tokens per
+            second (None if speed could not be measured)
+        """
+        with self._latency_lock:
+            samples = list(self._performance.get(task or "chat", ()))
+        
+        speeds = [tps for _, tps in samples if tps is not None]
+        return {
+            "samples": len(samples),
+            "ttft": sum(ttft for ttft, _ in samples) / len(samples) if samples else 0.0,
+            "tokens_per_second": sum(speeds) / len(speeds) if speeds else None,
+        }
+    
+    def reset_performance(self, task: Optional[str]):
+        """Forget the rolling window for a task.
+        
+        Args:
+            task: Call-site task name
+        """
+        with self._latency_lock:
+            self._performance.pop(task or "chat", None)
+    
+    def _record_usage(self, task: Optional[str], response):
+        """Remember prefill and generation counts of a finished completion.
+        
+        Ollama only counts prompt tokens it actually evaluated, so a low
+        prompt_eval_count means the prompt prefix was served from its KV cache.
+        
+        Args:
+            task: Call-site task name, "chat" if None
+            response: Final chat response or stream part
+        """
+        self.usage[task or "chat"] = {
+            "prompt_eval_count": response.get('prompt_eval_count') or 0,
+            "prompt_eval_seconds": (response.get('prompt_eval_duration') or 0) / 1e9,
+            "eval_count": response.get('eval_count') or 0,
+            "eval_seconds": (response.get('eval_duration') or 0) / 1e9,
+        }
+    
+    def _record_latency(self, task: Optional[str], seconds: float, wait: float = 0.0):
+        """Add a completed model call to the per-task latency counters.
+        
+        Args:
+            task: Call-site task name, "chat" if None
+            seconds: Wall time of the call
+            wait: Seconds the call queued for a scheduler slot before it was sent
+        """
+        with self._latency_lock:
+            latency = self._latency.setdefault(
+                task or "chat", {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0, "wait_seconds": 0.0}
+            )
+            latency["calls"] += 1
+            latency["total_seconds"] += seconds
+            latency["max_seconds"] = max(latency["max_seconds"], seconds)
+            latency["last_seconds"] = seconds
+            latency["wait_seconds"] += wait
+            latency["last_wait_seconds"] = wait
+    
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get model call latency per task.
+        
+        Returns:
+            Task name to calls, mean, max and last seconds, and mean and
+            last seconds spent queued for a scheduler slot
+        """
+        with self._latency_lock:
+            return {
+                task: {
+                    "calls": latency["calls"],
+                    "mean_seconds": latency["total_seconds"] / latency["calls"],
+                    "max_seconds": latency["max_seconds"],
+                    "last_seconds": latency["last_seconds"],
+                    "mean_wait_seconds": latency["wait_seconds"] / latency["calls"],
+                    "last_wait_seconds": latency["last_wait_seconds"],
+                }
+                for task, latency in self._latency.items()
+            }
+    
+    def embed(self, texts: list) -> list:
+        """Embed texts with this engine's model.
+        
+        Args:
+            texts: Strings to embed
+            
+        Returns:
+            One embedding vector per text
+            
+        Raises:
+            Exception: If Ollama cannot produce embeddings
+        """
+        response = self._request(lambda client: client.embed(model=self.model, input=texts, keep_alive=self.keep_alive))
+        return [list(vector) for vector in response['embeddings']]
+    
+    async def aembed(self, texts: list) -> list:
+        """Async variant of embed.
+        
+        Args:
+            texts: Strings to embed
+            
+        Returns:
+            One embedding vector per text
+            
+        Raises:
+            Exception: If Ollama cannot produce embeddings
+        """
+        response = await self._arequest(
+            lambda client: client.embed(model=self.model, input=texts, keep_alive=self.keep_alive)
+        )
+        return [list(vector) for vector in response['embeddings']]
+    
+    def warmup(self) -> bool:
+        """Load the model into memory without generating anything.
+        
+        Also serves as a keep-alive hint: Ollama resets the unload timer
+        every time the model is touched. With a host pool, every host
+        loads the model so failover does not hit a cold start.
+        
+        Returns:
+            True if the model is loaded (on at least one host of a pool)
+        """
+        if self.load_state != "loaded":
+            self.load_state = "loading"
+        
+        start = time.monotonic()
+        loaded = False
+        for client in self._clients():
+            try:
+                client.generate(model=self.model, prompt="", keep_alive=self.keep_alive)
+                loaded = True
+            except Exception:
+                pass
+        if not loaded:
+            self.load_state = "failed"
+            return False
+        
+        if self.load_state != "loaded":
+            self.load_seconds = time.monotonic() - start
+        self.load_state = "loaded"
+        return True
+    
+    def is_installed(self) -> Optional[bool]:
+        """Ask the server whether the model has been pulled and can be loaded.
+        
+        Blocks on one request per host, so it runs at startup and on the
+        keep-alive thread; routing only reads the answer kept in ``installed``.
+        
+        Returns:
+            True if any host has the model, False if none has it, None if
+            no host answered
+        """
+        installed, reachable = [], False
+        for client in self._clients():
+            try:
+                installed.extend(client.list()['models'])
+                reachable = True
+            except Exception:
+                pass
+        names = {self.model, f"{self.model}:latest"}
+        found = any(m.get('model') in names or m.get('name') in names for m in installed) if reachable else None
+        if found is not None:
+            self.installed = found  # An unreachable server keeps the last answer
+        return found
+    
+    def is_loaded(self) -> bool:
+        """Ask Ollama whether the model is currently resident.
+        
+        Returns:
+            True if the model is loaded (on any host of a pool)
+        """
+        running, reachable = [], False
+        for client in self._clients():
+            try:
+                running.extend(client.ps()['models'])
+                reachable = True
+            except Exception:
+                pass
+        if not reachable:
+            self.load_state = "failed"
+            return False
+        
+        loaded = any(m.get('model') == self.model or m.get('name') == self.model for m in running)
+        self.load_state = "loaded" if loaded else "unknown"
+        return loaded
@@ -0,0 +1,176 @@
+"""Task-based model routing.
+
+Call sites name the kind of work they need (``classify``, ``extract``,
+``safety``, ``answer``, ...) instead of a model. ``models.routes`` maps task
+classes to models, so one-word tasks can run on a small model while answers
+use ``models.llm``. Tasks without a route use ``models.llm``.
+
+A routed model that the server reports as not installed (an upgrade that
+never pulled it) is skipped in favour of ``models.llm``. The server is asked
+by check_installed() at startup and on the keep-alive thread, never on the
+request path.
+
+Routes listed in ``slo.fallbacks`` are downgraded to their fallback model
+while the primary misses its latency objectives (see kai.ai.slo).
+"""
+
+import logging
+import weakref
+from typing import Dict, List, Optional
+from kai.ai import slo
+from kai.ai.clients import get_llm
+
+logger = logging.getLogger(__name__)
+_warned = set()  # Missing models already logged
+_routers = weakref.WeakKeyDictionary()  # Config to its shared router
+
+
+class ModelRouter:
+    """Maps task classes to models and reports per-route latency."""
+
+    def __init__(self, default_model: str = "llama3.2:3b", routes: Optional[Dict[str, Optional[str]]] = None,
+                 fallbacks: Optional[Dict[str, Optional[str]]] = None, policy: Optional[slo.SLOPolicy] = None):
+        """Initialize model router.
+
+        Args:
+            default_model: Model for tasks without a route
+            routes: Task class to model name; None values use the default
+            fallbacks: Task class to downgrade model
+            policy: Latency objectives; None disables automatic downgrade
+        """
+        self.default_model = default_model
+        self.routes = {task: model for task, model in (routes or {}).items() if model}
+        self.fallbacks = {task: model for task, model in (fallbacks or {}).items() if model}
+        self.policy = policy
+
+    @classmethod
+    def from_config(cls, config) -> "ModelRouter":
+        """Create a router from ``models.llm`` and ``models.routes``.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Model router
+        """
+        return cls(
+            default_model=config.get("models.llm", "llama3.2:3b"),
+            routes=config.get("models.routes", {}),
+            fallbacks=config.get("slo.fallbacks", {}),
+            policy=slo.SLOPolicy.from_config(config) if config.get("slo.enabled", True) else None
+        )
+
+    def primary_for(self, task: Optional[str]) -> str:
+        """Get the configured model for a task class, ignoring downgrades.
+
+        Args:
+            task: Task class, e.g. "classify"
+
+        Returns:
+            Model name
+        """
+        return self.routes.get(task, self.default_model)
+
+    def model_for(self, task: Optional[str]) -> str:
+        """Get the model serving a task class right now.
+
+        Args:
+            task: Task class, e.g. "classify"
+
+        Returns:
+            Model name: the route, models.llm if the route isn't installed,
+            or the fallback while the primary misses its SLO
+        """
+        primary = self.primary_for(task)
+        if primary != self.default_model and get_llm(primary).installed is False:
+            if primary not in _warned:
+                _warned.add(primary)
+                logger.warning("Model %s is not installed, using %s instead (ollama pull %s)",
+                               primary, self.default_model, primary)
+            primary = self.default_model
+        fallback = self.fallbacks.get(task)
+        if self.policy is None or not fallback or fallback == primary:
+            return primary
+        return slo.guard.select(task, get_llm(primary), get_llm(fallback), self.policy)
+
+    def check_installed(self) -> Dict[str, Optional[bool]]:
+        """Ask the server which routed and fallback models are installed.
+
+        Blocks on the server; call it off the event loop. model_for() and
+        the SLO guard read the answers from the shared engines.
+
+        Returns:
+            Model name to True, False, or None if no host answered
+        """
+        return {model: get_llm(model).is_installed() for model in self.models()}
+
+    def engine(self, task: Optional[str]):
+        """Get the shared engine serving a task class.
+
+        Args:
+            task: Task class
+
+        Returns:
+            Shared LLMEngine instance
+        """
+        return get_llm(self.model_for(task))
+
+    def models(self) -> List[str]:
+        """Get every routed and fallback model, default first.
+
+        Returns:
+            Distinct model names
+        """
+        models = [self.default_model]
+        for model in list(self.routes.values()) + list(self.fallbacks.values()):
+            if model not in models:
+                models.append(model)
+        return models
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get latency per route.
+
+        Returns:
+            Task class to model, call count, mean and max seconds, for every
+            task that has made at least one model call; calls served by a
+            fallback are listed as "<task> (fallback)"
+        """
+        stats = {}
+        for model in self.models():
+            for task, latency in get_llm(model).latency_stats().items():
+                if self.primary_for(task) == model:
+                    stats[task] = dict(latency, model=model)
+                elif self.fallbacks.get(task) == model:
+                    stats[f"{task} (fallback)"] = dict(latency, model=model)
+        return stats
+
+
+def get_llm_for(task: str, config=None):
+    """Get the shared engine for a task class.
+
+    Args:
+        task: Task class, e.g. "extract"
+        config: Configuration object, defaults to the user's config file
+
+    Returns:
+        Shared LLMEngine instance
+    """
+    if config is None:
+        from kai.core.config import Config
+        config = Config()
+    return router_for(config).engine(task)
+
+
+def router_for(config) -> ModelRouter:
+    """Get the router shared by everything using a configuration.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Model router, built on first use
+    """
+    router = _routers.get(config)
+    if router is None:
+        router = _routers[config] = ModelRouter.from_config(config)
+    return router
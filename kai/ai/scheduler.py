@@ -0,0 +1,240 @@
+"""Priority scheduling of LLM requests.
+
+A local Ollama usually works through requests one at a time, so a history
+summary or other background job in flight delays the user's turn by its
+full generation time. The scheduler gives each backend a bounded number of
+request slots and two priority classes. Interactive requests always go
+first; background requests only start while no interactive request is
+running or waiting, and a running background request is preempted as soon
+as an interactive one arrives: LLMEngine runs background requests as
+streams, stops reading at the next token (which closes the connection and
+ends generation on the server) and queues the job again.
+
+Both threads and event loops can wait for a slot, so background work on
+worker threads and async turns share one queue per backend.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+
+class Preempted(Exception):
+    """A background request gave up its slot to an interactive one."""
+
+
+@dataclass(eq=False)
+class Lease:
+    """A granted (or pending) request slot."""
+
+    key: Optional[str]
+    priority: str
+    queued_at: float = field(default_factory=time.monotonic)
+    wait_seconds: float = 0.0
+    granted: bool = False
+    abandoned: bool = False
+    cancelled: threading.Event = field(default_factory=threading.Event)
+
+    @property
+    def preemptible(self) -> bool:
+        """Whether an interactive request may take this slot over."""
+        return self.priority == BACKGROUND
+
+    def check(self):
+        """Raise Preempted if an interactive request wants the slot.
+
+        Raises:
+            Preempted: If the lease was preempted
+        """
+        if self.cancelled.is_set():
+            raise Preempted(f"background request on {self.key or 'default host'} preempted")
+
+
+class LLMScheduler:
+    """Per-backend request slots with interactive and background classes."""
+
+    def __init__(self, concurrency: int = 2, background_tasks: Iterable[str] = ("summarize",),
+                 limits: Optional[Dict[Optional[str], int]] = None):
+        """Initialize scheduler.
+
+        Args:
+            concurrency: Requests in flight per backend host
+            background_tasks: Task classes scheduled as background work
+            limits: Per-host overrides of concurrency (None is the default host)
+        """
+        self.concurrency = max(1, concurrency)
+        self.background_tasks = set(background_tasks)
+        self.limits = dict(limits or {})
+        self._lock = threading.Lock()
+        self._running: Dict[Optional[str], List[Lease]] = {}
+        self._waiting: Dict[Optional[str], list] = {}
+        self._order = itertools.count()
+        self._stats = {
+            priority: {"requests": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0, "preempted": 0}
+            for priority in PRIORITIES
+        }
+
+    @classmethod
+    def from_config(cls, config, hosts: int = 1) -> "LLMScheduler":
+        """Create a scheduler from the ``scheduler.*`` configuration.
+
+        Args:
+            config: Configuration object
+            hosts: Hosts behind the default host key (models.llm_hosts)
+
+        Returns:
+            LLM scheduler
+        """
+        concurrency = config.get("scheduler.concurrency", 2)
+        return cls(
+            concurrency=concurrency,
+            background_tasks=config.get("scheduler.background_tasks", ["summarize"]),
+            limits={None: concurrency * max(1, hosts)}
+        )
+
+    def priority_for(self, task: Optional[str]) -> str:
+        """Get the priority class of a task.
+
+        Args:
+            task: Call-site task name
+
+        Returns:
+            INTERACTIVE or BACKGROUND
+        """
+        return BACKGROUND if task in self.background_tasks else INTERACTIVE
+
+    def acquire(self, key: Optional[str], priority: str = INTERACTIVE) -> Lease:
+        """Wait for a request slot on the calling thread.
+
+        Args:
+            key: Backend host the request goes to
+            priority: INTERACTIVE or BACKGROUND
+
+        Returns:
+            Granted lease; pass it to release() when the request is done
+        """
+        granted = threading.Event()
+        lease = self._enqueue(key, priority, granted.set)
+        granted.wait()
+        return lease
+
+    async def aacquire(self, key: Optional[str], priority: str = INTERACTIVE) -> Lease:
+        """Wait for a request slot without blocking the event loop.
+
+        Args:
+            key: Backend host the request goes to
+            priority: INTERACTIVE or BACKGROUND
+
+        Returns:
+            Granted lease; pass it to release() when the request is done
+        """
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        lease = self._enqueue(key, priority, grant)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                lease.abandoned = True
+                was_granted = lease.granted
+            if was_granted:
+                self.release(lease)
+            raise
+        return lease
+
+    def release(self, lease: Lease):
+        """Give a slot back and admit the next waiting request.
+
+        Args:
+            lease: Lease returned by acquire() or aacquire()
+        """
+        with self._lock:
+            running = self._running.get(lease.key, [])
+            if lease in running:
+                running.remove(lease)
+                if lease.cancelled.is_set():
+                    self._stats[lease.priority]["preempted"] += 1
+            self._dispatch(lease.key)
+
+    def stats(self) -> Dict[str, dict]:
+        """Get queueing statistics per priority class.
+
+        Returns:
+            Priority class to requests, mean and max queue wait seconds,
+            preemptions, and requests currently running and waiting
+        """
+        with self._lock:
+            running = [lease for leases in self._running.values() for lease in leases]
+            waiting = [entry[2] for entries in self._waiting.values() for entry in entries if not entry[2].abandoned]
+            return {
+                priority: {
+                    "requests": stats["requests"],
+                    "mean_wait_seconds": stats["wait_seconds"] / stats["requests"] if stats["requests"] else 0.0,
+                    "max_wait_seconds": stats["max_wait_seconds"],
+                    "preempted": stats["preempted"],
+                    "running": sum(1 for lease in running if lease.priority == priority),
+                    "waiting": sum(1 for lease in waiting if lease.priority == priority),
+                }
+                for priority, stats in self._stats.items()
+            }
+
+    def _enqueue(self, key: Optional[str], priority: str, grant) -> Lease:
+        """Queue a request and preempt background work if it is interactive."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+
+        lease = Lease(key=key, priority=priority)
+        with self._lock:
+            heapq.heappush(
+                self._waiting.setdefault(key, []),
+                (PRIORITIES.index(priority), next(self._order), lease, grant)
+            )
+            if priority == INTERACTIVE:
+                for running in self._running.get(key, []):
+                    if running.preemptible and not running.cancelled.is_set():
+                        running.cancelled.set()
+                        logger.debug("Preempting background request on %s", key or "default host")
+            self._dispatch(key)
+        return lease
+
+    def _dispatch(self, key: Optional[str]):
+        """Admit waiting requests while slots are free (caller holds the lock)."""
+        waiting = self._waiting.get(key, [])
+        running = self._running.setdefault(key, [])
+        limit = self.limits.get(key, self.concurrency)
+
+        while waiting:
+            _, _, lease, grant = waiting[0]
+            if lease.abandoned:
+                heapq.heappop(waiting)
+                continue
+            if len(running) >= limit:
+                return
+            if lease.priority == BACKGROUND and any(r.priority == INTERACTIVE for r in running):
+                # Interactive requests waiting would sort first, so only running ones block
+                return
+
+            heapq.heappop(waiting)
+            lease.granted = True
+            lease.wait_seconds = time.monotonic() - lease.queued_at
+            stats = self._stats[lease.priority]
+            stats["requests"] += 1
+            stats["wait_seconds"] += lease.wait_seconds
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], lease.wait_seconds)
+            running.append(lease)
+            grant()
@@ -0,0 +1,139 @@
+"""Latency SLOs and automatic model downgrade.
+
+When a route's primary model misses its latency objectives on this machine
+(rolling time-to-first-token above the target, or generation speed below
+it), the route switches to a fallback model. After a cool-down the primary
+gets another chance with a fresh measurement window; if it still misses, the
+route downgrades again.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SLOPolicy:
+    """Latency objectives for a route."""
+
+    ttft: float = 2.0  # Seconds to first token, rolling mean
+    tokens_per_second: float = 5.0  # Generation speed, rolling mean
+    min_samples: int = 3  # Calls measured before judging a model
+    recovery_seconds: float = 300.0  # Time on the fallback before retrying the primary
+
+    @classmethod
+    def from_config(cls, config) -> "SLOPolicy":
+        """Create a policy from the ``slo.*`` configuration.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            SLO policy
+        """
+        return cls(
+            ttft=config.get("slo.ttft", 2.0),
+            tokens_per_second=config.get("slo.tokens_per_second", 5.0),
+            min_samples=config.get("slo.min_samples", 3),
+            recovery_seconds=config.get("slo.recovery_seconds", 300.0)
+        )
+
+    def violation(self, performance: Dict[str, float]) -> Optional[str]:
+        """Check rolling performance against the objectives.
+
+        Args:
+            performance: LLMEngine.performance() of the route's model
+
+        Returns:
+            Description of the missed objective, or None if met or not yet measurable
+        """
+        if performance["samples"] < self.min_samples:
+            return None
+        if performance["ttft"] > self.ttft:
+            return f"time to first token {performance['ttft']:.2f}s > {self.ttft:.2f}s"
+        tps = performance["tokens_per_second"]
+        if tps is not None and tps < self.tokens_per_second:
+            return f"{tps:.1f} tokens/s < {self.tokens_per_second:.1f} tokens/s"
+        return None
+
+
+class SLOGuard:
+    """Process-wide record of which routes are downgraded."""
+
+    def __init__(self):
+        """Initialize SLO guard."""
+        self._active: Dict[str, tuple] = {}  # Task to (model, switched at)
+        self._lock = threading.Lock()
+        self.switches: List[dict] = []
+
+    def select(self, task: str, primary, fallback, policy: SLOPolicy) -> str:
+        """Pick the model for a route.
+
+        Args:
+            task: Task class
+            primary: LLMEngine of the preferred model
+            fallback: LLMEngine of the downgrade model, only used once
+                confirmed loaded or installed; the answers already kept on
+                the engine are read, the server is not asked
+            policy: Latency objectives
+
+        Returns:
+            Name of the model to use
+        """
+        with self._lock:
+            model, since = self._active.get(task, (primary.model, 0.0))
+
+            if model != fallback.model:
+                reason = policy.violation(primary.performance(task))
+                if reason and not self._available(fallback):
+                    # A slow answer beats an error from a model that was never pulled
+                    logger.debug("Route %s: %s is not available, staying on %s", task, fallback.model, primary.model)
+                    return primary.model
+                if reason:
+                    self._switch(task, primary.model, fallback.model, reason)
+                    logger.warning("Route %s: switching %s -> %s (%s)", task, primary.model, fallback.model, reason)
+                    return fallback.model
+                return primary.model
+
+            if time.monotonic() - since >= policy.recovery_seconds:
+                # Retry the primary with a fresh window
+                primary.reset_performance(task)
+                self._switch(task, fallback.model, primary.model, "recovery window elapsed")
+                del self._active[task]
+                logger.info("Route %s: retrying %s after %.0fs on %s", task, primary.model,
+                            policy.recovery_seconds, fallback.model)
+                return primary.model
+
+            return fallback.model
+
+    @staticmethod
+    def _available(engine) -> bool:
+        """Whether a fallback is confirmed loaded or installed by the last check."""
+        return engine.load_state == "loaded" or engine.installed is True
+
+    def active(self) -> Dict[str, str]:
+        """Get routes currently served by a fallback.
+
+        Returns:
+            Task class to model name
+        """
+        with self._lock:
+            return {task: model for task, (model, _) in self._active.items()}
+
+    def reset(self):
+        """Return every route to its primary model."""
+        with self._lock:
+            self._active.clear()
+
+    def _switch(self, task: str, old: str, new: str, reason: str):
+        """Record a model switch (caller holds the lock)."""
+        self._active[task] = (new, time.monotonic())
+        self.switches.append({"task": task, "from": old, "to": new, "reason": reason, "at": time.time()})
+
+
+# Process-wide guard
+guard = SLOGuard()
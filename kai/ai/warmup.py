@@ -0,0 +1,79 @@
+"""Model warm-up and keep-alive.
+
+Ollama loads a model on first use and unloads it after an idle period, so
+the first query after startup (or after a quiet spell) pays the full load
+time. ModelWarmer preloads models on a background thread and, while voice
+mode is active, periodically touches them so they stay resident.
+"""
+
+import threading
+from typing import Dict, List
+
+
+class ModelWarmer:
+    """Preloads LLM engines and keeps their models resident."""
+
+    def __init__(self, engines: List, interval: float = 240.0):
+        """Initialize model warmer.
+
+        Args:
+            engines: LLMEngine instances whose models should stay loaded
+            interval: Seconds between keep-alive hints
+        """
+        self.engines = engines
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def preload(self, wait: bool = False):
+        """Load all models in the background.
+
+        Args:
+            wait: Block until every model has finished loading
+        """
+        threads = [
+            threading.Thread(target=engine.warmup, daemon=True, name=f"kai-warmup-{engine.model}")
+            for engine in self.engines
+        ]
+        for thread in threads:
+            thread.start()
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def start(self):
+        """Start sending periodic keep-alive hints."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._keepalive_loop, daemon=True, name="kai-keepalive")
+        self._thread.start()
+
+    def stop(self):
+        """Stop sending keep-alive hints."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def states(self) -> Dict[str, str]:
+        """Get load state per model.
+
+        Returns:
+            Dict of model name to "unknown", "loading", "loaded" or "failed"
+        """
+        return {engine.model: engine.load_state for engine in self.engines}
+
+    def _keepalive_loop(self):
+        """Touch every model each interval until stopped.
+
+        Models not yet confirmed installed are asked about again, so one
+        pulled after startup is picked up by routing.
+        """
+        while not self._stop.wait(self.interval):
+            for engine in self.engines:
+                if self._stop.is_set():
+                    break
+                if engine.installed is not True:
+                    engine.is_installed()
+                engine.warmup()
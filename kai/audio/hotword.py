@@ -3,7 +3,7 @@
 import pyaudio
 import struct
 import math
-from typing import Callable, Optional
+from typing import Callable
 import threading
 
 
@@ -0,0 +1,776 @@
+"""Staged asynchronous voice pipeline.
+
+The voice loop used to run a whole conversation (listening, the LLM, speech
+synthesis and playback) inside the wake-word callback, on the detector's
+listening thread. Detection stopped and the microphone buffer overflowed
+while Kai was thinking or speaking. Here every step is a stage with its own
+worker on one event loop:
+
+    capture -> wake -> stt -> nlu -> plugin -> tts -> playback
+
+Stages are connected by bounded queues. A full queue makes the stage before
+it wait, so a slow synthesizer holds back the LLM stream rather than
+buffering a whole answer. The microphone can't wait. It is read on its own
+thread, and when the wake stage falls behind the oldest frames are dropped
+and counted. Any stage can cancel its current item, and interrupt() cancels
+the turn in flight from speech recognition to playback. Each stage reports
+its queue depth, wait time and processing latency.
+
+Microphone, transcriber, synthesizer and player are injected; the adapters
+at the end of the module wrap pyaudio, speech_recognition and GoogleTTS.
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+import numpy as np
+
+from kai.core.metrics import audio_overflows
+from kai.core.streaming import aiter_sentences
+from kai.core.tracing import NOOP_SPAN, tracer
+
+logger = logging.getLogger(__name__)
+
+TURN_STAGES = ("stt", "nlu", "plugin", "tts", "playback")  # Work belonging to one utterance
+
+
+@dataclass(eq=False)
+class Turn:
+    """One utterance on its way through the pipeline."""
+
+    id: int
+    audio: bytes = b""
+    text: Optional[str] = None
+    intent: Any = None
+    response: str = ""
+    stream: Any = None  # ResponseStream of the answer, for its latency
+    timings: Dict[str, float] = field(default_factory=dict)  # Stage name to monotonic finish time
+    span: Any = NOOP_SPAN  # Trace span covering the turn until its last sentence is played
+    pending: int = 0  # Sentences queued for speech but not yet played
+    answered: bool = False  # The response stream has ended
+
+    def mark(self, stage: str):
+        """Record the time a stage finished with this turn."""
+        self.timings.setdefault(stage, time.monotonic())
+
+
+@dataclass
+class StageMetrics:
+    """Counters of one stage."""
+
+    items: int = 0
+    dropped: int = 0
+    cancelled: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_depth: int = 0
+
+
+class Stage:
+    """A pipeline step: one worker taking items from a bounded queue."""
+
+    def __init__(self, name: str, handler: Callable[[Any], Awaitable[None]], maxsize: int = 2,
+                 on_cancel: Optional[Callable[[], None]] = None):
+        """Initialize stage.
+
+        Args:
+            name: Stage name, used in metrics
+            handler: Coroutine function processing one item
+            maxsize: Queue capacity
+            on_cancel: Called when the current item is cancelled, e.g. to stop playback
+        """
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.on_cancel = on_cancel
+        self.metrics = StageMetrics()
+        self.queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._current: Optional[asyncio.Task] = None
+
+    @property
+    def busy(self) -> bool:
+        """Whether the stage is processing or holding an item."""
+        return self._current is not None or bool(self.queue and self.queue.qsize())
+
+    def start(self):
+        """Create the queue and the worker on the running loop."""
+        self.queue = asyncio.Queue(self.maxsize)
+        self._worker = asyncio.ensure_future(self._run())
+
+    async def put(self, item: Any):
+        """Queue an item, waiting while the stage is full (backpressure).
+
+        Args:
+            item: Item to process
+        """
+        await self.queue.put((time.monotonic(), item))
+        self._track_depth()
+
+    def offer(self, item: Any) -> bool:
+        """Queue an item without waiting, dropping the oldest item if full.
+
+        Args:
+            item: Item to process
+
+        Returns:
+            False if an older item was dropped to make room
+        """
+        kept = True
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            self.metrics.dropped += 1
+            kept = False
+        self.queue.put_nowait((time.monotonic(), item))
+        self._track_depth()
+        return kept
+
+    def cancel(self, flush: bool = True) -> int:
+        """Cancel the item being processed and, optionally, the queued ones.
+
+        Args:
+            flush: Also discard queued items
+
+        Returns:
+            Number of items cancelled
+        """
+        cancelled = 0
+        if flush and self.queue is not None:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.queue.task_done()
+                cancelled += 1
+        if self._current is not None and not self._current.done():
+            self._current.cancel()
+            cancelled += 1
+            if self.on_cancel is not None:
+                # Unblock work running on a thread, which task cancellation can't reach
+                self.on_cancel()
+        self.metrics.cancelled += cancelled
+        return cancelled
+
+    async def stop(self):
+        """Cancel the worker and wait for it to exit."""
+        self.cancel()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def stats(self) -> dict:
+        """Get the stage's metrics.
+
+        Returns:
+            Dict with queue depth, items, drops, cancellations, errors and
+            mean/max/last processing and mean queue wait seconds
+        """
+        metrics = self.metrics
+        return {
+            "depth": self.queue.qsize() if self.queue is not None else 0,
+            "max_depth": metrics.max_depth,
+            "items": metrics.items,
+            "dropped": metrics.dropped,
+            "cancelled": metrics.cancelled,
+            "errors": metrics.errors,
+            "mean_seconds": metrics.busy_seconds / metrics.items if metrics.items else 0.0,
+            "max_seconds": metrics.max_seconds,
+            "last_seconds": metrics.last_seconds,
+            "mean_wait_seconds": metrics.wait_seconds / metrics.items if metrics.items else 0.0,
+        }
+
+    async def _run(self):
+        """Process items until stopped."""
+        while True:
+            queued_at, item = await self.queue.get()
+            started = time.monotonic()
+            self._current = asyncio.ensure_future(self.handler(item))
+            try:
+                await self._current
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():
+                    self._current.cancel()
+                    raise
+                continue  # Only this item was cancelled; the stage keeps running
+            except Exception:
+                self.metrics.errors += 1
+                logger.exception("Voice pipeline stage %s failed", self.name)
+                continue
+            finally:
+                self._current = None
+                self.queue.task_done()
+
+            elapsed = time.monotonic() - started
+            metrics = self.metrics
+            metrics.items += 1
+            metrics.busy_seconds += elapsed
+            metrics.last_seconds = elapsed
+            metrics.max_seconds = max(metrics.max_seconds, elapsed)
+            metrics.wait_seconds += started - queued_at
+
+    def _track_depth(self):
+        self.metrics.max_depth = max(self.metrics.max_depth, self.queue.qsize())
+
+
+class EnergyDetector:
+    """Energy-based wake trigger and voice activity detection.
+
+    Uses the same rules as WakeWordDetector: the threshold is calibrated
+    from ambient noise, and a wake needs several consecutive frames well
+    above it.
+    """
+
+    def __init__(self, sensitivity: float = 0.3, threshold: Optional[float] = None,
+                 calibration_frames: int = 10, wake_frames: int = 5):
+        """Initialize detector.
+
+        Args:
+            sensitivity: Detection sensitivity (0.0 to 1.0, lower = less sensitive)
+            threshold: Fixed RMS threshold; calibrated from the first frames if None
+            calibration_frames: Frames of ambient noise used for calibration
+            wake_frames: Consecutive loud frames that count as a wake
+        """
+        self.sensitivity = sensitivity
+        self.threshold = threshold
+        self.calibration_frames = calibration_frames
+        self.wake_frames = wake_frames
+        self._ambient = []
+        self._loud = 0
+
+    @staticmethod
+    def energy(frame: bytes) -> float:
+        """Get the RMS energy of 16-bit mono PCM.
+
+        Args:
+            frame: Audio frame
+
+        Returns:
+            Root mean square sample value
+        """
+        samples = np.frombuffer(frame[:len(frame) - len(frame) % 2], dtype=np.int16).astype(np.float32)
+        if not samples.size:
+            return 0.0
+        return float(np.sqrt(np.mean(samples ** 2)))
+
+    def is_speech(self, frame: bytes) -> bool:
+        """Check whether a frame is louder than the threshold.
+
+        Args:
+            frame: Audio frame
+
+        Returns:
+            True for voice activity; always False while calibrating
+        """
+        return self._is_speech(self.energy(frame))
+
+    def is_wake(self, frame: bytes) -> bool:
+        """Feed a frame while asleep and check for a wake trigger.
+
+        Args:
+            frame: Audio frame
+
+        Returns:
+            True once enough consecutive frames were well above the threshold
+        """
+        energy = self.energy(frame)
+        loud = self._is_speech(energy) and energy > self.threshold * 1.5
+        self._loud = self._loud + 1 if loud else 0
+        if self._loud >= self.wake_frames:
+            self._loud = 0
+            return True
+        return False
+
+    def _is_speech(self, energy: float) -> bool:
+        """Compare an energy with the threshold, calibrating it first."""
+        if self.threshold is None:
+            self._ambient.append(energy)
+            if len(self._ambient) >= self.calibration_frames:
+                ambient = sum(self._ambient) / len(self._ambient)
+                self.threshold = max(ambient * (3.0 + self.sensitivity * 4.0), 300.0)
+                logger.info("Voice threshold calibrated to %.1f (ambient %.1f)", self.threshold, ambient)
+            return False
+        return energy > self.threshold
+
+
+class VoicePipeline:
+    """Capture -> wake -> stt -> nlu -> plugin -> tts -> playback."""
+
+    def __init__(self, assistant, source, transcriber: Callable[[bytes], tuple],
+                 synthesizer: Optional[Callable[[str], Any]] = None, player=None,
+                 detector: Optional[EnergyDetector] = None,
+                 session: str = "voice", sample_rate: int = 16000, queue_size: int = 2,
+                 frame_queue: int = 64, silence_seconds: float = 0.8, awake_seconds: float = 5.0,
+                 min_speech_seconds: float = 0.2, prepare_speech: Callable[[str], str] = str.strip,
+                 shortcut: Optional[Callable[[str], Optional[str]]] = None,
+                 on_event: Optional[Callable[[str, Any], None]] = None,
+                 wake_reply: Optional[str] = "Yes?", sleep_reply: Optional[str] = "Going to sleep",
+                 unclear_reply: Optional[str] = "Sorry, I didn't catch that",
+                 error_reply: Optional[str] = "Sorry, something went wrong"):
+        """Initialize voice pipeline.
+
+        Args:
+            assistant: Assistant providing recognize() and respond()
+            source: Microphone with a blocking read() returning PCM frames
+                (empty at end of input) and close()
+            transcriber: Called on a worker thread with utterance audio,
+                returns (text, status) like SpeechRecognizer.listen
+            synthesizer: Called on a worker thread with a sentence, returns audio
+                for the player; None to answer in text only
+            player: Object with a blocking play(audio) and a stop() that interrupts it
+            detector: Wake and voice activity detector
+            session: Assistant session of the voice conversation
+            sample_rate: Samples per second of the source
+            queue_size: Capacity of the queues between turn stages
+            frame_queue: Audio frames buffered before the oldest are dropped
+            silence_seconds: Silence that ends an utterance
+            awake_seconds: Time without speech before going back to sleep
+            min_speech_seconds: Shorter sounds are ignored
+            prepare_speech: Cleans a sentence for speech
+            shortcut: Called with recognized text; a returned reply is spoken
+                instead of asking the assistant
+            on_event: Called with ("wake" | "sleep" | "utterance" | "unclear" | "text" |
+                "reply" | "intent" | "delta" | "response" | "error" | "first_audio" |
+                "spoken" | "interrupted", payload) for display
+            wake_reply: Spoken on wake, None for silence
+            sleep_reply: Spoken when going back to sleep, None for silence
+            unclear_reply: Spoken when speech could not be recognized
+            error_reply: Spoken when the answer fails, instead of the error itself
+        """
+        self.assistant = assistant
+        self.source = source
+        self.transcriber = transcriber
+        self.synthesizer = synthesizer
+        self.player = player
+        self.detector = detector or EnergyDetector()
+        self.session = session
+        self.sample_rate = sample_rate
+        self.silence_seconds = silence_seconds
+        self.awake_seconds = awake_seconds
+        self.min_speech_seconds = min_speech_seconds
+        self.prepare_speech = prepare_speech
+        self.shortcut = shortcut
+        self.on_event = on_event
+        self.wake_reply = wake_reply
+        self.sleep_reply = sleep_reply
+        self.unclear_reply = unclear_reply
+        self.error_reply = error_reply
+
+        self.stages: Dict[str, Stage] = {
+            "wake": Stage("wake", self._wake, maxsize=frame_queue),
+            "stt": Stage("stt", self._stt, maxsize=queue_size),
+            "nlu": Stage("nlu", self._nlu, maxsize=queue_size),
+            "plugin": Stage("plugin", self._plugin, maxsize=queue_size),
+            "tts": Stage("tts", self._tts, maxsize=queue_size),
+            "playback": Stage("playback", self._playback, maxsize=queue_size,
+                              on_cancel=player.stop if player is not None else None),
+        }
+        self.capture = StageMetrics()  # The capture thread has no queue of its own
+        self.awake = False
+        self._turns = 0
+        self._active = set()  # Turns whose trace span is still open
+        self._utterance = []
+        self._speech_seconds = 0.0
+        self._silence = 0.0
+        self._idle = 0.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_done: Optional[asyncio.Event] = None
+        self._running = False
+
+    @property
+    def responding(self) -> bool:
+        """Whether a turn is between speech recognition and the end of playback."""
+        return any(self.stages[name].busy for name in TURN_STAGES)
+
+    async def start(self):
+        """Start the stage workers and the capture thread on the running loop."""
+        self._loop = asyncio.get_running_loop()
+        self._capture_done = asyncio.Event()
+        for stage in self.stages.values():
+            stage.start()
+        self._running = True
+        self._capture_thread = threading.Thread(target=self._capture, name="kai-capture", daemon=True)
+        self._capture_thread.start()
+
+    async def run(self):
+        """Run until the source ends or stop() is called, then drain."""
+        await self.start()
+        try:
+            await self._capture_done.wait()
+            await self.join()
+        finally:
+            await self.stop()
+
+    async def join(self):
+        """Wait until every queued item has been processed."""
+        for name in ("wake",) + TURN_STAGES:
+            await self.stages[name].queue.join()
+
+    async def stop(self):
+        """Stop capturing and cancel all stages."""
+        self._running = False
+        for stage in self.stages.values():
+            await stage.stop()
+        self._end_turns(interrupted=True)
+        if self._capture_done is not None:
+            self._capture_done.set()
+        if self.player is not None:
+            self.player.stop()
+        try:
+            self.source.close()
+        except Exception:
+            pass
+
+    def interrupt(self) -> int:
+        """Cancel the turn in flight, from speech recognition to playback.
+
+        Thread-safe, for key handlers and barge-in.
+
+        Returns:
+            Number of items cancelled (0 when called from another thread)
+        """
+        if self._loop is not None and not self._in_loop():
+            self._loop.call_soon_threadsafe(self.interrupt)
+            return 0
+        cancelled = sum(self.stages[name].cancel() for name in TURN_STAGES)
+        self._end_turns(interrupted=True)
+        if cancelled:
+            self._emit("interrupted", cancelled)
+        return cancelled
+
+    def cancel(self, stage: str, flush: bool = True) -> int:
+        """Cancel the current item of one stage.
+
+        Args:
+            stage: Stage name
+            flush: Also discard the stage's queued items
+
+        Returns:
+            Number of items cancelled
+        """
+        cancelled = self.stages[stage].cancel(flush)
+        if cancelled and stage in TURN_STAGES:
+            self._end_turns(cancelled=stage)
+        return cancelled
+
+    def stats(self) -> Dict[str, dict]:
+        """Get per-stage metrics.
+
+        Returns:
+            Stage name to queue depth, item counts and latencies, in pipeline order
+        """
+        stats = {"capture": {"depth": 0, "max_depth": 0, "items": self.capture.items,
+                             "dropped": self.stages["wake"].metrics.dropped, "cancelled": 0, "errors": 0,
+                             "mean_seconds": 0.0, "max_seconds": 0.0, "last_seconds": 0.0,
+                             "mean_wait_seconds": 0.0}}
+        stats.update({name: stage.stats() for name, stage in self.stages.items()})
+        return stats
+
+    async def say(self, text: str):
+        """Queue a fixed phrase for speech.
+
+        Args:
+            text: Phrase to speak
+        """
+        if self.synthesizer is not None:
+            await self.stages["tts"].put((None, text))
+
+    # Stages
+
+    def _capture(self):
+        """Read the microphone on a dedicated thread so it never waits for the loop."""
+        try:
+            while self._running:
+                frame = self.source.read()
+                if not frame:
+                    break
+                self.capture.items += 1
+                self._loop.call_soon_threadsafe(self._offer_frame, frame)
+        except Exception as e:
+            if self._running:
+                logger.error("Audio capture failed: %s", e)
+        finally:
+            if self._loop.is_running():
+                self._loop.call_soon_threadsafe(self._capture_done.set)
+
+    def _offer_frame(self, frame: bytes):
+        """Queue a captured frame, counting frames dropped because wake detection fell behind."""
+        if not self.stages["wake"].offer(frame):
+            audio_overflows.inc(source="pipeline")
+
+    async def _wake(self, frame: bytes):
+        """Wake on a sustained sound, then cut speech into utterances at pauses."""
+        seconds = len(frame) / 2 / self.sample_rate
+
+        if self.responding:
+            # Half duplex: don't listen to our own voice
+            self._reset_utterance()
+            self._idle = 0.0
+            return
+
+        if not self.awake:
+            if self.detector.is_wake(frame):
+                tracer.record("wake", time.monotonic() - self.detector.wake_frames * seconds,
+                              threshold=self.detector.threshold)
+                self.awake = True
+                self._idle = 0.0
+                self._reset_utterance()
+                self._emit("wake", None)
+                if self.wake_reply:
+                    await self.say(self.wake_reply)
+            return
+
+        if self.detector.is_speech(frame):
+            self._utterance.append(frame)
+            self._speech_seconds += seconds
+            self._silence = 0.0
+            self._idle = 0.0
+            return
+
+        if self._utterance:
+            self._utterance.append(frame)
+            self._silence += seconds
+            if self._silence >= self.silence_seconds:
+                if self._speech_seconds >= self.min_speech_seconds:
+                    self._turns += 1
+                    turn = Turn(id=self._turns, audio=b"".join(self._utterance))
+                    turn.mark("wake")
+                    turn.span = tracer.start("turn", session=self.session, source="voice",
+                                             speech_seconds=round(self._speech_seconds, 3))
+                    if turn.span.recording:
+                        self._active.add(turn)
+                    self._emit("utterance", turn)
+                    await self.stages["stt"].put(turn)
+                self._reset_utterance()
+            return
+
+        self._idle += seconds
+        if self._idle >= self.awake_seconds:
+            self.awake = False
+            self._emit("sleep", None)
+            if self.sleep_reply:
+                await self.say(self.sleep_reply)
+
+    async def _stt(self, turn: Turn):
+        with tracer.span("stt", parent=turn.span):
+            text, status = await asyncio.to_thread(self.transcriber, turn.audio)
+        turn.mark("stt")
+        if status != "success" or not text:
+            self._end_turn(turn, status=status)
+            self._emit("unclear", turn)
+            if self.unclear_reply and status == "unclear":
+                await self.say(self.unclear_reply)
+            return
+        turn.text = text
+        self._emit("text", turn)
+        reply = self.shortcut(text) if self.shortcut is not None else None
+        if reply:
+            turn.response = reply
+            self._end_turn(turn, intent="shortcut")
+            self._emit("reply", turn)
+            await self.say(reply)
+            return
+        await self.stages["nlu"].put(turn)
+
+    async def _nlu(self, turn: Turn):
+        with tracer.span("nlu", parent=turn.span):
+            turn.intent = await self.assistant.recognize(turn.text, session=self.session)
+        turn.span.set(intent=turn.intent.name)
+        turn.mark("nlu")
+        self._emit("intent", turn)
+        await self.stages["plugin"].put(turn)
+
+    async def _plugin(self, turn: Turn):
+        try:
+            with tracer.span("plugin", parent=turn.span):
+                await self._answer(turn)
+        except Exception as e:
+            # Sentences already queued still play; the error is reported, never spoken
+            turn.answered = True
+            self._emit("error", e)
+            if self.error_reply:
+                await self.say(self.error_reply)
+            self._end_if_spoken(turn)
+            raise
+        turn.mark("plugin")
+        turn.answered = True
+        self._emit("response", turn)
+        self._end_if_spoken(turn)
+
+    async def _answer(self, turn: Turn):
+        """Stream the response, queueing each sentence for speech as it completes."""
+        stream = turn.stream = await self.assistant.respond(turn.text, turn.intent, session=self.session)
+
+        async def deltas():
+            async for delta in stream:
+                self._emit("delta", delta)
+                yield delta
+
+        try:
+            async for sentence in aiter_sentences(deltas()):
+                turn.mark("first_sentence")
+                speech = self.prepare_speech(sentence)
+                if speech and self.synthesizer is not None:
+                    turn.pending += 1
+                    await self.stages["tts"].put((turn, speech))
+        finally:
+            # Cancelled mid-answer: end the generation and free the session
+            await stream.aclose()
+        turn.response = stream.text
+
+    async def _tts(self, item: tuple):
+        turn, text = item
+        with tracer.span("tts", parent=turn.span) if turn is not None else NOOP_SPAN:
+            audio = await asyncio.to_thread(self.synthesizer, text)
+        if audio is not None:
+            await self.stages["playback"].put((turn, text, audio))
+        elif turn is not None:
+            self._sentence_done(turn)
+
+    async def _playback(self, item: tuple):
+        turn, text, audio = item
+        if turn is not None and "first_audio" not in turn.timings:
+            turn.mark("first_audio")
+            turn.span.set(first_audio=turn.timings["first_audio"] - turn.timings["wake"])
+            self._emit("first_audio", turn)
+        with tracer.span("playback", parent=turn.span) if turn is not None else NOOP_SPAN:
+            await asyncio.to_thread(self.player.play, audio)
+        self._emit("spoken", text)
+        if turn is not None:
+            self._sentence_done(turn)
+
+    # Helpers
+
+    def _sentence_done(self, turn: Turn):
+        turn.pending -= 1
+        self._end_if_spoken(turn)
+
+    def _end_if_spoken(self, turn: Turn):
+        """End the turn once the answer is complete and its last sentence played."""
+        if turn.answered and turn.pending <= 0:
+            self._end_turn(turn)
+
+    def _end_turn(self, turn: Turn, **attributes):
+        if turn in self._active:
+            self._active.discard(turn)
+            turn.span.finish(**attributes)
+
+    def _end_turns(self, **attributes):
+        for turn in list(self._active):
+            self._end_turn(turn, **attributes)
+
+    def _reset_utterance(self):
+        self._utterance = []
+        self._speech_seconds = 0.0
+        self._silence = 0.0
+
+    def _emit(self, event: str, payload: Any):
+        if self.on_event is not None:
+            try:
+                self.on_event(event, payload)
+            except Exception as e:
+                logger.debug("Voice pipeline event handler failed: %s", e)
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+
+class MicrophoneSource:
+    """Microphone frames from pyaudio.
+
+    The stream runs in callback mode, so pyaudio reports overflows (audio
+    lost because it was not collected in time) in the callback's status
+    flags. They are counted in kai_audio_overflows_total without reading
+    anything twice.
+    """
+
+    def __init__(self, rate: int = 16000, chunk: int = 1024, buffer_frames: int = 64):
+        """Open the default input device.
+
+        Args:
+            rate: Samples per second
+            chunk: Samples per frame
+            buffer_frames: Frames held for read() before the oldest is dropped
+        """
+        import pyaudio
+
+        self.chunk = chunk
+        self.frames = queue.Queue(maxsize=buffer_frames)
+        self._closed = threading.Event()
+        self._overflow = pyaudio.paInputOverflow
+        self._continue = pyaudio.paContinue
+        self.audio = pyaudio.PyAudio()
+        self.stream = self.audio.open(format=pyaudio.paInt16, channels=1, rate=rate, input=True,
+                                      frames_per_buffer=chunk, stream_callback=self._callback)
+
+    def read(self) -> bytes:
+        """Read one frame, blocking until it is available.
+
+        Returns:
+            Frame bytes, empty once the source is closed
+        """
+        while not self._closed.is_set():
+            try:
+                return self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return b""
+
+    def close(self):
+        """Close the input stream."""
+        self._closed.set()
+        try:
+            self.stream.stop_stream()
+            self.stream.close()
+        finally:
+            self.audio.terminate()
+
+    def _callback(self, data, frame_count, time_info, status):
+        """Queue a frame from pyaudio's audio thread."""
+        if status & self._overflow:
+            audio_overflows.inc(source="microphone")
+        try:
+            self.frames.put_nowait(data)
+        except queue.Full:
+            # read() fell behind; keep the newest audio
+            self.frames.get_nowait()
+            self.frames.put_nowait(data)
+            audio_overflows.inc(source="microphone")
+        return None, self._continue
+
+
+class TTSPlayer:
+    """Adapts GoogleTTS to the synthesizer and player the pipeline expects."""
+
+    def __init__(self, tts):
+        """Initialize player.
+
+        Args:
+            tts: GoogleTTS instance
+        """
+        self.tts = tts
+
+    def synthesize(self, text: str) -> Optional[str]:
+        """Generate an audio file for a sentence."""
+        return self.tts.synthesize(text)
+
+    def play(self, audio_file: str):
+        """Play an audio file to the end."""
+        self.tts.play_file(audio_file)
+
+    def stop(self):
+        """Stop playback."""
+        self.tts.stop()
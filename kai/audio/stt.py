@@ -2,6 +2,7 @@
 
 import speech_recognition as sr
 from typing import Optional
+from kai.core.tracing import tracer
 
 
 class SpeechRecognizer:
@@ -28,6 +29,21 @@ class SpeechRecognizer:
             Tuple of (recognized_text, status)
             status can be: 'success', 'timeout', 'unclear', 'error'
         """
+        with tracer.span("stt.listen", timeout=timeout) as span:
+            text, status = self._listen(timeout, recalibrate)
+            span.set(status=status)
+        return text, status
+    
+    def _listen(self, timeout: int, recalibrate: bool) -> tuple[Optional[str], str]:
+        """Record one phrase from the microphone and recognize it.
+        
+        Args:
+            timeout: Maximum time to wait for speech
+            recalibrate: Whether to recalibrate for ambient noise before listening
+            
+        Returns:
+            Tuple of (recognized_text, status)
+        """
         try:
             with self.microphone as source:
                 # Quick recalibration to filter out any residual audio
@@ -39,7 +55,8 @@ class SpeechRecognizer:
                 
             print("🔄 Processing...")
             # Use Google Speech Recognition (free, no API key)
-            text = self.recognizer.recognize_google(audio)
+            with tracer.span("stt.recognize", seconds=len(audio.frame_data) / (audio.sample_rate * audio.sample_width)):
+                text = self.recognizer.recognize_google(audio)
             return text, 'success'
             
         except sr.WaitTimeoutError:
@@ -54,3 +71,35 @@ class SpeechRecognizer:
         except Exception as e:
             print(f"❌ Error: {e}")
             return None, 'error'
+
+
+def transcribe(audio: bytes, sample_rate: int = 16000, sample_width: int = 2,
+               recognizer: Optional[sr.Recognizer] = None) -> tuple[Optional[str], str]:
+    """Convert recorded speech to text.
+    
+    Used by the voice pipeline, which captures audio itself rather than
+    through SpeechRecognizer's microphone.
+    
+    Args:
+        audio: Raw mono PCM audio
+        sample_rate: Samples per second
+        sample_width: Bytes per sample
+        recognizer: Recognizer to use, defaults to a new one
+        
+    Returns:
+        Tuple of (recognized_text, status) like SpeechRecognizer.listen
+    """
+    recognizer = recognizer or sr.Recognizer()
+    with tracer.span("stt.recognize", seconds=len(audio) / (sample_rate * sample_width)) as span:
+        try:
+            text, status = recognizer.recognize_google(sr.AudioData(audio, sample_rate, sample_width)), 'success'
+        except sr.UnknownValueError:
+            text, status = None, 'unclear'
+        except sr.RequestError as e:
+            print(f"❌ Error with speech recognition service: {e}")
+            text, status = None, 'error'
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            text, status = None, 'error'
+        span.set(status=status)
+    return text, status
@@ -1,12 +1,16 @@
 """Better text-to-speech using Google TTS."""
 
 from gtts import gTTS
+import contextvars
 import tempfile
 import os
 import subprocess
 import re
+import queue
 import threading
-from typing import Optional
+import time
+from typing import Iterable, Optional
+from kai.core.tracing import tracer
 
 
 class GoogleTTS:
@@ -29,6 +33,7 @@ class GoogleTTS:
         self.temp_files = []
         self.current_process = None
         self.is_speaking = False
+        self.first_audio_at = None  # Monotonic time playback last started
         
     def speak(self, text: str, wait: bool = True, stream: bool = True):
         """Speak the given text with natural voice.
@@ -39,49 +44,84 @@ class GoogleTTS:
             stream: Whether to stream sentence-by-sentence for faster response
         """
         self.is_speaking = True
+        self.first_audio_at = None
         
-        # For long text, stream sentence by sentence with parallel processing
-        if stream and len(text) > 100:
-            sentences = self._split_sentences(text)
-            
-            # Process sentences with pipeline: generate next while playing current
-            import queue
-            import threading
-            
-            audio_queue = queue.Queue(maxsize=2)  # Buffer 2 audio files
-            
-            def generate_audio():
-                """Generate audio files in background thread."""
-                for sentence in sentences:
-                    if not self.is_speaking:
-                        break
-                    if sentence.strip():
-                        audio_file = self._generate_audio_file(sentence.strip())
-                        if audio_file and self.is_speaking:
-                            audio_queue.put(audio_file)
-                audio_queue.put(None)  # Signal end
-            
-            # Start generation thread
-            gen_thread = threading.Thread(target=generate_audio, daemon=True)
-            gen_thread.start()
-            
-            # Play audio files as they're generated
-            while self.is_speaking:
-                try:
-                    audio_file = audio_queue.get(timeout=10)
-                    if audio_file is None:  # End signal
-                        break
-                    if self.is_speaking:
-                        self._play_audio_file(audio_file)
-                except queue.Empty:
-                    break
-            
-            gen_thread.join(timeout=1)
-        else:
-            self._speak_chunk(text, wait=wait)
+        with tracer.span("tts.speak", chars=len(text)) as span:
+            # For long text, stream sentence by sentence with parallel processing
+            if stream and len(text) > 100:
+                self._speak_pipeline(self._split_sentences(text))
+            else:
+                self._speak_chunk(text, wait=wait)
+            self._trace_first_audio(span)
         
         self.is_speaking = False
     
+    def speak_stream(self, sentences: Iterable[str]):
+        """Speak sentences as they arrive from an incremental source.
+        
+        Synthesis of the first sentence starts as soon as it is produced, so
+        playback can begin while later sentences are still being generated.
+        
+        Args:
+            sentences: Iterable of sentences, e.g. from a streaming LLM response
+        """
+        self.is_speaking = True
+        self.first_audio_at = None
+        with tracer.span("tts.speak") as span:
+            self._speak_pipeline(sentences)
+            self._trace_first_audio(span)
+        self.is_speaking = False
+    
+    def _trace_first_audio(self, span):
+        """Add time to first audio to a speech span.
+        
+        Args:
+            span: Span started when speech was requested
+        """
+        if span.recording and self.first_audio_at is not None:
+            span.set(first_audio=self.first_audio_at - span.start)
+    
+    def _speak_pipeline(self, sentences: Iterable[str]):
+        """Generate next sentence's audio while playing the current one.
+        
+        Args:
+            sentences: Iterable of sentences to speak
+        """
+        audio_queue = queue.Queue(maxsize=2)  # Buffer 2 audio files
+        
+        def generate_audio():
+            """Generate audio files in background thread."""
+            for sentence in sentences:
+                if not self.is_speaking:
+                    break
+                if sentence.strip():
+                    audio_file = self._generate_audio_file(sentence.strip())
+                    if audio_file and self.is_speaking:
+                        audio_queue.put(audio_file)
+            audio_queue.put(None)  # Signal end
+        
+        # Start generation thread, keeping the current trace span
+        gen_thread = threading.Thread(target=contextvars.copy_context().run, args=(generate_audio,), daemon=True)
+        gen_thread.start()
+        
+        # Play audio files as they're generated. The source may still be
+        # waiting on the LLM, so only give up once it signals the end.
+        while self.is_speaking:
+            try:
+                audio_file = audio_queue.get(timeout=0.5)
+            except queue.Empty:
+                if gen_thread.is_alive():
+                    continue
+                break
+            if audio_file is None:  # End signal
+                break
+            if self.is_speaking:
+                if self.first_audio_at is None:
+                    self.first_audio_at = time.monotonic()
+                self._play_audio_file(audio_file)
+        
+        gen_thread.join(timeout=1)
+    
     def _split_sentences(self, text: str) -> list:
         """Split text into sentences for streaming.
         
@@ -102,11 +142,35 @@ class GoogleTTS:
             text: Text to convert to audio
             
         Returns:
-            Path to audio file, or None if generation failed
+            Path to audio file, or None if generation failed or speech was stopped
         """
         if not self.is_speaking:
             return None
+        
+        audio_file = self.synthesize(text)
+        return audio_file if self.is_speaking else None
+    
+    def synthesize(self, text: str) -> Optional[str]:
+        """Generate an audio file for text, applying the speed setting.
+        
+        Args:
+            text: Text to convert to audio
             
+        Returns:
+            Path to audio file, or None if generation failed
+        """
+        with tracer.span("tts.synthesize", chars=len(text)):
+            return self._synthesize(text)
+    
+    def _synthesize(self, text: str) -> Optional[str]:
+        """Run gTTS and the sox tempo change.
+        
+        Args:
+            text: Text to convert to audio
+            
+        Returns:
+            Path to audio file, or None if generation failed
+        """
         try:
             # Create TTS object
             tts = gTTS(text=text, lang=self.lang, slow=self.slow)
@@ -118,9 +182,6 @@ class GoogleTTS:
             
             tts.save(temp_file.name)
             
-            if not self.is_speaking:
-                return None
-            
             # Apply speed adjustment if needed
             if self.speed != 1.0 and not self.slow:
                 speed_file = tempfile.NamedTemporaryFile(delete=False, suffix='.mp3')
@@ -147,7 +208,23 @@ class GoogleTTS:
         """
         if not self.is_speaking or not audio_file:
             return
-            
+        self.play_file(audio_file)
+    
+    def play_file(self, audio_file: str):
+        """Play an audio file, blocking until it ends or stop() is called.
+        
+        Args:
+            audio_file: Path to audio file to play
+        """
+        with tracer.span("tts.play"):
+            self._play(audio_file)
+    
+    def _play(self, audio_file: str):
+        """Run mpg123 on an audio file.
+        
+        Args:
+            audio_file: Path to audio file to play
+        """
         try:
             mpg123_cmd = ['/usr/bin/mpg123', '-a', self.audio_device, '-q', audio_file]
             
@@ -208,6 +285,9 @@ class GoogleTTS:
             if not self.is_speaking:
                 return
             
+            if self.first_audio_at is None:
+                self.first_audio_at = time.monotonic()
+            
             # Build mpg123 command with audio device
             mpg123_cmd = ['/usr/bin/mpg123', '-a', self.audio_device, '-q', playback_file]
             
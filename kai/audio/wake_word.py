@@ -5,6 +5,7 @@ import numpy as np
 import threading
 from typing import Callable
 import time
+from kai.core.tracing import tracer
 
 
 class WakeWordDetector:
@@ -121,6 +122,7 @@ class WakeWordDetector:
         last_trigger = 0
         cooldown = 3.0  # seconds between triggers
         consecutive_high = 0
+        first_high_at = 0.0  # Monotonic time of the first chunk in the current run
         required_consecutive = 5  # Need 5 consecutive high-energy chunks (more strict)
         energy_buffer = []
         buffer_size = 10
@@ -170,6 +172,7 @@ class WakeWordDetector:
                     
                     # Show visual feedback only occasionally
                     if consecutive_high == 1:
+                        first_high_at = time.monotonic()
                         print(f"🔊 Sound detected (energy: {smoothed_energy:.1f}, ratio: {energy_ratio:.2f})")
                     
                     # Trigger only if we have enough consecutive high-energy chunks
@@ -179,6 +182,8 @@ class WakeWordDetector:
                             # Additional check: verify energy is still high
                             if energy_ratio > 1.3:
                                 print("✨ Wake word triggered!")
+                                tracer.record("wake", first_high_at, energy=float(smoothed_energy),
+                                              ratio=float(energy_ratio), threshold=float(self.energy_threshold))
                                 if self.callback:
                                     last_trigger = current_time
                                     consecutive_high = 0
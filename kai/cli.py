@@ -3,8 +3,11 @@
 import click
 import asyncio
 import re
+from pathlib import Path
+from typing import Optional
 from rich.console import Console
-from kai.core.assistant import Assistant
+from kai.core.daemon import DaemonClient
+from kai.core.streaming import ResponseStream
 
 console = Console()
 
@@ -53,6 +56,44 @@ def _clean_for_speech(text: str) -> str:
     return text.strip()
 
 
+def _print_stream(stream: ResponseStream) -> str:
+    """Print a streamed response as tokens arrive.
+    
+    Args:
+        stream: Response stream to consume, local or from the daemon
+        
+    Returns:
+        Full response text
+    """
+    console.print("[green]Kai:[/green] ", end="")
+    for chunk in stream:
+        console.print(chunk, end="", markup=False, highlight=False)
+    console.print("\n")
+    return stream.text
+
+
+def _format_latency(stream: ResponseStream, first_audio_at: Optional[float] = None,
+                    prompt_tokens: Optional[int] = None) -> str:
+    """Format time-to-first-token and time-to-first-audio for a turn.
+    
+    Args:
+        stream: Response stream of the turn
+        first_audio_at: Monotonic time playback started, if spoken
+        prompt_tokens: Estimated history + query tokens sent with the turn
+        
+    Returns:
+        Human-readable latency summary
+    """
+    parts = []
+    if stream.time_to_first_token is not None:
+        parts.append(f"first token {stream.time_to_first_token:.2f}s")
+    if first_audio_at is not None:
+        parts.append(f"first audio {first_audio_at - stream.started_at:.2f}s")
+    if prompt_tokens is not None:
+        parts.append(f"~{prompt_tokens} prompt tokens")
+    return "⏱️  " + (", ".join(parts) if parts else "no output")
+
+
 @click.group()
 @click.version_option(version="1.0.0")
 def main():
@@ -60,9 +101,30 @@ def main():
     pass
 
 
+def _connect(socket_path: Optional[str], use_daemon: bool) -> Optional[DaemonClient]:
+    """Connect to a running kai daemon.
+    
+    Args:
+        socket_path: Daemon socket, defaults to $XDG_RUNTIME_DIR/kai.sock
+        use_daemon: False to always run in-process
+        
+    Returns:
+        Daemon client, or None to run in-process
+    """
+    return DaemonClient.connect(socket_path) if use_daemon else None
+
+
+socket_option = click.option("--socket", "socket_path", default=None,
+                             help="kai daemon socket (default: $KAI_SOCKET or $XDG_RUNTIME_DIR/kai.sock)")
+daemon_option = click.option("--daemon/--no-daemon", "use_daemon", default=True,
+                             help="Use a running kai daemon, or run in-process")
+
+
 @main.command()
+@socket_option
+@daemon_option
 @click.argument("query", nargs=-1)
-def query(query):
+def query(query, socket_path, use_daemon):
     """Send a query to Kai."""
     if not query:
         console.print("[red]Please provide a query[/red]")
@@ -72,41 +134,149 @@ def query(query):
     
     console.print(f"[cyan]You:[/cyan] {query_text}")
     
+    client = _connect(socket_path, use_daemon)
+    if client is not None:
+        with client:
+            stream = client.query(query_text)
+            try:
+                _print_stream(stream)
+            except Exception as e:
+                console.print(f"\n[red]Error:[/red] {e}")
+                return
+        console.print(f"[dim]{_format_latency(stream, prompt_tokens=stream.prompt_tokens)}[/dim]")
+        return
+    
+    from kai.core.assistant import Assistant
     assistant = Assistant()
-    asyncio.run(assistant.initialize())
-    response = assistant.query(query_text)
+    assistant.start()
+    try:
+        stream = assistant.stream_query(query_text)
+        _print_stream(stream)
+        console.print(f"[dim]{_format_latency(stream, prompt_tokens=assistant.prompt_tokens)}[/dim]")
+    except Exception as e:
+        console.print(f"\n[red]Error:[/red] {e}")
+    finally:
+        assistant.shutdown()
+
+
+def _print_pipeline_stats(stats: dict):
+    """Print queue depth, drops and latency of each voice pipeline stage.
     
-    console.print(f"[green]Kai:[/green] {response}")
+    Args:
+        stats: VoicePipeline.stats()
+    """
+    for stage, stage_stats in stats.items():
+        console.print(
+            f"[dim]🎛️  {stage}: {stage_stats['items']} items, "
+            f"mean {stage_stats['mean_seconds']:.2f}s, max {stage_stats['max_seconds']:.2f}s, "
+            f"queued {stage_stats['mean_wait_seconds']:.2f}s, max depth {stage_stats['max_depth']}, "
+            f"{stage_stats['dropped']} dropped, {stage_stats['cancelled']} cancelled[/dim]"
+        )
+
+
+def _print_session_stats(stats: dict):
+    """Print per-route model latency, host health and speculation statistics.
+    
+    Args:
+        stats: Assistant.session_stats() of the local assistant or the daemon
+    """
+    for task, route in stats["routes"].items():
+        console.print(
+            f"[dim]🧠 {task} → {route['model']}: {route['calls']} calls, "
+            f"mean {route['mean_seconds']:.2f}s, max {route['max_seconds']:.2f}s, "
+            f"queued {route['mean_wait_seconds']:.2f}s[/dim]"
+        )
+    
+    for task, model in stats["downgraded"].items():
+        console.print(f"[dim]🐢 {task} downgraded to {model} (latency SLO missed)[/dim]")
+    
+    coalesced = stats["coalesced"]
+    if coalesced:
+        summary = ", ".join(f"{task} {count}" for task, count in sorted(coalesced.items()))
+        console.print(f"[dim]🔗 Coalesced identical LLM requests: {summary}[/dim]")
+    
+    background = stats["queues"].get("background")
+    if background and background["requests"]:
+        console.print(
+            f"[dim]⏳ Background LLM work: {background['requests']} requests, "
+            f"{background['preempted']} preempted, max wait {background['max_wait_seconds']:.2f}s[/dim]"
+        )
+    
+    for host, host_stats in stats["hosts"].items():
+        latency = f"{host_stats['latency']:.2f}s" if host_stats["latency"] is not None else "n/a"
+        console.print(
+            f"[dim]🖥  {host}: {'up' if host_stats['healthy'] else 'down'}, {host_stats['requests']} requests, "
+            f"latency {latency}, {host_stats['failures']} failures, {host_stats['failovers']} failovers[/dim]"
+        )
+    
+    sessions = stats.get("sessions", {})
+    if sessions.get("active", 0) > 1 or sessions.get("evicted"):
+        console.print(f"[dim]💬 Sessions: {sessions['active']} active, {sessions['evicted']} evicted when idle[/dim]")
+    
+    speculation = stats["speculation"]
+    if speculation["launched"]:
+        console.print(
+            f"[dim]🔮 Speculation: {speculation['hits']}/{speculation['launched']} hits "
+            f"({speculation['hit_rate']:.0%}), {speculation['wasted_tokens']} tokens wasted[/dim]"
+        )
 
 
 @main.command()
-def start():
+@socket_option
+@daemon_option
+def start(socket_path, use_daemon):
     """Start Kai in interactive mode."""
     console.print("[bold green]Kai Assistant[/bold green]")
     console.print("Type 'exit' or 'quit' to stop\n")
     
-    assistant = Assistant()
-    asyncio.run(assistant.initialize())
+    client = _connect(socket_path, use_daemon)
+    if client is not None:
+        console.print(f"[dim]Connected to kai daemon at {client.path}[/dim]\n")
+    else:
+        from kai.core.assistant import Assistant
+        assistant = Assistant()
+        assistant.start()
     
-    while True:
-        try:
-            user_input = console.input("[cyan]You:[/cyan] ")
-            
-            if user_input.lower() in ["exit", "quit"]:
-                console.print("[yellow]Goodbye![/yellow]")
+    def session_stats() -> dict:
+        return client.stats() if client is not None else assistant.session_stats()
+    
+    try:
+        while True:
+            try:
+                user_input = console.input("[cyan]You:[/cyan] ")
+                
+                if user_input.lower() in ["exit", "quit"]:
+                    _print_session_stats(session_stats())
+                    console.print("[yellow]Goodbye![/yellow]")
+                    break
+                
+                if not user_input.strip():
+                    continue
+                
+                if client is not None:
+                    stream = client.query(user_input)
+                    _print_stream(stream)
+                    prompt_tokens = stream.prompt_tokens
+                else:
+                    stream = assistant.stream_query(user_input)
+                    _print_stream(stream)
+                    prompt_tokens = assistant.prompt_tokens
+                console.print(f"[dim]{_format_latency(stream, prompt_tokens=prompt_tokens)}[/dim]\n")
+                
+            except KeyboardInterrupt:
+                _print_session_stats(session_stats())
+                console.print("\n[yellow]Goodbye![/yellow]")
                 break
-            
-            if not user_input.strip():
-                continue
-            
-            response = assistant.query(user_input)
-            console.print(f"[green]Kai:[/green] {response}\n")
-            
-        except KeyboardInterrupt:
-            console.print("\n[yellow]Goodbye![/yellow]")
-            break
-        except Exception as e:
-            console.print(f"[red]Error:[/red] {e}\n")
+            except ConnectionError as e:
+                console.print(f"[red]Error:[/red] lost connection to kai daemon ({e})")
+                break
+            except Exception as e:
+                console.print(f"[red]Error:[/red] {e}\n")
+    finally:
+        if client is not None:
+            client.close()
+        else:
+            assistant.shutdown()
 
 
 @main.command()
@@ -126,28 +296,30 @@ def voice(sensitivity, speak, speed, volume):
     console.print("Press Ctrl+C to stop\n")
     
     try:
-        from kai.audio.stt import SpeechRecognizer
-        from kai.audio.wake_word import WakeWordDetector
+        from kai.audio.pipeline import EnergyDetector, MicrophoneSource, TTSPlayer, VoicePipeline
+        from kai.audio.stt import transcribe
         from kai.audio.tts_gtts import GoogleTTS
         import subprocess
+        microphone = MicrophoneSource()
     except ImportError as e:
         console.print(f"[red]Error:[/red] Missing audio dependencies")
         console.print("Install with: pip install SpeechRecognition pyaudio numpy gTTS")
         return
     
     console.print("[cyan]Initializing Kai...[/cyan]")
+    from kai.core.assistant import Assistant
     assistant = Assistant()
-    asyncio.run(assistant.initialize())
+    assistant.start()
     
-    console.print("[cyan]Initializing speech recognition...[/cyan]")
-    stt = SpeechRecognizer()
+    assistant.start_keepalive()
+    assistant.start_metrics()
     
     # Initialize TTS if enabled
-    tts = None
+    player = None
     if speak:
         console.print("[cyan]Initializing text-to-speech (Google TTS)...[/cyan]")
         try:
-            tts = GoogleTTS(lang='en', slow=False, speed=speed)
+            player = TTSPlayer(GoogleTTS(lang='en', slow=False, speed=speed))
             # Set volume using amixer if available
             try:
                 subprocess.run(['amixer', 'sset', 'Master', f'{volume}%'], 
@@ -158,139 +330,101 @@ def voice(sensitivity, speak, speed, volume):
         except Exception as e:
             console.print(f"[yellow]Warning: TTS initialization failed: {e}[/yellow]")
             console.print("[yellow]Continuing without voice responses[/yellow]")
-            tts = None
+            player = None
     
-    def on_wake_word():
-        """Handle wake word detection."""
-        import time
-        
-        console.print("\n[bold green]✓ Wake word detected![/bold green]")
-        
-        # Speak friendly acknowledgment and WAIT for it to finish
-        if tts:
-            tts.speak("Yes?", wait=True)
-        
-        # Small delay to ensure audio output is completely done
-        time.sleep(0.3)
-        
-        # Enter conversation mode - stay awake for follow-up questions
-        silence_count = 0
-        unclear_count = 0
-        max_silence = 1  # Exit after 1 silent attempt (5 seconds)
-        max_unclear = 2  # Exit after 2 unclear attempts (avoid loops)
-        
-        while silence_count < max_silence and unclear_count < max_unclear:
-            # Listen for command
+    def forget(text: str) -> Optional[str]:
+        """Handle memory clear commands without asking the model."""
+        if any(word in text.lower() for word in ['forget', 'clear memory', 'reset conversation', 'start over']):
+            assistant.clear_history(session="voice")
+            return "Okay, I've cleared my memory. What would you like to talk about?"
+        return None
+    
+    awaiting_audio = set()  # Turns answered before their first sentence was played
+    
+    def show_latency(turn):
+        # Voice turns run on their own session, not the default one
+        prompt_tokens = assistant.session("voice").prompt_tokens
+        console.print(f"[dim]{_format_latency(turn.stream, turn.timings.get('first_audio'), prompt_tokens)}[/dim]")
+    
+    def on_event(event, payload):
+        """Show pipeline progress; called on the runtime loop."""
+        if event == "wake":
+            console.print("\n[bold green]✓ Wake word detected![/bold green]")
             console.print("[dim]🎤 Listening...[/dim]")
-            text, status = stt.listen(timeout=5, recalibrate=False)
-            
-            if status == 'success' and text:
-                silence_count = 0  # Reset silence counter
-                unclear_count = 0  # Reset unclear counter
-                console.print(f"[cyan]You:[/cyan] {text}")
-                
-                # Check for memory clear commands
-                if any(word in text.lower() for word in ['forget', 'clear memory', 'reset conversation', 'start over']):
-                    assistant.clear_history()
-                    response = "Okay, I've cleared my memory. What would you like to talk about?"
-                    console.print(f"[green]Kai:[/green] {response}")
-                    console.print("[dim]💭 Conversation history cleared[/dim]\n")
-                else:
-                    console.print("[dim]🔄 Processing...[/dim]")
-                    response = assistant.query(text)
-                    console.print(f"[green]Kai:[/green] {response}\n")
-                
-                # Clean response for speech (remove markdown formatting)
-                speech_response = _clean_for_speech(response)
-                
-                # Speak the response with keyboard interrupt
-                if tts:
-                    console.print("[dim]🔊 Speaking... (press SPACE to interrupt)[/dim]")
-                    
-                    # Start speaking in a thread
-                    import threading
-                    import select
-                    import sys
-                    import termios
-                    import tty
-                    
-                    speak_thread = threading.Thread(target=lambda: tts.speak(speech_response, wait=True))
-                    speak_thread.start()
-                    
-                    # Monitor for keyboard interrupt
-                    interrupted = False
-                    old_settings = termios.tcgetattr(sys.stdin)
-                    try:
-                        tty.setcbreak(sys.stdin.fileno())
-                        while speak_thread.is_alive():
-                            if select.select([sys.stdin], [], [], 0.1)[0]:
-                                key = sys.stdin.read(1)
-                                if key == ' ':  # Space bar
-                                    console.print("\n[yellow]⚠️  Interrupted![/yellow]")
-                                    tts.stop()
-                                    interrupted = True
-                                    break
-                    finally:
-                        termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
-                    
-                    speak_thread.join(timeout=1)
-                    
-                    if interrupted:
-                        console.print("[dim]💬 Continue speaking...[/dim]")
-                        time.sleep(0.3)
-                        continue  # Skip delay and listen immediately
-                
-                # Small delay before listening again
-                time.sleep(0.5)
-                console.print("[dim]💬 Still listening... (say something or wait to sleep)[/dim]")
-            elif status == 'unclear':
-                # Could hear something but couldn't understand
-                unclear_count += 1
-                if unclear_count < max_unclear:
-                    console.print("[yellow]🤔 Sorry, I didn't catch that.[/yellow]")
-                    if tts:
-                        tts.speak("Sorry, I didn't catch that", wait=True)
-                    # Wait longer to avoid picking up our own voice
-                    time.sleep(1.0)
-                else:
-                    console.print("[yellow]🤔 Having trouble understanding. Let me go to sleep.[/yellow]")
-                    if tts:
-                        tts.speak("Having trouble understanding", wait=True)
-                    time.sleep(0.5)
-            elif status == 'timeout':
-                # True silence - count it
-                silence_count += 1
-                if silence_count < max_silence:
-                    console.print(f"[dim]⏸️  Silence detected ({silence_count}/{max_silence})[/dim]")
-                    time.sleep(0.5)
+        elif event == "sleep":
+            console.print("[yellow]😴 Going to sleep...[/yellow]")
+            console.print("[dim]Listening for wake word...[/dim]")
+        elif event == "unclear":
+            console.print("[yellow]🤔 Sorry, I didn't catch that.[/yellow]")
+        elif event == "text":
+            console.print(f"[cyan]You:[/cyan] {payload.text}")
+        elif event == "reply":
+            console.print(f"[green]Kai:[/green] {payload.response}")
+            console.print("[dim]💭 Conversation history cleared[/dim]\n")
+        elif event == "intent":
+            console.print("[green]Kai:[/green] ", end="")
+        elif event == "delta":
+            console.print(payload, end="", markup=False, highlight=False)
+        elif event == "response":
+            console.print("\n")
+            timings = payload.timings
+            parts = [f"{stage} {timings[stage] - timings['wake']:.2f}s"
+                     for stage in ("stt", "nlu", "first_sentence") if stage in timings]
+            console.print(f"[dim]⏱️  after speech: {', '.join(parts)}[/dim]")
+            if player is not None and "first_audio" not in timings:
+                awaiting_audio.add(payload.id)
             else:
-                # Error - don't count as silence, just try again
-                time.sleep(0.5)
-        
-        # Exit conversation mode
-        console.print("[yellow]😴 Going to sleep...[/yellow]")
-        if tts:
-            tts.speak("Going to sleep", wait=True)
-        time.sleep(0.3)
-        console.print("[dim]Listening for wake word...[/dim]")
+                show_latency(payload)
+        elif event == "error":
+            console.print(f"\n[red]Error:[/red] {payload}\n")
+        elif event == "first_audio" and payload.id in awaiting_audio:
+            awaiting_audio.discard(payload.id)
+            show_latency(payload)
+        elif event == "interrupted":
+            awaiting_audio.clear()
+            console.print("\n[yellow]⚠️  Interrupted![/yellow]")
+    
+    pipeline = VoicePipeline(
+        assistant, microphone, transcribe,
+        synthesizer=player.synthesize if player else None, player=player,
+        detector=EnergyDetector(sensitivity=sensitivity),
+        prepare_speech=_clean_for_speech, shortcut=forget, on_event=on_event,
+    )
+    
+    for model, state in assistant.model_states().items():
+        console.print(f"[dim]🧠 {model}: {state}[/dim]")
     
-    # Start wake word detection
-    console.print("[cyan]Starting wake word detection...[/cyan]\n")
-    detector = WakeWordDetector(sensitivity=sensitivity)
+    # The pipeline runs on the assistant's runtime loop; this thread only watches the keyboard
+    console.print("[cyan]Starting wake word detection...[/cyan]")
+    console.print("[dim]Press SPACE to interrupt a response[/dim]\n")
+    running = assistant.runtime.submit(pipeline.run())
     
+    import select
+    import sys
+    import termios
+    import time
+    import tty
+    
+    interactive = sys.stdin.isatty()
+    old_settings = termios.tcgetattr(sys.stdin) if interactive else None
     try:
-        detector.start(on_wake_word)
-        
-        # Keep running
-        while True:
-            import time
-            time.sleep(0.1)
-            
+        if interactive:
+            tty.setcbreak(sys.stdin.fileno())
+        while not running.done():
+            if interactive and select.select([sys.stdin], [], [], 0.1)[0]:
+                if sys.stdin.read(1) == ' ':
+                    pipeline.interrupt()
+            elif not interactive:
+                time.sleep(0.1)
     except KeyboardInterrupt:
         console.print("\n[yellow]Stopping voice mode...[/yellow]")
-        detector.stop()
-        if tts:
-            tts.stop()
+    finally:
+        if interactive:
+            termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
+        running.cancel()
+        _print_pipeline_stats(pipeline.stats())
+        _print_session_stats(assistant.session_stats())
+        assistant.shutdown()
         console.print("[green]Goodbye![/green]")
 
 
@@ -300,6 +434,7 @@ def setup():
     console.print("[bold]Setting up Kai...[/bold]")
     
     # Initialize config
+    from kai.core.assistant import Assistant
     assistant = Assistant()
     
     console.print(f"[green]✓[/green] Configuration created at: {assistant.config.config_path}")
@@ -307,6 +442,30 @@ def setup():
     console.print("\nRun 'kai start' to begin")
 
 
+@main.command()
+@socket_option
+def daemon(socket_path):
+    """Run Kai in the background, serving 'kai query' and 'kai start' over a Unix socket.
+    
+    Keeps the assistant, plugins and LLM connections warm, and the
+    conversation history across clients. Runs in the foreground, so it can
+    be started as a systemd user service (Type=notify).
+    """
+    import logging
+    from kai.core.assistant import Assistant
+    from kai.core.daemon import KaiDaemon
+    
+    assistant = Assistant()
+    logging.basicConfig(level=assistant.config.get("core.log_level", "INFO"),
+                        format="%(levelname)s %(name)s: %(message)s")
+    
+    try:
+        asyncio.run(KaiDaemon(assistant, socket_path).serve_forever())
+    except RuntimeError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise SystemExit(1)
+
+
 @main.command()
 def settings():
     """Launch settings GUI."""
@@ -315,5 +474,100 @@ def settings():
     launch_gui()
 
 
+
+@main.command()
+@click.option('--since', '-s', default='24h', help='Time window: e.g. 30m, 24h, 7d, or all')
+@click.option('--by', 'breakdowns', multiple=True, type=click.Choice(['intent', 'model']),
+              help='Break down by intent or model (repeatable; default both)')
+@click.option('--path', 'trace_file', default=None, type=click.Path(dir_okay=False),
+              help='Trace file (default: tracing.path from the config)')
+def stats(since, breakdowns, trace_file):
+    """Show p50/p90/p99 latency per turn stage from recorded traces."""
+    from rich.table import Table
+    from kai.core.config import Config
+    from kai.core.latency import STAGES, latency_report, parse_window
+    from kai.core.tracing import trace_path
+    
+    try:
+        window = parse_window(since)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="'--since'")
+    
+    path = Path(trace_file) if trace_file else trace_path(Config())
+    if not path.exists():
+        console.print(f"[yellow]No traces at {path}[/yellow]")
+        console.print("Enable tracing with 'tracing.enabled: true' in config.yaml")
+        return
+    
+    report = latency_report(path, window)
+    if not report.turns and not report.summary("all"):
+        console.print(f"[yellow]No turns recorded in the last {since}[/yellow]")
+        return
+    console.print(f"[bold]Turn latency[/bold] ({report.turns} turns, {'all time' if window is None else 'last ' + since})")
+    
+    def seconds(value):
+        return "-" if value is None else f"{value:.2f}s"
+    
+    for by in ('all',) + (breakdowns or ('intent', 'model')):
+        groups = report.summary(by)
+        if not groups:
+            continue
+        table = Table(title=None if by == 'all' else f"By {by}", title_justify="left")
+        if by != 'all':
+            table.add_column(by.capitalize())
+        for column in ("Stage", "n", "p50", "p90", "p99", "max"):
+            table.add_column(column, justify="left" if column == "Stage" else "right")
+        for group, stages in groups.items():
+            for index, (stage, summary) in enumerate(stages.items()):
+                row = [STAGES[stage], str(summary["count"]), seconds(summary["p50"]),
+                       seconds(summary["p90"]), seconds(summary["p99"]), seconds(summary["max"])]
+                if by != 'all':
+                    row.insert(0, group if index == 0 else "")
+                table.add_row(*row)
+        console.print(table)
+
+
+@main.group()
+def cache():
+    """Inspect or clear the LLM response cache."""
+    pass
+
+
+@cache.command("stats")
+def cache_stats():
+    """Show LLM response cache statistics."""
+    from kai.ai.cache import ResponseCache
+    from kai.core.config import Config
+    
+    response_cache = ResponseCache.from_config(Config())
+    if response_cache is None:
+        console.print("[yellow]LLM response cache is disabled[/yellow]")
+        return
+    
+    stats = response_cache.stats()
+    hits = stats.get("total_memory_hits", 0) + stats.get("total_disk_hits", 0)
+    lookups = hits + stats.get("total_misses", 0)
+    
+    console.print("[bold]LLM response cache[/bold]")
+    console.print(f"Location: {response_cache.path or 'memory only'}")
+    console.print(f"Entries on disk: {stats.get('disk_entries', 0)}")
+    console.print(f"Hits: {hits} (memory {stats.get('total_memory_hits', 0)}, disk {stats.get('total_disk_hits', 0)})")
+    console.print(f"Misses: {stats.get('total_misses', 0)}")
+    console.print(f"Evictions: {stats.get('total_evictions', 0)}, expired: {stats.get('total_expired', 0)}")
+    if lookups:
+        console.print(f"Hit rate: {hits / lookups:.1%}")
+
+
+@cache.command("clear")
+def cache_clear():
+    """Remove all cached LLM responses."""
+    from kai.ai.cache import ResponseCache
+    from kai.core.config import Config
+    
+    response_cache = ResponseCache.from_config(Config())
+    if response_cache is not None:
+        response_cache.clear()
+    console.print("[green]✓[/green] LLM response cache cleared")
+
 if __name__ == "__main__":
     main()
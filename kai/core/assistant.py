@@ -1,11 +1,39 @@
 """Main assistant class."""
 
-import asyncio
-from typing import Optional
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import AsyncIterator, Optional, Union
+from kai.ai.cache import ResponseCache
+from kai.ai.clients import get_llm, registry
+from kai.ai.routing import router_for
+from kai.ai.scheduler import LLMScheduler
+from kai.ai.warmup import ModelWarmer
 from kai.core.config import Config
-from kai.core.intent import IntentRecognizer
+from kai.core.context import MESSAGE_OVERHEAD, ConversationContext
+from kai.core.intent import Intent, IntentRecognizer
+from kai.core.metrics import MetricsExporter
+from kai.core.runtime import Runtime
+from kai.core.session import Session, SessionManager
+from kai.core.speculation import SpeculativeResponse
+from kai.core.streaming import ResponseStream
+from kai.core.tracing import trace_path, tracer
 from kai.plugins.manager import PluginManager
 
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = """Update the running summary of a conversation between a user and Kai, a voice assistant.
+
+Current summary:
+{summary}
+
+New messages:
+{transcript}
+
+Write the updated summary in at most 80 words. Keep names, facts, preferences
+and open questions the user may refer back to. Respond with only the summary."""
+
 
 class Assistant:
     """Main Kai assistant class."""
@@ -17,65 +45,527 @@ class Assistant:
             config_path: Path to configuration file
         """
         self.config = Config(config_path)
+        registry.set_backend(self.config.get("models.backend", "ollama"), api_key=self.config.get("models.api_key"))
+        registry.set_cache(ResponseCache.from_config(self.config))
+        registry.set_keep_alive(self.config.get("models.keep_alive"))
+        registry.set_profiles(self.config.get("profiles", {}))
+        registry.set_hosts(
+            self.config.get("models.llm_hosts") or None,
+            check_interval=self.config.get("models.health_interval", 30)
+        )
+        registry.set_scheduler(
+            LLMScheduler.from_config(self.config, hosts=len(self.config.get("models.llm_hosts") or []))
+            if self.config.get("scheduler.enabled", True) else None
+        )
+        self.metrics_exporter = MetricsExporter.from_config(self.config)
+        # Metrics are read from traces, so they need spans even when no trace file is written
+        tracing = self.config.get("tracing.enabled", False)
+        tracer.configure(tracing or self.metrics_exporter is not None, trace_path(self.config) if tracing else None)
+        self.router = router_for(self.config)
         self.intent_recognizer = IntentRecognizer(self.config)
         self.plugin_manager = PluginManager(self.config)
-        self.conversation_history = []
-        self.max_history = 10  # Keep last 10 exchanges
+        self.sessions = SessionManager(
+            self._new_context,
+            idle_timeout=self.config.get("sessions.idle_timeout", 1800),
+            max_sessions=self.config.get("sessions.max_sessions", 64)
+        )
+        self.speculation = {"launched": 0, "hits": 0, "misses": 0, "wasted_tokens": 0}
+        self.runtime = Runtime()  # Event loop for synchronous callers, started on first use
+        self.warmer = ModelWarmer(
+            [get_llm(model) for model in self.resident_models()],
+            interval=self.config.get("models.keepalive_interval", 240)
+        )
         
-    async def initialize(self):
-        """Initialize async components."""
+    async def initialize(self, preload: Optional[bool] = None):
+        """Initialize async components.
+        
+        Args:
+            preload: Load models in the background, defaults to models.preload
+        """
         await self.plugin_manager.load_plugins()
+        self.intent_recognizer.register_plugins(self.plugin_manager.plugins.values())
+        await self.intent_recognizer.prepare()
+        
+        # Routing reads the answers; asking the server per request would block the loop
+        self._model_check = threading.Thread(target=self.router.check_installed, daemon=True,
+                                             name="kai-installed-models")
+        self._model_check.start()
+        
+        if preload is None:
+            preload = self.config.get("models.preload", True)
+        if preload:
+            self.warmer.preload()
+    
+    def resident_models(self) -> list:
+        """Get models that should be kept loaded.
+        
+        Returns:
+            List of model names
+        """
+        if self.config.get("models.resident_routes", True):
+            return self.router.models()
+        return [self.router.primary_for("answer")]
+    
+    def route_stats(self) -> dict:
+        """Get model call latency per task route.
+        
+        Returns:
+            Dict of task class to model, call count, mean/max/last seconds
+        """
+        return self.router.stats()
+    
+    def downgraded_routes(self) -> dict:
+        """Get routes currently served by their fallback model.
+        
+        Returns:
+            Dict of task class to fallback model name
+        """
+        from kai.ai import slo
+        return slo.guard.active()
+    
+    def host_stats(self) -> dict:
+        """Get health and load of each host in models.llm_hosts.
+        
+        Returns:
+            Dict of host URL to health, in-flight requests, latency average,
+            request, failure and failover counts; empty without a host pool
+        """
+        return registry.pool.stats() if registry.pool is not None else {}
+    
+    def coalesced_requests(self) -> dict:
+        """Get LLM requests answered by an identical request already in flight.
+        
+        Returns:
+            Dict of task class to number of coalesced requests
+        """
+        coalesced = {}
+        for model in self.router.models():
+            for task, count in get_llm(model).coalesced.items():
+                coalesced[task] = coalesced.get(task, 0) + count
+        return coalesced
+    
+    def queue_stats(self) -> dict:
+        """Get LLM request queueing per priority class.
+        
+        Returns:
+            Dict of "interactive" / "background" to request count, mean and
+            max queue wait seconds and preemptions; empty without a scheduler
+        """
+        return registry.scheduler.stats() if registry.scheduler is not None else {}
+    
+    def model_states(self) -> dict:
+        """Get the load state of each resident model.
+        
+        Returns:
+            Dict of model name to "unknown", "loading", "loaded" or "failed"
+        """
+        return self.warmer.states()
+    
+    def session(self, session_id: Optional[str] = None) -> Session:
+        """Get a conversation session, creating it on first use.
+        
+        Args:
+            session_id: Session id, defaults to the default session
+            
+        Returns:
+            Session
+        """
+        return self.sessions.get(session_id)
+    
+    @property
+    def prompt_tokens(self) -> int:
+        """Estimated history + query tokens of the default session's last turn."""
+        return self.session().prompt_tokens
+    
+    @property
+    def conversation_history(self) -> list:
+        """Conversation history of the default session that fits the context budget."""
+        return self.session().context.history()
+    
+    def start_keepalive(self):
+        """Keep resident models loaded until stop_keepalive is called."""
+        self.warmer.start()
+    
+    def stop_keepalive(self):
+        """Stop sending keep-alive hints."""
+        self.warmer.stop()
+    
+    def start_metrics(self):
+        """Start the metrics exporter, if metrics are enabled."""
+        if self.metrics_exporter is not None:
+            if self._collect_metrics not in self.metrics_exporter.collectors:
+                self.metrics_exporter.collectors.append(self._collect_metrics)
+            self.metrics_exporter.start()
+    
+    def stop_metrics(self):
+        """Stop the metrics exporter."""
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+    
+    def _collect_metrics(self) -> list:
+        """Metric families read from component statistics at scrape time."""
+        sessions = self.sessions.stats()
+        families = [
+            ("kai_sessions", "gauge", "Conversation sessions, by state.",
+             [({"state": "active"}, sessions["active"]), ({"state": "busy"}, sessions["busy"])]),
+            ("kai_sessions_evicted_total", "counter", "Sessions evicted as idle or least recently used.",
+             [({}, sessions["evicted"])]),
+        ]
+        
+        intents = self.intent_recognizer.stats
+        families.append(("kai_intent_fast_path_seconds_saved_total", "counter",
+                         "Estimated LLM classification time saved by the rule fast path.",
+                         [({}, intents["latency_saved"])]))
+        
+        if registry.cache is not None:
+            cache = registry.cache.stats()
+            families.append(("kai_llm_cache_lookups_total", "counter", "LLM response cache lookups, by result.",
+                             [({"result": result}, cache[key]) for result, key in
+                              (("memory_hit", "memory_hits"), ("disk_hit", "disk_hits"), ("miss", "misses"))]))
+            families.append(("kai_llm_cache_hit_ratio", "gauge", "Share of LLM cache lookups answered from the cache.",
+                             [({}, cache["hit_rate"])]))
+            families.append(("kai_llm_cache_entries", "gauge", "Cached LLM responses, by tier.",
+                             [({"tier": "memory"}, cache["memory_entries"])] +
+                             ([({"tier": "disk"}, cache["disk_entries"])] if "disk_entries" in cache else [])))
+        return families
+    
+    def speculation_stats(self) -> dict:
+        """Get speculative general-query statistics.
+        
+        Returns:
+            Dict with launch, hit and miss counts, hit rate and wasted tokens
+        """
+        stats = dict(self.speculation)
+        resolved = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / resolved if resolved else 0.0
+        return stats
+        
+    def session_stats(self) -> dict:
+        """Collect the statistics printed at the end of a session.
+        
+        Returns:
+            Dict of route, downgrade, coalescing, queue, host and speculation statistics
+        """
+        return {
+            "routes": self.route_stats(),
+            "downgraded": self.downgraded_routes(),
+            "coalesced": self.coalesced_requests(),
+            "queues": self.queue_stats(),
+            "hosts": self.host_stats(),
+            "speculation": self.speculation_stats(),
+            "sessions": self.sessions.stats(),
+        }
+        
+    def start(self):
+        """Initialize async components on the runtime loop, for synchronous callers."""
+        self.runtime.run(self.initialize())
         
-    def query(self, text: str) -> str:
+    def query(self, text: str, session: Optional[str] = None) -> str:
         """Process a text query.
         
         Args:
             text: User query text
+            session: Session id, defaults to the default session
             
         Returns:
             Response text
         """
-        return asyncio.run(self.async_query(text))
+        return self.runtime.run(self.async_query(text, session=session))
+        
+    def submit(self, text: str, session: Optional[str] = None) -> concurrent.futures.Future:
+        """Start processing a text query from any thread without waiting.
+        
+        Args:
+            text: User query text
+            session: Session id, defaults to the default session
+            
+        Returns:
+            Future resolving to the response text; cancel it to cancel the turn
+        """
+        return self.runtime.submit(self.async_query(text, session=session))
+        
+    def stream_query(self, text: str, session: Optional[str] = None) -> ResponseStream:
+        """Process a text query, streaming the response.
+        
+        Args:
+            text: User query text
+            session: Session id, defaults to the default session
+            
+        Returns:
+            Response stream that can be iterated synchronously
+        """
+        stream = self.runtime.run(self.async_query(text, stream=True, session=session))
+        stream.bind_loop(self.runtime.loop)
+        return stream
+        
+    def shutdown(self, timeout: float = 10.0) -> bool:
+        """Finish in-flight queries, then stop keep-alives, metrics and the runtime loop.
+        
+        Args:
+            timeout: Seconds to wait for in-flight queries before cancelling them
+            
+        Returns:
+            True if every in-flight query finished
+        """
+        self.stop_keepalive()
+        self.stop_metrics()
+        return self.runtime.shutdown(timeout, cleanup=registry.aclose)
         
-    async def async_query(self, text: str) -> str:
+    async def async_query(self, text: str, stream: bool = False,
+                          session: Optional[str] = None) -> Union[str, ResponseStream]:
         """Process a text query asynchronously.
         
+        Queries for different sessions run concurrently; queries for the same
+        session run one at a time, in order. A streamed turn keeps its session
+        busy until the stream is consumed or closed.
+        
         Args:
             text: User query text
+            stream: Return a ResponseStream of text deltas instead of a string
+            session: Session id, defaults to the default session
             
         Returns:
-            Response text
+            Response text, or a ResponseStream if stream is set
+        """
+        started_at = time.monotonic()
+        current = self.sessions.get(session)
+        with tracer.span("turn", session=current.id, stream=stream) as turn:
+            await current.lock.acquire()
+            try:
+                result = await self._turn(current, text, stream, started_at)
+            except BaseException:
+                current.lock.release()
+                raise
+            
+            if stream:
+                # The stream releases the session and ends the turn once it ends
+                return ResponseStream(tracer.follow(turn, self._session_chunks(current, text, result)),
+                                      started_at=started_at)
+            current.lock.release()
+            return result
+    
+    async def recognize(self, text: str, session: Optional[str] = None) -> Intent:
+        """Recognize the intent of a query, the NLU step of a turn.
+        
+        For pipelines that run understanding and answering as separate
+        stages; async_query does both.
+        
+        Args:
+            text: User query text
+            session: Session id, defaults to the default session
+            
+        Returns:
+            Recognized intent
+        """
+        history = self.sessions.get(session).context.history()
+        return await self.intent_recognizer.recognize(text, history)
+    
+    async def respond(self, text: str, intent: Intent, session: Optional[str] = None) -> ResponseStream:
+        """Stream the plugin response to a recognized intent, the answer step of a turn.
+        
+        Waits for earlier turns of the session, like async_query, and records
+        the exchange once the stream is consumed.
+        
+        Args:
+            text: User query text
+            intent: Intent returned by recognize()
+            session: Session id, defaults to the default session
+            
+        Returns:
+            Response stream; the session stays busy until it is consumed or closed
+        """
+        started_at = time.monotonic()
+        current = self.sessions.get(session)
+        await current.lock.acquire()
+        try:
+            history, history_tokens = current.context.snapshot()
+            current.prompt_tokens = history_tokens + current.context.count_tokens(text) + MESSAGE_OVERHEAD
+            chunks = await self.plugin_manager.execute_intent(intent, history, stream=True)
+        except BaseException:
+            current.lock.release()
+            raise
+        return ResponseStream(self._session_chunks(current, text, chunks), started_at=started_at)
+    
+    async def _turn(self, session: Session, text: str, stream: bool,
+                    started_at: float) -> Union[str, AsyncIterator[str]]:
+        """Answer one query while holding the session lock.
+        
+        Args:
+            session: Session of the turn
+            text: User query text
+            stream: Return the response chunks instead of a string
+            started_at: Monotonic timestamp of the start of the turn
+            
+        Returns:
+            Response text (recorded in the history), or response chunks
         """
+        history, history_tokens = session.context.snapshot()
+        session.prompt_tokens = history_tokens + session.context.count_tokens(text) + MESSAGE_OVERHEAD
+        
+        # Start answering as a general query while the intent is classified
+        speculative = self._speculate(text, history)
+        
         # Recognize intent
-        intent = await self.intent_recognizer.recognize(text)
+        try:
+            intent = await self.intent_recognizer.recognize(text, history)
+        except BaseException:
+            if speculative:
+                speculative.cancel()
+            raise
+        tracer.annotate(intent=intent.name)
+        
+        if speculative and self._adopt_speculation(speculative, intent):
+            if stream:
+                return speculative.chunks()
+            response = "".join([delta async for delta in speculative.chunks()])
+            self._record_exchange(session, text, response)
+            return response
+        
+        if stream:
+            return await self.plugin_manager.execute_intent(intent, history, stream=True)
         
         # Execute via plugin with conversation history
-        response = await self.plugin_manager.execute_intent(intent, self.conversation_history)
-        
-        # Add to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": text
-        })
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response
-        })
-        
-        # Trim history if too long
-        if len(self.conversation_history) > self.max_history * 2:
-            self.conversation_history = self.conversation_history[-self.max_history * 2:]
+        response = await self.plugin_manager.execute_intent(intent, history)
+        self._record_exchange(session, text, response)
         
         return response
     
-    def clear_history(self):
-        """Clear conversation history."""
-        self.conversation_history = []
+    async def _session_chunks(self, session: Session, text: str, chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+        """Pass a streamed response through, then record it and free the session.
+        
+        Args:
+            session: Session of the turn, locked by the caller
+            text: User query text
+            chunks: Response chunks
+            
+        Yields:
+            Response chunks
+        """
+        parts = []
+        try:
+            async for chunk in chunks:
+                parts.append(chunk)
+                yield chunk
+            # Recorded before the lock is released, so the next turn sees it
+            self._record_exchange(session, text, "".join(parts))
+        finally:
+            session.lock.release()
+    
+    def _speculate(self, text: str, history: list) -> Optional[SpeculativeResponse]:
+        """Start a general-query answer before the intent is known.
+        
+        Enabled by intents.speculative. Skipped in joint mode, where the
+        classifier already produces the answer.
+        
+        Args:
+            text: User query text
+            history: Conversation history for the turn
+            
+        Returns:
+            Speculative response, or None if speculation is off
+        """
+        if not self.config.get("intents.speculative", False) or self.config.get("intents.joint", False):
+            return None
+        
+        guess = Intent(name="general_query", confidence=0.0, entities={}, raw_text=text)
+        if not any(plugin.can_handle(guess) for plugin in self.plugin_manager.plugins.values()):
+            return None
+        
+        self.speculation["launched"] += 1
+        return SpeculativeResponse(
+            self.plugin_manager.execute_intent(guess, history, stream=True)
+        )
+    
+    def _adopt_speculation(self, speculative: SpeculativeResponse, intent: Intent) -> bool:
+        """Keep or cancel a speculative answer once the intent is known.
+        
+        Args:
+            speculative: Speculative general-query response
+            intent: Recognized intent
+            
+        Returns:
+            True if the speculative response answers the turn
+        """
+        if intent.name == "general_query":
+            self.speculation["hits"] += 1
+            return True
+        
+        wasted = speculative.cancel()
+        self.speculation["misses"] += 1
+        self.speculation["wasted_tokens"] += wasted
+        stats = self.speculation_stats()
+        logger.info(
+            "Speculation miss (%s): %d tokens wasted, hit rate %.0f%%, %d tokens wasted in total",
+            intent.name, wasted, stats["hit_rate"] * 100, stats["wasted_tokens"]
+        )
+        return False
+    
+    def _record_exchange(self, session: Session, text: str, response: str):
+        """Add a query/response pair to a session's conversation history.
+        
+        Args:
+            session: Session of the turn
+            text: User query text
+            response: Response text
+        """
+        session.context.add_exchange(text, response)
+        session.turns += 1
+        session.touch()
+    
+    def _new_context(self) -> ConversationContext:
+        """Create the conversation context of a new session.
+        
+        Returns:
+            Empty conversation context
+        """
+        return ConversationContext(
+            budget=self._context_budget(),
+            summarizer=self._summarize if self.config.get("context.summarize", True) else None
+        )
+    
+    def _context_budget(self) -> int:
+        """Get the history token budget for the configured model.
+        
+        Returns:
+            Budget in tokens
+        """
+        budgets = self.config.get("context.budget", {})
+        return budgets.get(self.router.primary_for("answer"), budgets.get("default", 1024))
+    
+    def _summarize(self, summary: str, messages: list) -> str:
+        """Fold old messages into the rolling summary (runs on a worker thread).
+        
+        Args:
+            summary: Current summary, possibly empty
+            messages: Messages to fold in
+            
+        Returns:
+            Updated summary
+        """
+        transcript = "\n".join(f"{message['role']}: {message['content']}" for message in messages)
+        prompt = SUMMARY_PROMPT.format(summary=summary or "(none yet)", transcript=transcript)
+        
+        # A failed call raises, so an error message never ends up as the summary
+        return self.router.engine("summarize").generate(prompt, system_prompt="", task="summarize",
+                                                        raise_errors=True)
+    
+    def clear_history(self, session: Optional[str] = None):
+        """Clear conversation history.
+        
+        Args:
+            session: Session id, defaults to the default session
+        """
+        current = self.sessions.get(session, create=False)
+        if current is not None:
+            current.context.clear()
     
-    def get_history(self):
+    def get_history(self, session: Optional[str] = None):
         """Get conversation history.
         
+        Args:
+            session: Session id, defaults to the default session
+            
         Returns:
             List of conversation messages
         """
-        return self.conversation_history.copy()
+        return self.sessions.get(session).context.history()
@@ -1,5 +1,6 @@
 """Configuration management."""
 
+import copy
 import os
 import yaml
 from pathlib import Path
@@ -23,12 +24,89 @@ class Config:
         "models": {
             "stt": "whisper-base",
             "llm": "llama3.2:3b",
+            "routes": {  # Model per task class; unlisted tasks use models.llm
+                "classify": "llama3.2:1b",
+                "extract": "llama3.2:1b",
+                "safety": "llama3.2:1b",
+            },
+            "resident_routes": True,  # Keep every routed model loaded, not just models.llm
             "tts": "piper-en_US-lessac-medium",
+            "embedding": "nomic-embed-text",
+            "preload": True,  # Load the LLM in the background at startup
+            "keep_alive": "30m",  # How long Ollama keeps the model loaded
+            "keepalive_interval": 240,  # Seconds between keep-alive hints in voice mode
+            "backend": "ollama",  # "ollama" or "openai" (llama.cpp server, vLLM, LocalAI)
+            "api_key": None,  # Bearer token for OpenAI-compatible servers that need one
+            "llm_hosts": [],  # Server URLs to spread requests over; empty uses the backend default
+            "health_interval": 30,  # Seconds between health checks of llm_hosts
+        },
+        "intents": {
+            "fast_path": True,  # Answer unambiguous commands without the LLM
+            "fast_path_threshold": 0.9,
+            "classifier": "llm",  # "llm" or "embedding" (nearest exemplar)
+            "embedding_threshold": 0.6,  # Below this similarity, ask the LLM
+            "joint": False,  # One JSON completion for intent, entities and answer
+            "speculative": False,  # Start the general-query answer while classifying
+        },
+        "slo": {  # Downgrade a route to a fallback model while it is too slow
+            "enabled": True,
+            "ttft": 2.0,  # Rolling mean seconds to first token
+            "tokens_per_second": 5.0,  # Rolling mean generation speed
+            "min_samples": 3,
+            "recovery_seconds": 300,  # Time on the fallback before retrying the primary
+            "fallbacks": {"answer": "llama3.2:1b"},  # Only used if the server has the model
+        },
+        "scheduler": {
+            "enabled": True,  # Queue LLM requests so background work never delays a turn
+            "concurrency": 2,  # Requests in flight per server (per host with models.llm_hosts)
+            "background_tasks": ["summarize"],  # Preempted whenever an interactive request arrives
+        },
+        "profiles": {  # Generation settings per LLM task; unset keys use Ollama defaults
+            # num_ctx is left unset: a model loaded with a different context
+            # size is reloaded, so tasks sharing a model must agree on it
+            "classify": {"num_predict": 8, "temperature": 0.0, "stop": ["\n"], "format": "enum"},
+            "extract": {"num_predict": 12, "temperature": 0.0, "stop": ["\n"]},
+            "safety": {"num_predict": 6, "temperature": 0.0, "stop": ["\n"], "format": "enum"},
+            "joint": {"num_predict": 256, "temperature": 0.2},
+            "summarize": {"num_predict": 160, "temperature": 0.2},
+            "answer": {"num_predict": 256, "temperature": 0.7},
+        },
+        "context": {
+            "budget": {"default": 1024},  # History tokens per prompt, per model
+            "summarize": True,  # Fold old turns into a rolling summary (models.routes.summarize)
+        },
+        "sessions": {  # Separate conversations (GUI, voice, daemon clients) served concurrently
+            "idle_timeout": 1800,  # Seconds before an unused session is forgotten, 0 keeps them
+            "max_sessions": 64,  # Least recently used idle sessions are evicted beyond this
+        },
+        "tracing": {  # Per-turn latency spans, one JSON line per turn
+            "enabled": False,
+            "path": None,  # Defaults to traces.jsonl next to config.yaml
+        },
+        "metrics": {  # Prometheus text format, see kai.core.metrics
+            "enabled": False,
+            "host": "127.0.0.1",
+            "port": 9464,  # Serves /metrics; null to only write the textfile
+            "textfile": None,  # File for node_exporter's textfile collector, e.g. /var/lib/node_exporter/kai.prom
+            "interval": 15,  # Seconds between textfile writes
         },
         "plugins": {
             "enabled": ["system_control", "general_query", "command_executor"],
             "disabled": [],
         },
+        "cache": {
+            "enabled": True,
+            "persistent": True,
+            "path": None,  # Defaults to llm_cache.db next to config.yaml
+            "memory_entries": 256,
+            "disk_entries": 5000,
+            "ttl": {  # Seconds per call site, 0 disables caching
+                "default": 0,
+                "classify": 86400,
+                "extract": 604800,
+                "safety": 86400,
+            },
+        },
     }
     
     def __init__(self, config_path: Optional[str] = None):
@@ -48,15 +126,15 @@ class Config:
         if self.config_path.exists():
             with open(self.config_path, "r") as f:
                 user_config = yaml.safe_load(f) or {}
-            # Merge with defaults
-            config = self.DEFAULT_CONFIG.copy()
+            # Merge with defaults (deep copy so user values never leak into DEFAULT_CONFIG)
+            config = copy.deepcopy(self.DEFAULT_CONFIG)
             self._deep_merge(config, user_config)
             return config
         else:
             # Create default config
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
             self.save(self.DEFAULT_CONFIG)
-            return self.DEFAULT_CONFIG.copy()
+            return copy.deepcopy(self.DEFAULT_CONFIG)
     
     def _deep_merge(self, base: Dict, update: Dict):
         """Recursively merge update into base."""
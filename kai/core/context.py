@@ -0,0 +1,219 @@
+"""Conversation context management.
+
+Keeps the history sent with each prompt within a token budget. Token counts
+are estimated once per message and cached alongside it. When the history
+outgrows the budget, the oldest turns are folded into a rolling summary on a
+background thread, so compaction never delays a reply; until the summary is
+ready those turns are simply left out of the prompt.
+
+The prompt window only grows by appending until it hits the budget, then
+jumps forward to half the budget. Between jumps every prompt starts with the
+previous prompt, so Ollama can reuse its KV cache for the system prompt and
+earlier turns and only prefills the new messages. A sliding window that
+drops one turn per turn would change the prefix, and force a full re-prefill,
+on every request.
+"""
+
+import logging
+import threading
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Role header and end-of-turn markers the chat template adds per message
+MESSAGE_OVERHEAD = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text.
+
+    Llama-family BPE tokenizers average about four characters per token on
+    English text, which is close enough for budgeting.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+    return (len(text) + 3) // 4
+
+
+class ConversationContext:
+    """Token-budgeted conversation history with a rolling summary."""
+
+    def __init__(self, budget: int = 1024,
+                 summarizer: Optional[Callable[[str, List[dict]], str]] = None,
+                 count_tokens: Callable[[str], int] = estimate_tokens, min_recent: int = 2):
+        """Initialize conversation context.
+
+        Args:
+            budget: Maximum tokens of history (including the summary) per prompt
+            summarizer: Called as ``summarizer(summary, messages)`` on a worker
+                thread to fold messages into the summary; without one, old
+                messages are dropped
+            count_tokens: Token counter for message content
+            min_recent: Messages always kept verbatim, even over budget
+        """
+        self.budget = budget
+        self.summarizer = summarizer
+        self.count_tokens = count_tokens
+        self.min_recent = min_recent
+        self.summary = ""
+        self.stats = {"compactions": 0, "summarized_messages": 0, "dropped_messages": 0, "failures": 0}
+        self._summary_tokens = 0
+        self._messages: List[Tuple[dict, int]] = []
+        self._start = 0  # Index of the first message in the prompt window
+        self._generation = 0  # Bumped by clear() so stale summaries are discarded
+        self._lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+
+    def add(self, role: str, content: str):
+        """Append a message.
+
+        Args:
+            role: Message role ("user" or "assistant")
+            content: Message text
+        """
+        message = {"role": role, "content": content}
+        with self._lock:
+            self._messages.append((message, self._message_tokens(content)))
+            self._slide()
+            self._compact()
+
+    def add_exchange(self, text: str, response: str):
+        """Append a user query and the assistant's response.
+
+        Args:
+            text: User query text
+            response: Response text
+        """
+        self.add("user", text)
+        self.add("assistant", response)
+
+    def history(self) -> List[dict]:
+        """Get the messages to send with the next prompt.
+
+        Returns:
+            Summary (as a system message, if any) followed by the
+            messages in the prompt window
+        """
+        return self.snapshot()[0]
+
+    def tokens(self) -> int:
+        """Get the token count of the current prompt history.
+
+        Returns:
+            Estimated tokens of history()
+        """
+        return self.snapshot()[1]
+
+    def messages(self) -> List[dict]:
+        """Get every message not yet folded into the summary or dropped.
+
+        Returns:
+            List of message dicts
+        """
+        with self._lock:
+            return [dict(message) for message, _ in self._messages]
+
+    def clear(self):
+        """Forget all messages and the summary."""
+        with self._lock:
+            self._messages = []
+            self._start = 0
+            self.summary = ""
+            self._summary_tokens = 0
+            self._generation += 1
+
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for a running compaction to finish.
+
+        Args:
+            timeout: Seconds to wait at most
+        """
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join(timeout)
+
+    def snapshot(self) -> Tuple[List[dict], int]:
+        """Get the prompt history and its token count atomically.
+
+        Returns:
+            Tuple of (history() messages, their estimated tokens)
+        """
+        with self._lock:
+            window = self._messages[self._start:]
+            selected = [dict(message) for message, _ in window]
+            if self.summary:
+                selected.insert(0, self._summary_message())
+            return selected, self._summary_tokens + sum(tokens for _, tokens in window)
+
+    def _summary_message(self) -> dict:
+        return {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+
+    def _message_tokens(self, content: str) -> int:
+        return self.count_tokens(content) + MESSAGE_OVERHEAD
+
+    def _slide(self):
+        """Move the prompt window forward once over budget (caller holds the lock)."""
+        window = self._messages[self._start:]
+        if self._summary_tokens + sum(tokens for _, tokens in window) <= self.budget:
+            return
+
+        # Keep the newest messages that fit in half the budget, so the
+        # window (and the prompt prefix) only changes every few turns
+        keep, kept_tokens = 0, self._summary_tokens
+        for _, tokens in reversed(window):
+            if keep >= self.min_recent and kept_tokens + tokens > self.budget // 2:
+                break
+            keep += 1
+            kept_tokens += tokens
+        self._start = len(self._messages) - keep
+
+    def _compact(self):
+        """Fold or drop messages that left the window (caller holds the lock)."""
+        batch = [message for message, _ in self._messages[:self._start]]
+        if not batch:
+            return
+
+        if self.summarizer is None:
+            del self._messages[:len(batch)]
+            self._start -= len(batch)
+            self.stats["dropped_messages"] += len(batch)
+            return
+
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+
+        self._compactor = threading.Thread(
+            target=self._summarize,
+            args=(self.summary, batch, self._generation),
+            daemon=True,
+            name="kai-context-compaction"
+        )
+        self._compactor.start()
+
+    def _summarize(self, summary: str, batch: List[dict], generation: int):
+        """Fold a batch of old messages into the summary (worker thread)."""
+        try:
+            new_summary = self.summarizer(summary, batch).strip()
+        except Exception as e:
+            with self._lock:
+                self.stats["failures"] += 1
+            logger.warning("History compaction failed: %s", e)
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            # Messages are only ever appended, so the batch is still at the front
+            del self._messages[:len(batch)]
+            self._start -= len(batch)
+            self.summary = new_summary
+            self._summary_tokens = self._message_tokens(self._summary_message()["content"])
+            self.stats["compactions"] += 1
+            self.stats["summarized_messages"] += len(batch)
+            logger.info(
+                "Compacted %d messages into a %d-token summary", len(batch), self._summary_tokens
+            )
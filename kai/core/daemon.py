@@ -0,0 +1,383 @@
+"""Long-running Kai daemon and its thin command-line client.
+
+Without a daemon, ``kai query`` and ``kai start`` build an Assistant, read the
+configuration, load plugins and connect to the LLM on every invocation, and
+the conversation is lost when the process exits. ``kai daemon`` does that
+work once and serves queries over a Unix domain socket. The CLI connects,
+prints the streamed response and exits. When no daemon is listening, the CLI
+runs the query in-process instead.
+
+The protocol is newline-delimited JSON. A client sends one request per line,
+for example ``{"op": "query", "text": "...", "session": "..."}``; requests
+without a session share the default conversation. The daemon answers a query
+with ``{"delta": "..."}`` lines as tokens arrive, then a final
+``{"done": true, ...}`` line. It reports failures as ``{"error": "..."}``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+SOCKET_NAME = "kai.sock"
+STREAM_LIMIT = 1024 * 1024  # Longest request line the daemon accepts
+SESSION_SWEEP_INTERVAL = 60.0  # Most seconds between idle-session sweeps
+
+
+class DaemonError(RuntimeError):
+    """The daemon could not complete a request."""
+
+
+def default_socket_path() -> str:
+    """Get the daemon socket path.
+
+    Returns:
+        $KAI_SOCKET, else kai.sock in $XDG_RUNTIME_DIR, else in ~/.config/kai
+    """
+    if os.environ.get("KAI_SOCKET"):
+        return os.environ["KAI_SOCKET"]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.expanduser(f"~/.config/kai/{SOCKET_NAME}")
+
+
+def _notify_systemd(state: str):
+    """Send a state change to systemd when running as a Type=notify service."""
+    address = os.environ.get("NOTIFY_SOCKET")
+    if not address:
+        return
+    if address.startswith("@"):
+        address = "\0" + address[1:]
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as notify:
+            notify.sendto(state.encode(), address)
+    except OSError as e:
+        logger.debug("Could not notify systemd: %s", e)
+
+
+class KaiDaemon:
+    """Serve one warm Assistant to CLI clients over a Unix domain socket."""
+
+    def __init__(self, assistant, path: Optional[str] = None):
+        """Initialize daemon.
+
+        Args:
+            assistant: Assistant to serve; initialized by start()
+            path: Socket path, defaults to default_socket_path()
+        """
+        self.assistant = assistant
+        self.path = path or default_socket_path()
+        self.stats = {"connections": 0, "queries": 0, "errors": 0}
+        self._server = None
+        self._stopped = None
+        self._sweeper = None
+        self._writers = set()
+
+    async def start(self):
+        """Load plugins, warm models and start listening.
+
+        Raises:
+            RuntimeError: If another daemon is already listening on the socket
+        """
+        if DaemonClient.is_running(self.path):
+            raise RuntimeError(f"A Kai daemon is already listening on {self.path}")
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a daemon that did not shut down cleanly
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        await self.assistant.initialize()
+        self.assistant.start_keepalive()
+        self.assistant.start_metrics()
+
+        self._stopped = asyncio.Event()
+        if self.assistant.sessions.idle_timeout > 0:
+            self._sweeper = asyncio.create_task(self._sweep_sessions())
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=STREAM_LIMIT)
+        os.chmod(self.path, 0o600)
+        logger.info("Kai daemon listening on %s", self.path)
+        _notify_systemd("READY=1")
+
+    async def serve_forever(self):
+        """Start, then serve until stop() is called or SIGTERM/SIGINT arrives."""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                pass  # Not on the main thread
+        try:
+            await self._stopped.wait()
+        finally:
+            await self.close()
+
+    def stop(self):
+        """Ask serve_forever() to shut down."""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def close(self):
+        """Stop listening, disconnect clients, release the Assistant and remove the socket."""
+        from kai.ai.clients import registry
+
+        _notify_systemd("STOPPING=1")
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            self._sweeper = None
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        await registry.aclose()  # Async clients bound to this loop
+        await asyncio.to_thread(self.assistant.shutdown)
+        registry.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _sweep_sessions(self):
+        """Evict idle sessions on a timer, not only when a new session is created."""
+        sessions = self.assistant.sessions
+        interval = min(SESSION_SWEEP_INTERVAL, sessions.idle_timeout / 2)
+        while True:
+            await asyncio.sleep(interval)
+            evicted = sessions.evict_idle()
+            if evicted:
+                logger.info("Evicted %d idle sessions", evicted)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests from one client connection until it disconnects."""
+        self.stats["connections"] += 1
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await self._send(writer, {"error": "Invalid request"})
+                    continue
+                await self._dispatch(request, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _dispatch(self, request: dict, writer: asyncio.StreamWriter):
+        """Answer a single request."""
+        op = request.get("op")
+        if op == "query":
+            await self._query(request.get("text", ""), request.get("session"), writer)
+        elif op == "stats":
+            await self._send(writer, {"stats": self.assistant.session_stats()})
+        elif op == "clear_history":
+            self.assistant.clear_history(request.get("session"))
+            await self._send(writer, {"done": True})
+        elif op == "ping":
+            await self._send(writer, {"done": True, "pid": os.getpid()})
+        else:
+            await self._send(writer, {"error": f"Unknown request: {op}"})
+
+    async def _query(self, text: str, session: Optional[str], writer: asyncio.StreamWriter):
+        """Stream the response to a query back to the client."""
+        self.stats["queries"] += 1
+        try:
+            stream = await self.assistant.async_query(text, stream=True, session=session)
+            try:
+                async for delta in stream:
+                    if delta:
+                        await self._send(writer, {"delta": delta})
+            finally:
+                # Stop generating and free the session if the client went away or anything failed
+                await stream.aclose()
+        except ConnectionError:
+            raise
+        except Exception as e:
+            logger.exception("Query failed")
+            self.stats["errors"] += 1
+            await self._send(writer, {"error": str(e)})
+            return
+
+        await self._send(writer, {
+            "done": True,
+            "prompt_tokens": self.assistant.session(session).prompt_tokens,
+            "time_to_first_token": stream.time_to_first_token,
+        })
+
+    async def _send(self, writer: asyncio.StreamWriter, message: dict):
+        """Write one protocol line."""
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+
+
+class RemoteStream:
+    """Response streamed from the daemon.
+
+    Mirrors the parts of ResponseStream the CLI uses: iterate it for text
+    deltas, then read ``text``, ``time_to_first_token`` and ``prompt_tokens``.
+    """
+
+    def __init__(self, messages: Iterator[dict]):
+        """Initialize remote stream.
+
+        Args:
+            messages: Protocol messages answering the query
+        """
+        self._messages = messages
+        self._parts = []
+        self.started_at = time.monotonic()
+        self.first_token_at = None
+        self.finished_at = None
+        self.prompt_tokens = None
+
+    def __iter__(self) -> Iterator[str]:
+        for message in self._messages:
+            if "error" in message:
+                raise DaemonError(message["error"])
+            if message.get("done"):
+                self.finished_at = time.monotonic()
+                self.prompt_tokens = message.get("prompt_tokens")
+                return
+            delta = message.get("delta", "")
+            if delta and self.first_token_at is None:
+                self.first_token_at = time.monotonic()
+            self._parts.append(delta)
+            yield delta
+        raise ConnectionError("Kai daemon closed the connection")
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from sending the query to the first non-empty delta."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+
+class DaemonClient:
+    """Blocking client for a running Kai daemon."""
+
+    def __init__(self, sock: socket.socket, path: str):
+        """Initialize client.
+
+        Args:
+            sock: Connected Unix socket
+            path: Socket path, for messages
+        """
+        self.path = path
+        self._socket = sock
+        self._file = sock.makefile("rwb")
+
+    @classmethod
+    def connect(cls, path: Optional[str] = None, timeout: float = 1.0) -> Optional["DaemonClient"]:
+        """Connect to the daemon if one is listening.
+
+        Args:
+            path: Socket path, defaults to default_socket_path()
+            timeout: Seconds to wait for the connection
+
+        Returns:
+            Connected client, or None when no daemon is running
+        """
+        path = path or default_socket_path()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(path)
+        except OSError:
+            sock.close()
+            return None
+        sock.settimeout(None)
+        return cls(sock, path)
+
+    @classmethod
+    def is_running(cls, path: Optional[str] = None) -> bool:
+        """Check whether a daemon is listening on a socket.
+
+        Args:
+            path: Socket path, defaults to default_socket_path()
+
+        Returns:
+            True if a daemon accepted a connection
+        """
+        client = cls.connect(path)
+        if client is None:
+            return False
+        client.close()
+        return True
+
+    def query(self, text: str, session: Optional[str] = None) -> RemoteStream:
+        """Send a query.
+
+        Args:
+            text: User query text
+            session: Session id, defaults to the shared default session
+
+        Returns:
+            Stream of response deltas; consume it before the next request
+        """
+        self._send({"op": "query", "text": text, "session": session})
+        return RemoteStream(self._messages())
+
+    def stats(self) -> dict:
+        """Get the daemon's session statistics.
+
+        Returns:
+            Same dict as Assistant.session_stats()
+        """
+        return self._call("stats")["stats"]
+
+    def clear_history(self, session: Optional[str] = None):
+        """Clear the daemon's conversation history.
+
+        Args:
+            session: Session id, defaults to the shared default session
+        """
+        self._call("clear_history", session=session)
+
+    def close(self):
+        """Close the connection."""
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _call(self, op: str, **fields) -> dict:
+        """Send a request that is answered with a single message."""
+        self._send({"op": op, **fields})
+        message = next(self._messages(), None)
+        if message is None:
+            raise ConnectionError("Kai daemon closed the connection")
+        if "error" in message:
+            raise DaemonError(message["error"])
+        return message
+
+    def _send(self, message: dict):
+        """Write one protocol line."""
+        self._file.write(json.dumps(message).encode() + b"\n")
+        self._file.flush()
+
+    def _messages(self) -> Iterator[dict]:
+        """Read protocol lines until the connection closes."""
+        for line in self._file:
+            yield json.loads(line)
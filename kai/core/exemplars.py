@@ -0,0 +1,135 @@
+"""Embedding-based intent classification.
+
+Each intent is described by a handful of exemplar utterances. Their
+embeddings are stored as a normalized NumPy matrix on disk, so classifying
+an utterance costs one embedding call and a matrix-vector product instead
+of a full chat completion. The index is rebuilt incrementally: only
+exemplars whose text is not yet in the stored matrix are embedded.
+"""
+
+import logging
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ExemplarIndex:
+    """Nearest-neighbour index over intent exemplar embeddings.
+
+    The embedder is any object with a ``model`` attribute and an async
+    ``aembed(texts) -> list of vectors`` method, such as LLMEngine.
+    """
+
+    def __init__(self, embedder, path: Optional[str] = None):
+        """Initialize exemplar index.
+
+        Args:
+            embedder: Object providing ``model`` and ``aembed``
+            path: .npz file the index is persisted to, or None for memory only
+        """
+        self.embedder = embedder
+        self.path = Path(path).expanduser() if path else None
+        self.intents: List[str] = []
+        self.texts: List[str] = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self._loaded = False
+
+    @property
+    def ready(self) -> bool:
+        """Whether the index has any exemplars."""
+        return len(self.texts) > 0
+
+    async def build(self, exemplars: Dict[str, List[str]]) -> int:
+        """Bring the index in line with the given exemplars.
+
+        Args:
+            exemplars: Intent name to exemplar utterances
+
+        Returns:
+            Number of exemplars that had to be embedded
+        """
+        if not self._loaded:
+            self._load()
+
+        # Embeddings only depend on the text, so reuse any known vector
+        known = {text: self.vectors[row] for row, text in enumerate(self.texts)}
+
+        intents, texts = [], []
+        for intent, utterances in exemplars.items():
+            for text in utterances:
+                text = " ".join(text.lower().split())
+                if text and text not in texts:
+                    intents.append(intent)
+                    texts.append(text)
+
+        missing = [text for text in texts if text not in known]
+        if missing:
+            vectors = await self.embedder.aembed(missing)
+            known.update(zip(missing, (self._normalize(np.asarray(v, dtype=np.float32)) for v in vectors)))
+
+        changed = bool(missing) or texts != self.texts or intents != self.intents
+        self.intents = intents
+        self.texts = texts
+        self.vectors = np.stack([known[text] for text in texts]) if texts else np.zeros((0, 0), dtype=np.float32)
+
+        if changed:
+            logger.info("Intent index rebuilt: %d exemplars, %d newly embedded", len(texts), len(missing))
+            self._save()
+        return len(missing)
+
+    async def classify(self, text: str) -> Optional[Tuple[str, float]]:
+        """Find the intent whose exemplars are most similar to the text.
+
+        Args:
+            text: User input text
+
+        Returns:
+            Tuple of (intent name, cosine similarity), or None if the index is empty
+        """
+        if not self.ready:
+            return None
+
+        query = self._normalize(np.asarray((await self.embedder.aembed([text.lower()]))[0], dtype=np.float32))
+        scores = self.vectors @ query
+
+        best = int(np.argmax(scores))
+        return self.intents[best], float(scores[best])
+
+    def _load(self):
+        """Load a previously saved index built with the same embedding model."""
+        self._loaded = True
+        if self.path is None or not self.path.exists():
+            return
+
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model"]) != self.embedder.model:
+                    return
+                self.intents = [str(intent) for intent in data["intents"]]
+                self.texts = [str(text) for text in data["texts"]]
+                self.vectors = data["vectors"].astype(np.float32)
+        except Exception as e:
+            logger.warning("Ignoring unreadable intent index %s: %s", self.path, e)
+
+    def _save(self):
+        """Persist the index."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "wb") as f:
+            np.savez(
+                f,
+                model=np.array(self.embedder.model),
+                intents=np.array(self.intents, dtype=str),
+                texts=np.array(self.texts, dtype=str),
+                vectors=self.vectors
+            )
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        """Scale a vector to unit length."""
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
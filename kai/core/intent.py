@@ -1,8 +1,46 @@
 """Intent recognition."""
 
+import json
+import logging
+import time
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
+from kai.ai.routing import router_for
 from kai.core.config import Config
+from kai.core.rules import RuleMatcher
+from kai.core.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# Intents the classifiers may return
+VALID_INTENTS = ["install_package", "execute_command", "launch_app", "close_app", "general_query"]
+
+# Output schema for joint intent + entities + answer completions
+JOINT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "intent": {"type": "string", "enum": VALID_INTENTS},
+        "app": {"type": ["string", "null"]},
+        "package": {"type": ["string", "null"]},
+        "command": {"type": ["string", "null"]},
+        "answer": {"type": ["string", "null"]},
+    },
+    "required": ["intent", "app", "package", "command", "answer"],
+}
+
+JOINT_SYSTEM_PROMPT = """You are Kai, a friendly voice assistant for Linux users.
+
+For every user message, reply with a JSON object with these fields:
+- "intent": one of
+{intent_descriptions}
+- "app": the application name for launch_app or close_app, otherwise null
+- "package": the apt package name for install_package (python -> python3, node -> nodejs, docker -> docker.io), otherwise null
+- "command": the exact shell command for execute_command, otherwise null
+- "answer": for general_query only, the spoken reply, otherwise null
+
+Rules for "answer": 2-3 short conversational sentences, no markdown, no lists,
+no code formatting. Someone is LISTENING to you speak. Use the previous
+conversation for context."""
 
 
 @dataclass
@@ -25,27 +63,247 @@ class IntentRecognizer:
             config: Configuration object
         """
         self.config = config
+        self.router = router_for(config)
+        self.rules = RuleMatcher(self._keywords())
+        self.fast_path_threshold = config.get("intents.fast_path_threshold", 0.9)
+        self.classifier = config.get("intents.classifier", "llm")
+        self.embedding_threshold = config.get("intents.embedding_threshold", 0.6)
+        self.exemplars: Dict[str, List[str]] = {}
+        self.index = None
+        self._llm_latency = None  # Moving average of LLM classification time
+        self.stats = {"turns": 0, "fast_path": 0, "llm": 0, "joint": 0, "latency_saved": 0.0}
+    
+    def register_plugins(self, plugins: Iterable):
+        """Register grammar patterns and exemplars declared by plugins.
         
-    async def recognize(self, text: str) -> Intent:
-        """Recognize intent from text using LLM.
+        Args:
+            plugins: Loaded plugin instances
+        """
+        for plugin in plugins:
+            for intent, patterns in getattr(plugin, "patterns", {}).items():
+                self.rules.add_patterns(intent, patterns)
+            for intent, exemplars in getattr(plugin, "exemplars", {}).items():
+                self.exemplars.setdefault(intent, []).extend(exemplars)
+    
+    async def prepare(self):
+        """Build the exemplar index when the embedding classifier is selected.
+        
+        Only exemplars not already in the on-disk index are embedded.
+        """
+        if self.classifier != "embedding":
+            return
+        
+        from kai.ai.clients import get_llm
+        from kai.core.exemplars import ExemplarIndex
+        
+        exemplars = {intent: list(texts) for intent, texts in self.exemplars.items()}
+        for intent, texts in self.config.get("intents.exemplars", {}).items():
+            exemplars.setdefault(intent, []).extend(texts)
+        
+        if self.index is None:
+            embedder = get_llm(self.config.get("models.embedding", "nomic-embed-text"))
+            self.index = ExemplarIndex(embedder, self.config.config_path.parent / "intent_index.npz")
+        
+        try:
+            await self.index.build(exemplars)
+        except Exception as e:
+            logger.warning("Embedding classifier unavailable, using LLM: %s", e)
+        
+    async def recognize(self, text: str, conversation_history: Optional[list] = None) -> Intent:
+        """Recognize intent from text.
+        
+        Unambiguous commands are answered by the rule layer; everything
+        else is classified by the LLM. In joint mode (intents.joint) the
+        single LLM call also extracts entities and, for general queries,
+        the answer itself (as the "answer" entity).
         
         Args:
             text: User input text
+            conversation_history: Previous messages, used by joint mode
             
         Returns:
             Recognized intent
         """
-        # Use LLM to classify intent
-        from kai.ai.llm import LLMEngine
+        self.stats["turns"] += 1
+        
+        with tracer.span("intent.recognize") as span:
+            intent = await self._recognize(text, conversation_history)
+            span.set(intent=intent.name, confidence=intent.confidence)
+        return intent
+    
+    async def _recognize(self, text: str, conversation_history: Optional[list]) -> Intent:
+        """Try each recognition layer in turn, cheapest first.
+        
+        Args:
+            text: User input text
+            conversation_history: Previous messages, used by joint mode
+            
+        Returns:
+            Recognized intent
+        """
+        if self.config.get("intents.fast_path", True):
+            intent = self._recognize_with_rules(text)
+            if intent:
+                tracer.annotate(method="rules")
+                return intent
+        
+        if self.config.get("intents.joint", False):
+            intent = await self._recognize_joint(text, conversation_history or [])
+            if intent:
+                tracer.annotate(method="joint")
+                return intent
+        
+        if self.index is not None and self.index.ready:
+            intent = await self._recognize_with_embeddings(text)
+            if intent:
+                tracer.annotate(method="embedding")
+                return intent
+        
+        start = time.monotonic()
+        intent = await self._recognize_with_llm(text)
+        tracer.annotate(method="llm")
+        if intent.confidence > 0.7:  # Not the exception fallback
+            elapsed = time.monotonic() - start
+            self._llm_latency = elapsed if self._llm_latency is None else 0.8 * self._llm_latency + 0.2 * elapsed
+            self.stats["llm"] += 1
+        return intent
+    
+    def fast_path_stats(self) -> Dict[str, float]:
+        """Get fast-path usage statistics.
+        
+        Returns:
+            Dict with turn counts, fraction served by rules and seconds saved
+        """
+        stats = dict(self.stats)
+        stats["fast_path_fraction"] = stats["fast_path"] / stats["turns"] if stats["turns"] else 0.0
+        return stats
+    
+    def _recognize_with_rules(self, text: str) -> Optional[Intent]:
+        """Recognize intent with the deterministic rule layer.
+        
+        Args:
+            text: User input text
+            
+        Returns:
+            Intent if the rules are confident enough, otherwise None
+        """
+        match = self.rules.match(text)
+        if match is None or match.confidence < self.fast_path_threshold:
+            return None
+        
+        entities = dict(match.entities)
+        if match.name in ["launch_app", "close_app"] and "app" not in entities:
+            entities["app"] = self._extract_app_name(text)
+        
+        # Each fast-path turn skips one classification round-trip
+        self.stats["fast_path"] += 1
+        self.stats["latency_saved"] += self._llm_latency or 0.0
+        logger.info(
+            "Fast path: %s (%.2f), %d/%d turns served by rules, ~%.2fs saved",
+            match.name, match.confidence, self.stats["fast_path"], self.stats["turns"],
+            self.stats["latency_saved"]
+        )
+        
+        return Intent(
+            name=match.name,
+            confidence=match.confidence,
+            entities=entities,
+            raw_text=text
+        )
+    
+    async def _recognize_with_embeddings(self, text: str) -> Optional[Intent]:
+        """Recognize intent by nearest exemplar embedding.
+        
+        Args:
+            text: User input text
+            
+        Returns:
+            Intent if the best exemplar is similar enough, otherwise None
+        """
+        try:
+            result = await self.index.classify(text)
+        except Exception as e:
+            logger.warning("Embedding classification failed: %s", e)
+            return None
+        
+        if result is None or result[1] < self.embedding_threshold:
+            return None
         
-        # Get model from config
-        model = self.config.get("models.llm", "llama3.2:3b")
+        intent_name, score = result
+        entities = {}
+        if intent_name in ["launch_app", "close_app"]:
+            entities["app"] = self._extract_app_name(text)
+        
+        return Intent(
+            name=intent_name,
+            confidence=score,
+            entities=entities,
+            raw_text=text
+        )
+    
+    async def _recognize_joint(self, text: str, conversation_history: list) -> Optional[Intent]:
+        """Recognize intent, entities and answer with one structured completion.
+        
+        Args:
+            text: User input text
+            conversation_history: Previous conversation messages
+            
+        Returns:
+            Intent with pre-extracted entities, or None if the reply was unusable
+        """
+        llm = self.router.engine("joint")
         
+        intent_descriptions = "\n".join(
+            f"  {intent} - {self._get_intent_description(intent)}" for intent in VALID_INTENTS
+        )
+        messages = [{"role": "system", "content": JOINT_SYSTEM_PROMPT.format(intent_descriptions=intent_descriptions)}]
+        messages.extend(conversation_history)
+        messages.append({"role": "user", "content": text})
+        
+        reply = await llm.achat(messages, task="joint", format=JOINT_SCHEMA)
+        try:
+            data = json.loads(reply)
+        except ValueError:
+            logger.warning("Joint completion was not JSON: %r", reply[:200])
+            return None
+        
+        intent_name = str(data.get("intent", "")).strip().lower()
+        if intent_name not in VALID_INTENTS:
+            return None
+        
+        entities = {
+            key: data[key].strip()
+            for key in ("app", "package", "command", "answer")
+            if isinstance(data.get(key), str) and data[key].strip()
+        }
+        if intent_name != "general_query":
+            entities.pop("answer", None)
+        elif "answer" not in entities:
+            return None
+        
+        self.stats["joint"] += 1
+        return Intent(
+            name=intent_name,
+            confidence=0.9,
+            entities=entities,
+            raw_text=text
+        )
+    
+    async def _recognize_with_llm(self, text: str) -> Intent:
+        """Recognize intent from text using LLM.
+        
+        Args:
+            text: User input text
+            
+        Returns:
+            Recognized intent
+        """
         # Get available intents dynamically
-        valid_intents = ["install_package", "execute_command", "launch_app", "close_app", "general_query"]
+        valid_intents = VALID_INTENTS
         
         try:
-            llm = LLMEngine(model=model)
+            # Use the model routed for classification
+            llm = self.router.engine("classify")
             
             # Build intent descriptions dynamically
             intent_descriptions = "\n".join([
@@ -61,10 +319,12 @@ User request: "{text}"
 
 Respond with ONLY the intent name (one word), nothing else."""
 
-            intent_name = llm.generate(
+            intent_name = (await llm.agenerate(
                 intent_prompt, 
-                system_prompt="You are an intent classifier. Respond with only the intent name."
-            ).strip().lower()
+                system_prompt="You are an intent classifier. Respond with only the intent name.",
+                task="classify",
+                choices=valid_intents
+            )).strip().lower()
             
             if intent_name not in valid_intents:
                 intent_name = self._fallback_intent(text)
@@ -113,22 +373,24 @@ Respond with ONLY the intent name (one word), nothing else."""
         """
         text_lower = text.lower()
         
-        # Get keywords from config or use defaults
-        install_keywords = self.config.get("intents.install_keywords", ["install", "download", "get"])
-        execute_keywords = self.config.get("intents.execute_keywords", ["run command", "execute", "run this"])
-        launch_keywords = self.config.get("intents.launch_keywords", ["open", "launch"])
-        close_keywords = self.config.get("intents.close_keywords", ["close", "quit", "kill"])
-        
-        if any(keyword in text_lower for keyword in install_keywords):
-            return "install_package"
-        elif any(keyword in text_lower for keyword in execute_keywords):
-            return "execute_command"
-        elif any(keyword in text_lower for keyword in launch_keywords):
-            return "launch_app"
-        elif any(keyword in text_lower for keyword in close_keywords):
-            return "close_app"
-        else:
-            return "general_query"
+        # Checked in priority order
+        for intent, keywords in self._keywords().items():
+            if any(keyword in text_lower for keyword in keywords):
+                return intent
+        return "general_query"
+    
+    def _keywords(self) -> Dict[str, List[str]]:
+        """Get trigger keywords per intent from config or defaults.
+        
+        Returns:
+            Dict of intent name to keywords, in priority order
+        """
+        return {
+            "install_package": self.config.get("intents.install_keywords", ["install", "download", "get"]),
+            "execute_command": self.config.get("intents.execute_keywords", ["run command", "execute", "run this"]),
+            "launch_app": self.config.get("intents.launch_keywords", ["open", "launch"]),
+            "close_app": self.config.get("intents.close_keywords", ["close", "quit", "kill"]),
+        }
     
     def _fallback_intent_obj(self, text: str) -> Intent:
         """Create Intent object using fallback.
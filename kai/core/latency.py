@@ -0,0 +1,328 @@
+"""Latency percentiles from recorded traces.
+
+Reads the JSONL file written by kai.core.tracing and summarizes each stage
+of a turn: wake to listen, STT, intent classification, time to first token
+of the answer, time to first audio and total. Results are reported overall,
+by intent and by model. Percentiles are estimated online with the P²
+algorithm (Jain & Chlamtac, 1985), which keeps five markers per quantile
+instead of every sample. Memory stays constant however long the log grows.
+Traces are appended in time order, so the start of a time window is found by
+binary search over file offsets instead of parsing the whole file.
+"""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Stage name to description, in turn order
+STAGES = {
+    "wake": "wake to listen",
+    "stt": "speech to text",
+    "classify": "intent classification",
+    "ttft": "generation first token",
+    "first_audio": "time to first audio",
+    "total": "total turn",
+}
+QUANTILES = (0.5, 0.9, 0.99)
+STT_SPANS = ("stt", "stt.listen", "stt.recognize")  # Pipeline stage, then the recognizer itself
+CLASSIFY_TASKS = {"classify", "extract", "safety", "summarize"}  # LLM calls that are not the answer
+# Traces are stamped when they start but written when they end, so a long
+# turn can follow shorter ones that started later. Seek this much earlier.
+SEEK_SLACK = 600.0
+
+_WINDOW = re.compile(r"^(\d+(?:\.\d+)?)\s*([smhdw])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+class P2Quantile:
+    """Streaming estimate of one quantile in constant memory (the P² algorithm)."""
+
+    __slots__ = ("q", "count", "heights", "positions", "desired", "increments")
+
+    def __init__(self, q: float):
+        """Initialize estimator.
+
+        Args:
+            q: Quantile to estimate, between 0 and 1
+        """
+        self.q = q
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1, 1 + 2 * q, 1 + 4 * q, 3 + 2 * q, 5]
+        self.increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def add(self, x: float):
+        """Add an observation.
+
+        Args:
+            x: Observed value
+        """
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(x)
+            heights.sort()
+            return
+
+        positions = self.positions
+        if x < heights[0]:
+            heights[0] = x
+            cell = 0
+        elif x >= heights[4]:
+            heights[4] = x
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= x < heights[i + 1])
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers toward their desired positions
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        h, n = self.heights, self.positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current estimate; exact while there are five observations or fewer."""
+        if not self.count:
+            return None
+        if self.count <= 5:
+            # Nearest rank over the few samples seen
+            return self.heights[min(len(self.heights) - 1, int(self.q * len(self.heights)))]
+        return self.heights[2]
+
+
+class StageSummary:
+    """Count, mean, max and percentiles of one stage."""
+
+    __slots__ = ("count", "total", "max", "quantiles")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.quantiles = [P2Quantile(q) for q in QUANTILES]
+
+    def add(self, seconds: float):
+        """Add one observation in seconds."""
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for quantile in self.quantiles:
+            quantile.add(seconds)
+
+    def to_dict(self) -> dict:
+        """Get the summary.
+
+        Returns:
+            Dict with count, mean, max and p50/p90/p99 seconds
+        """
+        summary = {"count": self.count, "mean": self.total / self.count if self.count else None, "max": self.max}
+        for quantile in self.quantiles:
+            summary[f"p{round(quantile.q * 100)}"] = quantile.value
+        return summary
+
+
+class LatencyReport:
+    """Per-stage percentiles overall, by intent and by model."""
+
+    def __init__(self):
+        self.turns = 0
+        self.first_timestamp: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+        self._groups: Dict[Tuple[str, str], Dict[str, StageSummary]] = {}
+
+    def add(self, record: dict):
+        """Add one trace record.
+
+        Args:
+            record: Decoded line of the trace file
+        """
+        stages, intent, model = turn_stages(record)
+        if not stages:
+            return
+        if record.get("name") == "turn":
+            self.turns += 1
+        timestamp = record.get("timestamp")
+        if timestamp is not None:
+            self.first_timestamp = timestamp if self.first_timestamp is None else min(self.first_timestamp, timestamp)
+            self.last_timestamp = timestamp if self.last_timestamp is None else max(self.last_timestamp, timestamp)
+
+        keys = [("all", "all")]
+        if intent:
+            keys.append(("intent", intent))
+        if model:
+            keys.append(("model", model))
+        for key in keys:
+            group = self._groups.setdefault(key, {})
+            for stage, seconds in stages.items():
+                group.setdefault(stage, StageSummary()).add(seconds)
+
+    def summary(self, by: str = "all") -> Dict[str, Dict[str, dict]]:
+        """Get stage summaries for one breakdown.
+
+        Args:
+            by: "all", "intent" or "model"
+
+        Returns:
+            Group name to stage name (in turn order) to summary dict
+        """
+        result = {}
+        for (dimension, name), group in sorted(self._groups.items()):
+            if dimension == by:
+                result[name] = {stage: group[stage].to_dict() for stage in STAGES if stage in group}
+        return result
+
+
+def turn_stages(record: dict) -> Tuple[Dict[str, float], Optional[str], Optional[str]]:
+    """Get stage latencies of one trace record.
+
+    Args:
+        record: Decoded line of the trace file
+
+    Returns:
+        Tuple of (stage name to seconds, intent, model of the answer)
+    """
+    name = record.get("name")
+    if name == "wake":
+        return {"wake": record["duration"]}, None, None
+    if name in STT_SPANS:
+        # SpeechRecognizer.listen outside a turn is traced on its own
+        return {"stt": record["duration"]}, None, None
+    if name != "turn":
+        return {}, None, None
+
+    stages = {"total": record["duration"]}
+    attributes = record.get("attributes", {})
+    spans = record.get("spans", [])
+    if attributes.get("first_audio") is not None:
+        stages["first_audio"] = attributes["first_audio"]
+
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], span)
+    for span_name in STT_SPANS:
+        if by_name.get(span_name, {}).get("duration") is not None:
+            stages["stt"] = by_name[span_name]["duration"]
+            break
+    if by_name.get("intent.recognize", {}).get("duration") is not None:
+        stages["classify"] = by_name["intent.recognize"]["duration"]
+
+    model = None
+    for span in spans:
+        span_attributes = span.get("attributes", {})
+        if span["name"] == "llm" and span_attributes.get("task") not in CLASSIFY_TASKS:
+            model = span_attributes.get("model")
+            if span_attributes.get("ttft") is not None:
+                stages["ttft"] = span_attributes["ttft"]
+            break
+    return stages, attributes.get("intent"), model
+
+
+def parse_window(window: str) -> Optional[float]:
+    """Parse a time window such as "30m", "24h" or "7d".
+
+    Args:
+        window: Number with unit s, m, h, d or w, or "all"
+
+    Returns:
+        Window in seconds, None for "all"
+
+    Raises:
+        ValueError: If the window can't be parsed
+    """
+    window = window.strip().lower()
+    if window == "all":
+        return None
+    match = _WINDOW.match(window)
+    if not match:
+        raise ValueError(f"Invalid time window '{window}', use e.g. 30m, 24h, 7d or all")
+    return float(match.group(1)) * _UNITS[match.group(2)]
+
+
+def read_traces(path: Path, since: Optional[float] = None) -> Iterator[dict]:
+    """Read trace records, optionally only those from a point in time on.
+
+    Args:
+        path: Trace file
+        since: Wall-clock timestamp; earlier records are skipped without being parsed
+
+    Yields:
+        Decoded records; malformed lines are skipped
+    """
+    with open(path, "rb") as f:
+        if since is not None:
+            f.seek(_offset_of(f, since - SEEK_SLACK))
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if since is not None and record.get("timestamp", 0) < since:
+                continue
+            yield record
+
+
+def latency_report(path: Path, window: Optional[float] = None, now: Optional[float] = None) -> LatencyReport:
+    """Summarize the traces of a time window.
+
+    Args:
+        path: Trace file
+        window: Seconds back from now, None for everything
+        now: Current wall-clock time, defaults to time.time()
+
+    Returns:
+        Report over the matching records
+    """
+    since = None if window is None else (now if now is not None else time.time()) - window
+    report = LatencyReport()
+    for record in read_traces(path, since):
+        report.add(record)
+    return report
+
+
+def _offset_of(f, since: float) -> int:
+    """Binary search for a line start at or before the first line stamped since or later.
+
+    Assumes lines are in timestamp order; see SEEK_SLACK for why that holds
+    only roughly.
+    """
+    low, high = 0, os.fstat(f.fileno()).st_size
+    while low < high:
+        middle = (low + high) // 2
+        f.seek(middle)
+        if middle:
+            f.readline()  # Skip to the start of the next line
+        timestamp = _timestamp(f.readline())
+        if timestamp is not None and timestamp < since:
+            low = f.tell()  # That line and all before it are too old
+        else:
+            high = middle
+    return low
+
+
+def _timestamp(line: bytes) -> Optional[float]:
+    try:
+        return json.loads(line).get("timestamp")
+    except ValueError:
+        return None
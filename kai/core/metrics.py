@@ -0,0 +1,419 @@
+"""Prometheus-style metrics.
+
+Counters and histograms in the text exposition format, served on a local
+HTTP port or written to a file for node_exporter's textfile collector.
+
+Most metrics come from the spans recorded by kai.core.tracing. observe_trace
+turns each finished trace into turn, intent, plugin, LLM, TTS and wake
+observations, so the Assistant, PluginManager, LLMEngine and audio classes
+are not instrumented a second time. Audio overflows have no span and are
+counted directly. Statistics the components already keep, such as the
+response cache and sessions, are read by collectors when the metrics are
+scraped.
+
+The exporter is off by default (metrics.enabled).
+"""
+
+import logging
+import math
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0)
+SPEED_BUCKETS = (1, 2, 5, 10, 20, 40, 80, 160)  # Tokens per second
+
+# A collector returns (name, type, help, [(labels, value), ...]) families
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monotonically increasing count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        """Initialize counter.
+
+        Args:
+            name: Metric name, ending in _total
+            help: Description
+            labels: Label names
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        """Add to the count.
+
+        Args:
+            amount: Non-negative increment
+            **labels: Label values
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        """Get the count for a label set."""
+        return self._values.get(tuple(str(labels.get(name, "")) for name in self.labels), 0.0)
+
+    def samples(self) -> List[str]:
+        """Render sample lines."""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(dict(zip(self.labels, key)))} {_format_value(value)}"
+                for key, value in items]
+
+
+class Histogram:
+    """Distribution of observations in cumulative buckets per label set."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                 labels: Sequence[str] = ()):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            help: Description
+            buckets: Upper bounds, ascending; +Inf is added
+            labels: Label names
+        """
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets) + (math.inf,)
+        self._values: Dict[tuple, list] = {}  # Label values to [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        """Record an observation.
+
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = [counts, total + value, count + 1]
+
+    def count(self, **labels) -> int:
+        """Get the number of observations for a label set."""
+        entry = self._values.get(tuple(str(labels.get(name, "")) for name in self.labels))
+        return entry[2] if entry else 0
+
+    def samples(self) -> List[str]:
+        """Render bucket, sum and count lines."""
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            labels = dict(zip(self.labels, key))
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, counts):
+                cumulative += bucket
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        """Get or create a counter.
+
+        Args:
+            name: Metric name
+            help: Description
+            labels: Label names
+
+        Returns:
+            Counter registered under name
+        """
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, buckets: Sequence[float] = LATENCY_BUCKETS,
+                  labels: Sequence[str] = ()) -> Histogram:
+        """Get or create a histogram.
+
+        Args:
+            name: Metric name
+            help: Description
+            buckets: Upper bounds
+            labels: Label names
+
+        Returns:
+            Histogram registered under name
+        """
+        return self._register(Histogram(name, help, buckets, labels))
+
+    def render(self, collectors: Iterable[Callable[[], Iterable[Family]]] = ()) -> str:
+        """Render all metrics, plus families produced by collectors.
+
+        Args:
+            collectors: Callables returning metric families at scrape time
+
+        Returns:
+            Text exposition format
+        """
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+                continue
+            for name, kind, help, samples in families:
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+metrics = MetricsRegistry()
+
+turns = metrics.counter("kai_turns_total", "Turns answered.", ["intent", "source"])
+turn_seconds = metrics.histogram("kai_turn_duration_seconds", "Turn duration from query (or end of speech) to "
+                                 "the end of the answer.", labels=["intent"])
+first_audio_seconds = metrics.histogram("kai_time_to_first_audio_seconds",
+                                        "Seconds from the end of speech to the first audio of the answer.")
+intents = metrics.counter("kai_intents_total", "Recognized intents, by the layer that recognized them.",
+                          ["intent", "method"])
+plugin_seconds = metrics.histogram("kai_plugin_duration_seconds", "Plugin execution time, including streaming.",
+                                   labels=["plugin"])
+llm_requests = metrics.counter("kai_llm_requests_total", "LLM calls, including those answered from the cache.",
+                               ["model", "task", "cached"])
+llm_tokens = metrics.counter("kai_llm_output_tokens_total", "Tokens generated by the LLM.", ["model"])
+llm_speed = metrics.histogram("kai_llm_tokens_per_second", "LLM generation speed.", SPEED_BUCKETS, ["model"])
+llm_ttft = metrics.histogram("kai_llm_time_to_first_token_seconds", "LLM time to first token, queueing included.",
+                             labels=["model", "task"])
+tts_seconds = metrics.histogram("kai_tts_synthesis_seconds", "Text-to-speech synthesis time per sentence.")
+wake_triggers = metrics.counter("kai_wake_triggers_total", "Wake word triggers.")
+audio_overflows = metrics.counter("kai_audio_overflows_total",
+                                  "Microphone audio lost because it was not read in time.", ["source"])
+
+
+def observe_trace(record: dict):
+    """Update the metrics from a finished trace.
+
+    Registered as a tracer listener by MetricsExporter.
+
+    Args:
+        record: Trace as written to the trace file
+    """
+    attributes = record.get("attributes", {})
+    if record.get("name") == "turn":
+        intent = attributes.get("intent", "unknown")
+        turns.inc(intent=intent, source=attributes.get("source", "text"))
+        turn_seconds.observe(record["duration"], intent=intent)
+        if attributes.get("first_audio") is not None:
+            first_audio_seconds.observe(attributes["first_audio"])
+
+    for span in record.get("spans", []):
+        name = span["name"]
+        span_attributes = span.get("attributes", {})
+        if name == "wake":
+            wake_triggers.inc()
+        elif name == "intent.recognize" and "intent" in span_attributes:
+            intents.inc(intent=span_attributes["intent"], method=span_attributes.get("method", "unknown"))
+        elif name == "plugin.execute" and span["duration"] is not None:
+            plugin_seconds.observe(span["duration"], plugin=span_attributes.get("plugin") or "none")
+        elif name == "tts.synthesize" and span["duration"] is not None:
+            tts_seconds.observe(span["duration"])
+        elif name == "llm":
+            model, task = span_attributes.get("model", ""), span_attributes.get("task", "")
+            cached = bool(span_attributes.get("cached"))
+            llm_requests.inc(model=model, task=task, cached=str(cached).lower())
+            if cached:
+                continue
+            llm_tokens.inc(span_attributes.get("output_tokens") or 0, model=model)
+            if span_attributes.get("tokens_per_second"):
+                llm_speed.observe(span_attributes["tokens_per_second"], model=model)
+            if span_attributes.get("ttft") is not None:
+                llm_ttft.observe(span_attributes["ttft"], model=model, task=task)
+
+
+class MetricsExporter:
+    """Serves the metrics over HTTP and/or writes them to a textfile."""
+
+    def __init__(self, port: Optional[int] = 9464, host: str = "127.0.0.1", textfile: Optional[str] = None,
+                 interval: float = 15.0, registry: MetricsRegistry = metrics):
+        """Initialize exporter.
+
+        Args:
+            port: HTTP port for /metrics, None for no server, 0 for any free port
+            host: Interface to listen on; keep local unless scraped remotely
+            textfile: File rewritten every interval for node_exporter's textfile collector
+            interval: Seconds between textfile writes
+            registry: Metrics to export
+        """
+        self.port = port
+        self.host = host
+        self.textfile = Path(textfile).expanduser() if textfile else None
+        self.interval = interval
+        self.registry = registry
+        self.collectors: List[Callable[[], Iterable[Family]]] = []
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._writer: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_config(cls, config) -> Optional["MetricsExporter"]:
+        """Create an exporter from the ``metrics.*`` configuration.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Metrics exporter, or None if metrics are disabled
+        """
+        if not config.get("metrics.enabled", False):
+            return None
+        return cls(
+            port=config.get("metrics.port", 9464),
+            host=config.get("metrics.host", "127.0.0.1"),
+            textfile=config.get("metrics.textfile"),
+            interval=config.get("metrics.interval", 15)
+        )
+
+    @property
+    def address(self) -> Optional[str]:
+        """URL of the metrics endpoint while serving."""
+        if self._server is None:
+            return None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def render(self) -> str:
+        """Render the current metrics."""
+        return self.registry.render(self.collectors)
+
+    def start(self):
+        """Start serving and writing; failures are logged, not raised."""
+        from kai.core.tracing import tracer
+        tracer.subscribe(observe_trace)
+
+        self._stop.clear()
+        if self.port is not None and self._server is None:
+            try:
+                self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+                self._server.daemon_threads = True
+                threading.Thread(target=self._server.serve_forever, name="kai-metrics", daemon=True).start()
+                logger.info("Serving metrics on %s", self.address)
+            except OSError as e:
+                self._server = None
+                logger.warning("Metrics server could not listen on %s:%s: %s", self.host, self.port, e)
+        if self.textfile is not None and self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="kai-metrics-textfile", daemon=True)
+            self._writer.start()
+
+    def stop(self):
+        """Stop serving and write the textfile one last time."""
+        self._stop.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._writer is not None:
+            self._writer.join(timeout=5)
+            self._writer = None
+
+    def write_textfile(self):
+        """Write the metrics atomically, so the collector never reads a partial file."""
+        self.textfile.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp = tempfile.mkstemp(dir=self.textfile.parent, prefix=".kai-metrics-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.chmod(temp, 0o644)
+            os.replace(temp, self.textfile)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    def _write_loop(self):
+        while True:
+            try:
+                self.write_textfile()
+            except OSError as e:
+                logger.warning("Could not write metrics to %s: %s", self.textfile, e)
+            if self._stop.wait(self.interval):
+                break
+        try:
+            self.write_textfile()
+        except OSError:
+            pass
+
+    def _handler(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
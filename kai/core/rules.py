@@ -0,0 +1,153 @@
+"""Rule-based intent matching.
+
+A deterministic layer in front of the LLM classifier. Whole-utterance
+grammar patterns (built from the ``intents.*_keywords`` config and from
+patterns declared by plugins) identify unambiguous commands like "open
+firefox" or "install htop" without a model round-trip. Anything that is not
+clearly one intent gets a low confidence and is left to the LLM.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class RuleMatch:
+    """Result of matching an utterance against the rules."""
+
+    name: str
+    confidence: float
+    entities: Dict[str, Any] = field(default_factory=dict)
+
+
+# Entity captured by the generated grammar for each keyword intent
+KEYWORD_ENTITIES = {
+    "install_package": r"(?P<package>[\w.+-]+)",
+    "launch_app": r"(?P<app>[\w.+-]+)",
+    "close_app": r"(?P<app>[\w.+-]+)",
+    # Commands are case and punctuation sensitive, so the plugin takes them
+    # from the raw utterance instead of this normalized capture
+    "execute_command": r".+",
+}
+
+# Openers that make an utterance a question rather than a command
+QUESTION_WORDS = {
+    "what", "what's", "whats", "who", "why", "when", "where", "how", "which",
+    "is", "are", "do", "does", "can", "could", "should", "would", "explain",
+}
+QUESTION_PHRASES = ("tell me",)
+
+# Stripped before matching so "please open firefox." matches "open firefox"
+POLITE_PREFIX = re.compile(r"^(?:(?:hey\s+)?kai[,\s]+)?(?:please\s+)?")
+TRAILING_PUNCTUATION = re.compile(r"[\s.!?]+$")
+
+
+class RuleMatcher:
+    """Matches utterances against compiled per-intent patterns.
+
+    Confidences are fixed per rule class and ordered by precision:
+    a whole-utterance match of a plugin's grammar is near certain, a question
+    with no action keyword is almost always a general query, a configured
+    keyword followed by one word may be a broad verb ("get started", "kill
+    1234") and a bare keyword hit somewhere in the sentence is only a hint.
+    """
+
+    GRAMMAR_CONFIDENCE = 0.95
+    QUESTION_CONFIDENCE = 0.9
+    KEYWORD_GRAMMAR_CONFIDENCE = 0.8
+    KEYWORD_CONFIDENCE = 0.6
+    AMBIGUOUS_CONFIDENCE = 0.4
+
+    def __init__(self, keywords: Dict[str, List[str]]):
+        """Initialize rule matcher.
+
+        Args:
+            keywords: Intent name to trigger keywords/phrases
+        """
+        self.keywords = {
+            intent: re.compile(r"\b(?:" + "|".join(re.escape(k) for k in words) + r")\b")
+            for intent, words in keywords.items() if words
+        }
+        self.grammar: List[tuple] = []
+
+        # Keyword followed by a single object, e.g. "install htop"
+        for intent, words in keywords.items():
+            entity = KEYWORD_ENTITIES.get(intent)
+            if words and entity:
+                alternatives = "|".join(re.escape(k) for k in words)
+                self.add_patterns(intent, [rf"(?:{alternatives})\s+{entity}"], self.KEYWORD_GRAMMAR_CONFIDENCE)
+
+    def add_patterns(self, intent: str, patterns: List[str], confidence: Optional[float] = None):
+        """Add whole-utterance grammar patterns for an intent.
+
+        Args:
+            intent: Intent name
+            patterns: Regular expressions, matched against the full
+                lower-cased utterance; named groups become entities
+            confidence: Confidence of a match, defaults to GRAMMAR_CONFIDENCE
+        """
+        for pattern in patterns:
+            self.grammar.append((intent, re.compile(pattern), confidence or self.GRAMMAR_CONFIDENCE))
+
+    def match(self, text: str) -> Optional[RuleMatch]:
+        """Match an utterance.
+
+        Args:
+            text: User input text
+
+        Returns:
+            Best rule match, or None if no rule applies
+        """
+        normalized = self.normalize(text)
+        if not normalized:
+            return None
+
+        # Whole-utterance grammar, keeping the most precise match per intent
+        grammar_matches = {}
+        for intent, pattern, confidence in self.grammar:
+            match = pattern.fullmatch(normalized)
+            if match and confidence > grammar_matches.get(intent, (0.0,))[0]:
+                grammar_matches[intent] = (confidence, {k: v for k, v in match.groupdict().items() if v})
+
+        if len(grammar_matches) == 1:
+            intent, (confidence, entities) = next(iter(grammar_matches.items()))
+            return RuleMatch(intent, confidence, entities)
+
+        # Keyword hits anywhere in the utterance
+        hits = {
+            intent: pattern.search(normalized).start()
+            for intent, pattern in self.keywords.items()
+            if pattern.search(normalized)
+        }
+
+        if len(grammar_matches) > 1 or len(hits) > 1:
+            candidates = grammar_matches or hits
+            best = min(candidates, key=lambda intent: hits.get(intent, 0))
+            return RuleMatch(best, self.AMBIGUOUS_CONFIDENCE, grammar_matches.get(best, (0.0, {}))[1])
+
+        is_question = normalized.split()[0] in QUESTION_WORDS or normalized.startswith(QUESTION_PHRASES)
+
+        if hits:
+            intent = next(iter(hits))
+            confidence = self.AMBIGUOUS_CONFIDENCE if is_question else self.KEYWORD_CONFIDENCE
+            return RuleMatch(intent, confidence)
+
+        if is_question:
+            return RuleMatch("general_query", self.QUESTION_CONFIDENCE)
+
+        return None
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lower-case and strip politeness and trailing punctuation.
+
+        Args:
+            text: User input text
+
+        Returns:
+            Normalized text
+        """
+        text = " ".join(text.lower().split())
+        text = POLITE_PREFIX.sub("", text)
+        return TRAILING_PUNCTUATION.sub("", text)
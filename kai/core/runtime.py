@@ -0,0 +1,196 @@
+"""Long-lived event loop for synchronous callers.
+
+The CLI, the GUI and the wake-word callback are synchronous. Running each of
+their queries with ``asyncio.run`` creates and tears down an event loop per
+turn. The async LLM clients are bound to a loop, so every turn opened new
+connections, and a background task could not outlive the turn that started
+it. A Runtime owns one event loop on a dedicated thread. Any thread can
+submit coroutines to it and gets a concurrent.futures.Future back.
+shutdown() stops accepting work, waits for in-flight work to finish, then
+stops the loop.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Runtime:
+    """One event loop on a dedicated thread, shared by synchronous callers."""
+
+    def __init__(self, name: str = "kai-runtime"):
+        """Initialize runtime; the loop starts on first use.
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closing = False
+        self._pending: Set[concurrent.futures.Future] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The runtime's event loop, started if needed."""
+        self.start()
+        return self._loop
+
+    @property
+    def running(self) -> bool:
+        """Whether the loop thread is running."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def in_loop(self) -> bool:
+        """Whether the caller runs on the runtime's loop thread."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    def start(self) -> "Runtime":
+        """Start the loop thread if it is not running.
+
+        Returns:
+            The runtime itself
+
+        Raises:
+            RuntimeError: If the runtime was shut down
+        """
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("Runtime is shut down")
+            if self._thread is not None:
+                return self
+
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run, name=self.name, daemon=True)
+            thread.start()
+            ready.wait()
+            self._loop, self._thread = loop, thread
+        return self
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop from any thread.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            Future with the coroutine's result; cancelling it cancels the coroutine
+
+        Raises:
+            RuntimeError: If the runtime was shut down
+        """
+        try:
+            loop = self.loop
+        except RuntimeError:
+            coro.close()
+            raise
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        with self._lock:
+            self._pending.add(future)
+            self.stats["submitted"] += 1
+        future.add_done_callback(self._done)
+        return future
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait; the coroutine is cancelled on timeout
+
+        Returns:
+            The coroutine's result
+
+        Raises:
+            RuntimeError: If called from the loop thread, where it would deadlock
+        """
+        if self.in_loop():
+            coro.close()
+            raise RuntimeError("Runtime.run() called on the runtime loop; await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Timeout or Ctrl+C: don't leave the coroutine running unattended
+            future.cancel()
+            raise
+
+    def in_flight(self) -> int:
+        """Get the number of submitted coroutines not yet finished.
+
+        Returns:
+            Count of pending futures
+        """
+        with self._lock:
+            return len(self._pending)
+
+    def shutdown(self, timeout: float = 10.0,
+                 cleanup: Optional[Callable[[], Awaitable[None]]] = None) -> bool:
+        """Stop accepting work, drain in-flight coroutines and stop the loop.
+
+        Args:
+            timeout: Seconds to wait for in-flight work before cancelling it
+            cleanup: Coroutine function run on the loop after draining, e.g.
+                to close async clients bound to it
+
+        Returns:
+            True if all in-flight work finished without being cancelled
+        """
+        with self._lock:
+            if self._closing:
+                return True
+            self._closing = True
+            pending = list(self._pending)
+            loop, thread = self._loop, self._thread
+        if thread is None:
+            return True
+        if self.in_loop():
+            raise RuntimeError("Runtime.shutdown() called on the runtime loop")
+
+        _, unfinished = concurrent.futures.wait(pending, timeout)
+        if unfinished:
+            logger.warning("Cancelling %d coroutines still running at shutdown", len(unfinished))
+            for future in unfinished:
+                future.cancel()
+
+        async def finish():
+            if cleanup is not None:
+                await cleanup()
+            await loop.shutdown_asyncgens()
+
+        try:
+            asyncio.run_coroutine_threadsafe(finish(), loop).result(timeout)
+        except Exception as e:
+            logger.warning("Runtime cleanup failed: %s", e)
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+        if not thread.is_alive():
+            loop.close()
+        return not unfinished
+
+    def _done(self, future: concurrent.futures.Future):
+        """Count a finished coroutine."""
+        with self._lock:
+            self._pending.discard(future)
+            if future.cancelled():
+                self.stats["cancelled"] += 1
+            elif future.exception() is not None:
+                self.stats["failed"] += 1
+            else:
+                self.stats["completed"] += 1
@@ -0,0 +1,210 @@
+"""Conversation sessions.
+
+The GUI, the voice loop and every daemon client can talk to one Assistant
+at the same time. Each conversation gets a Session holding its own history,
+preferences and prompt statistics. Turns of different sessions run
+concurrently. Turns of one session take its TurnLock, so each turn sees the
+previous turn's exchange in its history. Sessions left idle longer than
+``sessions.idle_timeout`` are evicted; the default session is never evicted.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from kai.core.context import ConversationContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SESSION = "default"
+
+
+class TurnLock:
+    """FIFO lock a turn takes with ``await acquire()`` and gives up with ``release()``.
+
+    Waiters may be on different event loops: the daemon's loop and the
+    Assistant's runtime loop, which serves synchronous callers and the voice
+    pipeline. A streamed turn keeps the lock after async_query() returns,
+    until its stream ends or is closed, so release() is a plain call that
+    may come from another task or thread. asyncio.Lock supports neither.
+    release() hands the lock straight to the next waiter, woken on its own
+    loop; a waiter cancelled after being granted the lock passes it on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._held = False
+        self._waiters = deque()
+
+    def locked(self) -> bool:
+        """Whether a turn holds the lock."""
+        return self._held
+
+    async def acquire(self):
+        """Wait until the lock is free, then take it."""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+        waiter = {"granted": False, "abandoned": False,
+                  "grant": lambda: loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))}
+
+        with self._lock:
+            if not self._held:
+                self._held = True
+                return
+            self._waiters.append(waiter)
+
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                waiter["abandoned"] = True
+                was_granted = waiter["granted"]
+            if was_granted:
+                self.release()
+            raise
+
+    def release(self):
+        """Hand the lock to the next waiter, or free it."""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if waiter["abandoned"]:
+                    continue
+                waiter["granted"] = True
+                waiter["grant"]()
+                return
+            self._held = False
+
+
+@dataclass(eq=False)
+class Session:
+    """One conversation with its own history and preferences."""
+
+    id: str
+    context: ConversationContext
+    preferences: dict = field(default_factory=dict)
+    created_at: float = field(default_factory=time.monotonic)
+    last_active: float = field(default_factory=time.monotonic)
+    prompt_tokens: int = 0  # Estimated history + query tokens of the last turn
+    turns: int = 0
+    lock: TurnLock = field(default_factory=TurnLock)
+
+    def touch(self):
+        """Mark the session as used now."""
+        self.last_active = time.monotonic()
+
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since the session was last used."""
+        return time.monotonic() - self.last_active
+
+
+class SessionManager:
+    """Create, look up and evict sessions."""
+
+    def __init__(self, context_factory: Callable[[], ConversationContext], idle_timeout: float = 1800,
+                 max_sessions: int = 64):
+        """Initialize session manager.
+
+        Args:
+            context_factory: Creates the ConversationContext of a new session
+            idle_timeout: Seconds after which an unused session is evicted, 0 to keep sessions
+            max_sessions: Sessions kept at most; the least recently used idle ones go first
+        """
+        self.context_factory = context_factory
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max(1, max_sessions)
+        self.evicted = 0
+        self._sessions: Dict[str, Session] = {}
+        self._lock = threading.Lock()
+
+    def get(self, session_id: Optional[str] = None, create: bool = True) -> Optional[Session]:
+        """Get a session, creating it if needed.
+
+        Args:
+            session_id: Session id, defaults to the default session
+            create: Create the session if it does not exist
+
+        Returns:
+            Session, or None if it does not exist and create is False
+        """
+        session_id = session_id or DEFAULT_SESSION
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None and create:
+                self._evict(room=1)
+                session = Session(id=session_id, context=self.context_factory())
+                self._sessions[session_id] = session
+                logger.debug("Created session %s", session_id)
+            if session is not None:
+                session.touch()
+            return session
+
+    def close(self, session_id: str) -> bool:
+        """Forget a session.
+
+        Args:
+            session_id: Session id
+
+        Returns:
+            True if the session existed
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def ids(self) -> List[str]:
+        """Get the ids of live sessions.
+
+        Returns:
+            Session ids, most recently used last
+        """
+        with self._lock:
+            return [session.id for session in sorted(self._sessions.values(), key=lambda s: s.last_active)]
+
+    def evict_idle(self) -> int:
+        """Evict sessions idle longer than idle_timeout.
+
+        Returns:
+            Number of sessions evicted
+        """
+        with self._lock:
+            return self._evict()
+
+    def stats(self) -> dict:
+        """Get session counts.
+
+        Returns:
+            Dict with active, busy (in a turn) and evicted session counts
+        """
+        with self._lock:
+            return {
+                "active": len(self._sessions),
+                "busy": sum(1 for session in self._sessions.values() if session.lock.locked()),
+                "evicted": self.evicted,
+            }
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, room: int = 0) -> int:
+        """Drop idle sessions, then the least recently used over max_sessions (caller holds the lock)."""
+        candidates = sorted(
+            (session for session in self._sessions.values()
+             if session.id != DEFAULT_SESSION and not session.lock.locked()),
+            key=lambda session: session.last_active
+        )
+        evict = [session for session in candidates
+                 if self.idle_timeout and session.idle_seconds > self.idle_timeout]
+        # Leave room for sessions about to be created
+        excess = len(self._sessions) - len(evict) - (self.max_sessions - room)
+        evict.extend([session for session in candidates if session not in evict][:max(0, excess)])
+
+        for session in evict:
+            del self._sessions[session.id]
+            logger.debug("Evicted session %s after %.0fs idle", session.id, session.idle_seconds)
+        self.evicted += len(evict)
+        return len(evict)
@@ -0,0 +1,75 @@
+"""Speculative response generation.
+
+Most turns end up as general queries, but the answer can only start once
+the intent is known. SpeculativeResponse starts producing a response in a
+background task right away and buffers its text deltas, so the caller can
+either adopt the response (already partly generated) once classification
+agrees, or cancel it and account for the tokens that were wasted.
+"""
+
+import asyncio
+from typing import AsyncIterator, Awaitable, Union
+
+
+_DONE = object()
+
+
+class SpeculativeResponse:
+    """A response started before it is known to be needed."""
+
+    def __init__(self, start: Awaitable[Union[str, AsyncIterator[str]]]):
+        """Start generating in the background.
+
+        Must be called with a running event loop.
+
+        Args:
+            start: Awaitable returning the response text or an async iterator
+                of text deltas, e.g. ``PluginManager.execute_intent(..., stream=True)``
+        """
+        self.tokens = 0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run(start))
+
+    @property
+    def done(self) -> bool:
+        """Whether generation has finished, failed or been cancelled."""
+        return self._task.done()
+
+    def cancel(self) -> int:
+        """Stop generating.
+
+        Returns:
+            Number of text deltas (tokens) produced before cancellation
+        """
+        self._task.cancel()
+        return self.tokens
+
+    async def chunks(self) -> AsyncIterator[str]:
+        """Yield the buffered and remaining text deltas.
+
+        Yields:
+            Text deltas in generation order
+        """
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    async def _run(self, start: Awaitable[Union[str, AsyncIterator[str]]]):
+        """Drain the response into the buffer."""
+        try:
+            response = await start
+            if isinstance(response, str):
+                self.tokens += 1
+                self._queue.put_nowait(response)
+                return
+            async for delta in response:
+                self.tokens += 1
+                self._queue.put_nowait(delta)
+        except Exception as e:
+            self._queue.put_nowait(e)
+        finally:
+            self._queue.put_nowait(_DONE)
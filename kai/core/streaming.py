@@ -0,0 +1,178 @@
+"""Streaming response helpers."""
+
+import asyncio
+import re
+import time
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+
+# Sentence boundary: terminal punctuation followed by whitespace
+SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+class ResponseStream:
+    """Stream of response text deltas with per-turn timing.
+
+    Can be consumed with ``async for`` inside an event loop, or with a plain
+    ``for`` loop once bound via :meth:`bind_loop` to a private loop or to a
+    loop running on another thread (the assistant's Runtime).
+    """
+
+    def __init__(self, chunks: AsyncIterator[str], started_at: Optional[float] = None,
+                 on_complete: Optional[Callable[[str], None]] = None):
+        """Initialize response stream.
+
+        Args:
+            chunks: Async iterator producing text deltas
+            started_at: Monotonic timestamp of the start of the turn
+            on_complete: Called with the full text once the stream is exhausted
+        """
+        self._chunks = chunks
+        self._on_complete = on_complete
+        self._parts = []
+        self._loop = None
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.first_token_at = None
+        self.finished_at = None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> str:
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._finish()
+            raise
+
+        if chunk and self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+        self._parts.append(chunk)
+        return chunk
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        """Bind an event loop used for synchronous iteration.
+
+        Args:
+            loop: Loop the underlying chunks were created on
+        """
+        self._loop = loop
+
+    def __iter__(self) -> Iterator[str]:
+        if self._loop is None:
+            raise RuntimeError("ResponseStream must be bound to a loop for sync iteration")
+
+        loop, self._loop = self._loop, None
+        if loop.is_running():
+            # Loop runs on another thread: hand each step over and wait for it
+            def step(coro):
+                return asyncio.run_coroutine_threadsafe(coro, loop).result()
+        else:
+            step = loop.run_until_complete
+
+        try:
+            while True:
+                try:
+                    yield step(self.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            if loop.is_running():
+                if self.finished_at is None:
+                    step(self.aclose())
+            else:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+                loop.close()
+
+    async def collect(self) -> str:
+        """Consume the whole stream.
+
+        Returns:
+            Full response text
+        """
+        async for _ in self:
+            pass
+        return self.text
+
+    async def aclose(self):
+        """Stop the stream early, ending the generation behind it."""
+        aclose = getattr(self._chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+
+    def _finish(self):
+        """Record completion and fire the completion callback once."""
+        if self.finished_at is not None:
+            return
+        self.finished_at = time.monotonic()
+        if self._on_complete:
+            self._on_complete(self.text)
+
+    @property
+    def text(self) -> str:
+        """Text received so far."""
+        return "".join(self._parts)
+
+    @property
+    def time_to_first_token(self) -> Optional[float]:
+        """Seconds from turn start to first non-empty delta."""
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+
+async def single_chunk(text: str) -> AsyncIterator[str]:
+    """Wrap a complete response as a one-chunk stream.
+
+    Args:
+        text: Complete response text
+
+    Yields:
+        The text itself
+    """
+    yield text
+
+
+def iter_sentences(deltas: Iterable[str]) -> Iterator[str]:
+    """Group streamed text deltas into complete sentences.
+
+    Args:
+        deltas: Iterable of text fragments
+
+    Yields:
+        Sentences as soon as their terminating punctuation arrives
+    """
+    buffer = ""
+    for delta in deltas:
+        buffer += delta
+        parts = SENTENCE_END.split(buffer)
+        # Last part may still be incomplete
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+
+    if buffer.strip():
+        yield buffer.strip()
+
+
+async def aiter_sentences(deltas: AsyncIterable[str]) -> AsyncIterator[str]:
+    """Group streamed text deltas into complete sentences, asynchronously.
+
+    Args:
+        deltas: Async iterable of text fragments
+
+    Yields:
+        Sentences as soon as their terminating punctuation arrives
+    """
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        parts = SENTENCE_END.split(buffer)
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                yield sentence.strip()
+        buffer = parts[-1]
+
+    if buffer.strip():
+        yield buffer.strip()
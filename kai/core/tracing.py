@@ -0,0 +1,403 @@
+"""Per-turn latency tracing.
+
+A trace is a tree of spans: named intervals with monotonic start and end
+times and a few attributes. Each trace covers one turn, or one wake trigger.
+The current span is kept in a context variable, so spans opened in nested
+calls (intent recognition inside a turn, an LLM call inside a plugin) attach
+to their parent without being passed around, including across awaits.
+When the root span and all of its children have ended, the trace is
+written as one JSON line.
+
+Tracing is off by default. While it is off, span() returns a shared no-op
+span, so an instrumented call costs one attribute check.
+
+    with tracer.span("stt.transcribe", seconds=2.1) as span:
+        text, status = transcribe(audio)
+        span.set(status=status)
+"""
+
+import contextvars
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_current: contextvars.ContextVar = contextvars.ContextVar("kai_span", default=None)
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "span_id", "parent_id", "trace", "start", "end", "attributes", "_refs", "_token")
+
+    def __init__(self, name: str, trace: "Trace", span_id: int, parent_id: Optional[int],
+                 start: float, attributes: Dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self._refs = 1  # Holders that must finish() before the span ends
+        self._token = None
+
+    @property
+    def recording(self) -> bool:
+        """Whether the span is recorded (False for the disabled no-op span)."""
+        return True
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds from start to end, None while running."""
+        return None if self.end is None else self.end - self.start
+
+    def set(self, **attributes) -> "Span":
+        """Add attributes.
+
+        Returns:
+            The span itself
+        """
+        self.attributes.update(attributes)
+        return self
+
+    def finish(self, end: Optional[float] = None, **attributes):
+        """End the span once every holder has finished it.
+
+        Args:
+            end: Monotonic end time, defaults to now
+            **attributes: Attributes to add
+        """
+        if attributes:
+            self.attributes.update(attributes)
+        self._refs -= 1
+        if self._refs > 0 or self.end is not None:
+            return
+        self.end = time.monotonic() if end is None else end
+        self.trace.finished(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self._token = None
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self.finish()
+        return False
+
+    def to_dict(self, origin: float) -> dict:
+        """Serialize with times relative to the start of the trace.
+
+        Args:
+            origin: Monotonic start time of the trace
+
+        Returns:
+            Dict with name, ids, start offset, duration and attributes
+        """
+        return {
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "start": round(self.start - origin, 6),
+            "duration": round(self.duration, 6) if self.end is not None else None,
+            "attributes": self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    recording = False
+    duration = None
+
+    def set(self, **attributes) -> "_NoopSpan":
+        return self
+
+    def finish(self, end: Optional[float] = None, **attributes):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Trace:
+    """Spans sharing one root, written out together."""
+
+    def __init__(self, tracer: "Tracer", trace_id: str):
+        self.tracer = tracer
+        self.trace_id = trace_id
+        self.timestamp = time.time()
+        self.spans: List[Span] = []
+        self.open = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def add(self, span: Span) -> bool:
+        """Attach a new span.
+
+        Returns:
+            False if the trace was already written
+        """
+        with self._lock:
+            if self.closed:
+                return False
+            self.spans.append(span)
+            self.open += 1
+            return True
+
+    def finished(self, span: Span):
+        """Count an ended span, writing the trace when none is left running."""
+        with self._lock:
+            self.open -= 1
+            if self.open > 0 or self.closed:
+                return
+            self.closed = True
+        self.tracer.export(self)
+
+    def to_dict(self) -> dict:
+        """Serialize the trace as one JSONL record.
+
+        Returns:
+            Dict with trace id, root name, wall-clock timestamp, duration,
+            root attributes and all spans in start order
+        """
+        root = self.spans[0]
+        return {
+            "trace_id": self.trace_id,
+            "name": root.name,
+            "timestamp": round(self.timestamp, 3),
+            "duration": round(root.duration, 6),
+            "attributes": root.attributes,
+            "spans": [span.to_dict(root.start) for span in sorted(self.spans, key=lambda s: s.start)],
+        }
+
+
+class Tracer:
+    """Creates spans and writes finished traces as JSON lines."""
+
+    def __init__(self, path: Optional[str] = None, enabled: bool = False, keep: int = 100):
+        """Initialize tracer.
+
+        Args:
+            path: JSONL file traces are appended to; None keeps them in memory only
+            enabled: Record spans
+            keep: Number of recent traces kept in memory
+        """
+        self.enabled = enabled
+        self.path = Path(path) if path else None
+        self.recent = deque(maxlen=keep)
+        self.stats = {"traces": 0, "spans": 0, "write_errors": 0}
+        self.listeners: List[Callable[[dict], None]] = []
+        self._ids = itertools.count(1)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: bool, path: Optional[str] = None):
+        """Turn tracing on or off and set the output file.
+
+        Args:
+            enabled: Record spans
+            path: JSONL file traces are appended to; None keeps them in memory only
+        """
+        with self._lock:
+            path = Path(path) if path else None
+            if path != self.path and self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = path
+            self.enabled = enabled
+
+    def subscribe(self, listener: Callable[[dict], None]):
+        """Call a function with every finished trace, e.g. to update metrics.
+
+        Args:
+            listener: Called with the trace record; subscribing twice has no effect
+        """
+        with self._lock:
+            if listener not in self.listeners:
+                self.listeners.append(listener)
+
+    def current(self):
+        """Get the span active in this context.
+
+        Returns:
+            Current span, or the no-op span if there is none or tracing is off
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        return _current.get() or NOOP_SPAN
+
+    def annotate(self, **attributes):
+        """Add attributes to the current span, if any."""
+        if self.enabled:
+            span = _current.get()
+            if span is not None:
+                span.attributes.update(attributes)
+
+    def span(self, name: str, parent: Optional[Span] = None, **attributes):
+        """Start a span to be used as a context manager.
+
+        Inside the ``with`` block the span is current, so nested spans
+        attach to it. It ends when the block exits.
+
+        Args:
+            name: Operation name, e.g. "stt.transcribe"
+            parent: Parent span; defaults to the current span, a new trace if none
+            **attributes: Initial attributes
+
+        Returns:
+            Span, or the no-op span while tracing is disabled
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        return self._start(name, parent, time.monotonic(), attributes)
+
+    def start(self, name: str, parent: Optional[Span] = None, start: Optional[float] = None,
+              **attributes):
+        """Start a span without making it current; call finish() to end it.
+
+        For spans that outlive the block that started them, such as a turn
+        that continues in another pipeline stage.
+
+        Args:
+            name: Operation name
+            parent: Parent span; defaults to the current span, a new trace if none
+            start: Monotonic start time, defaults to now
+            **attributes: Initial attributes
+
+        Returns:
+            Span, or the no-op span while tracing is disabled
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        return self._start(name, parent, time.monotonic() if start is None else start, attributes)
+
+    def record(self, name: str, start: float, end: Optional[float] = None,
+               parent: Optional[Span] = None, **attributes):
+        """Record an operation that already happened.
+
+        Args:
+            name: Operation name
+            start: Monotonic start time
+            end: Monotonic end time, defaults to now
+            parent: Parent span; defaults to the current span
+            **attributes: Attributes
+        """
+        if self.enabled:
+            self._start(name, parent, start, attributes).finish(end)
+
+    def follow(self, span, chunks: AsyncIterator) -> AsyncIterator:
+        """Pass a stream through with span current while each item is produced.
+
+        The span stays open until the stream ends or is closed, so work done
+        lazily by the stream (a streamed LLM call) is attributed to it.
+
+        Args:
+            span: Span to keep open, typically the turn
+            chunks: Async iterator to pass through
+
+        Returns:
+            Async iterator of the same items; chunks itself while tracing is off
+        """
+        if not span.recording:
+            return chunks
+        span._refs += 1  # Taken now: the span's own block may end before the stream starts
+        return self._follow(span, chunks)
+
+    async def _follow(self, span: Span, chunks: AsyncIterator) -> AsyncIterator:
+        try:
+            while True:
+                token = _current.set(span)
+                try:
+                    chunk = await chunks.__anext__()
+                except StopAsyncIteration:
+                    break
+                finally:
+                    _current.reset(token)
+                yield chunk
+        finally:
+            aclose = getattr(chunks, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            span.finish()
+
+    def export(self, trace: Trace):
+        """Keep a finished trace, append it to the trace file and pass it to listeners."""
+        record = trace.to_dict()
+        with self._lock:
+            self.recent.append(record)
+            self.stats["traces"] += 1
+            self.stats["spans"] += len(trace.spans)
+            listeners = list(self.listeners)
+            if self.path is not None:
+                try:
+                    if self._file is None:
+                        self.path.parent.mkdir(parents=True, exist_ok=True)
+                        self._file = open(self.path, "a", encoding="utf-8")
+                    self._file.write(json.dumps(record, default=str) + "\n")
+                    self._file.flush()
+                except OSError as e:
+                    self.stats["write_errors"] += 1
+                    logger.warning("Could not write trace to %s: %s", self.path, e)
+        for listener in listeners:
+            try:
+                listener(record)
+            except Exception as e:
+                logger.warning("Trace listener failed: %s", e)
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _start(self, name: str, parent: Optional[Span], start: float, attributes: Dict[str, Any]) -> Span:
+        if parent is None:
+            parent = _current.get()
+        if not getattr(parent, "recording", False):
+            parent = None
+        if parent is not None:
+            span = Span(name, parent.trace, next(self._ids), parent.span_id, start, attributes)
+            if parent.trace.add(span):
+                return span
+            # The parent's trace was already written; start a trace of its own
+        trace = Trace(self, os.urandom(8).hex())
+        trace.timestamp -= time.monotonic() - start  # Wall-clock time of the span's start
+        span = Span(name, trace, next(self._ids), None, start, attributes)
+        trace.add(span)
+        return span
+
+
+def trace_path(config) -> Path:
+    """Get the trace file from the ``tracing.*`` configuration.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        tracing.path, or traces.jsonl next to config.yaml
+    """
+    path = config.get("tracing.path")
+    return Path(path).expanduser() if path else config.config_path.parent / "traces.jsonl"
+
+
+tracer = Tracer()
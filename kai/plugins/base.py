@@ -1,24 +1,40 @@
 """Base plugin class."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List
 from kai.core.intent import Intent
 
 
 class Plugin(ABC):
     """Base class for all Kai plugins."""
     
-    def __init__(self, name: str, version: str = "1.0.0", intents: List[str] = None):
+    def __init__(self, name: str, version: str = "1.0.0", intents: List[str] = None,
+                 patterns: Dict[str, List[str]] = None, exemplars: Dict[str, List[str]] = None):
         """Initialize plugin.
         
         Args:
             name: Plugin name
             version: Plugin version
             intents: List of intent names this plugin handles
+            patterns: Optional whole-utterance regexes per intent for the
+                rule-based fast path; named groups become entities
+            exemplars: Optional example utterances per intent for the
+                embedding classifier
         """
         self.name = name
         self.version = version
         self.intents = intents or []
+        self.patterns = patterns or {}
+        self.exemplars = exemplars or {}
+        self.config = None  # Set by the plugin manager when loaded
+    
+    def configure(self, config):
+        """Give the plugin the assistant's configuration.
+        
+        Args:
+            config: Configuration object
+        """
+        self.config = config
         
     @abstractmethod
     async def handle_intent(self, intent: Intent) -> str:
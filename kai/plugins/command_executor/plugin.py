@@ -1,7 +1,9 @@
 """Command executor plugin implementation."""
 
+import asyncio
 import subprocess
 import shlex
+from typing import Optional
 from kai.plugins.base import Plugin
 from kai.core.intent import Intent
 
@@ -13,7 +15,31 @@ class CommandExecutorPlugin(Plugin):
         super().__init__(
             name="command_executor",
             version="1.0.0",
-            intents=["execute_command", "install_package"]
+            intents=["execute_command", "install_package"],
+            patterns={
+                "install_package": [
+                    r"(?:sudo\s+)?apt(?:-get)?\s+install\s+(?P<package>[\w.+-]+)",
+                    r"install\s+(?:the\s+)?(?P<package>[\w.+-]+)(?:\s+package)?",
+                ],
+                # No command entity: _handle_execute takes it from the raw utterance
+                "execute_command": [r"(?:run\s+command|run\s+this|execute)\s+.+"],
+            },
+            exemplars={
+                "install_package": [
+                    "install vim",
+                    "can you install docker for me",
+                    "i need the htop package",
+                    "download and set up python",
+                    "get me gimp from the repositories",
+                ],
+                "execute_command": [
+                    "run command ls -la",
+                    "execute df -h",
+                    "run this in the terminal: uptime",
+                    "show me the output of free -m",
+                    "run the update command",
+                ],
+            }
         )
         
     def _extract_package_fallback(self, text: str) -> str:
@@ -44,6 +70,12 @@ class CommandExecutorPlugin(Plugin):
         Returns:
             Response text
         """
+        # Entities pre-extracted by the recognizer skip a second LLM call
+        if intent.name == "install_package" and intent.entities.get("package"):
+            return await self._handle_install(intent.raw_text, intent.entities["package"])
+        if intent.name == "execute_command" and intent.entities.get("command"):
+            return await self._handle_execute(intent.raw_text, intent.entities["command"])
+        
         text_lower = intent.raw_text.lower()
         
         # Check for install package commands
@@ -56,66 +88,45 @@ class CommandExecutorPlugin(Plugin):
         
         return "I'm not sure what command you want me to run."
     
-    async def _handle_install(self, text: str) -> str:
+    async def _handle_install(self, text: str, package: Optional[str] = None) -> str:
         """Handle package installation.
         
         Args:
             text: User input text
+            package: Package name already extracted by the recognizer
             
         Returns:
             Response text
         """
-        # Use LLM to extract package name
-        from kai.ai.llm import LLMEngine
-        
-        try:
-            llm = LLMEngine(model="llama3.2:3b")
-            
-            extract_prompt = f"""Extract the package/software name from this install request and convert it to the correct apt package name.
-
-User request: "{text}"
-
-Rules:
-- Convert common names to apt package names (e.g., python -> python3, node -> nodejs, docker -> docker.io)
-- If the name is already correct, keep it as is
-- Return the actual apt package name that can be installed
-
-Respond with ONLY the apt package name (one word), nothing else. If you can't determine it, respond with "unknown"."""
-
-            package_name = llm.generate(extract_prompt, system_prompt="You are a package name extractor. Respond with only the package name.").strip().lower()
-            
-            if package_name == "unknown" or not package_name:
-                return "I couldn't figure out which package you want to install. Can you be more specific?"
-            
-        except Exception as e:
-            # Fallback to keyword matching
-            package_name = self._extract_package_fallback(text)
-            if not package_name:
-                return "I couldn't figure out which package you want to install. Can you say it again?"
-        
-        # Confirm before installing
         # Get timeout from config
         from kai.core.config import Config
         config = Config()
         check_timeout = config.get("command_executor.check_timeout", 5)
         install_timeout = config.get("command_executor.install_timeout", 300)
         
+        # Trust the recognizer's package only if apt knows it
+        package_name = package.strip().lower() if package else None
+        if package_name:
+            try:
+                if not await self._package_exists(package_name, check_timeout):
+                    package_name = None
+            except Exception:
+                pass
+        
+        if not package_name:
+            package_name = await self._extract_package(text)
+            if not package_name:
+                return "I couldn't figure out which package you want to install. Can you be more specific?"
+        
         try:
             # Check if package exists
-            check_cmd = f"apt-cache show {package_name}"
-            result = subprocess.run(
-                shlex.split(check_cmd),
-                capture_output=True,
-                text=True,
-                timeout=check_timeout
-            )
-            
-            if result.returncode != 0:
+            if not await self._package_exists(package_name, check_timeout):
                 return f"I couldn't find a package called {package_name}. Make sure the name is correct."
             
             # Install the package
             install_cmd = f"sudo apt-get install -y {package_name}"
-            result = subprocess.run(
+            result = await asyncio.to_thread(
+                subprocess.run,
                 shlex.split(install_cmd),
                 capture_output=True,
                 text=True,
@@ -132,11 +143,68 @@ Respond with ONLY the apt package name (one word), nothing else. If you can't de
         except Exception as e:
             return f"Error installing {package_name}: {str(e)}"
     
-    async def _handle_execute(self, text: str) -> str:
+    async def _package_exists(self, package_name: str, timeout: float) -> bool:
+        """Check whether apt knows a package.
+        
+        Args:
+            package_name: Apt package name
+            timeout: Seconds to wait for apt-cache
+            
+        Returns:
+            True if the package exists
+        """
+        check_cmd = f"apt-cache show {package_name}"
+        result = await asyncio.to_thread(
+            subprocess.run,
+            shlex.split(check_cmd),
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+        return result.returncode == 0
+    
+    async def _extract_package(self, text: str) -> Optional[str]:
+        """Extract the apt package name from an install request.
+        
+        Args:
+            text: User input text
+            
+        Returns:
+            Package name, or None if it couldn't be determined
+        """
+        # Use LLM to extract package name
+        from kai.ai.routing import get_llm_for
+        
+        try:
+            llm = get_llm_for("extract", self.config)
+            
+            extract_prompt = f"""Extract the package/software name from this install request and convert it to the correct apt package name.
+
+User request: "{text}"
+
+Rules:
+- Convert common names to apt package names (e.g., python -> python3, node -> nodejs, docker -> docker.io)
+- If the name is already correct, keep it as is
+- Return the actual apt package name that can be installed
+
+Respond with ONLY the apt package name (one word), nothing else. If you can't determine it, respond with "unknown"."""
+
+            package_name = (await llm.agenerate(extract_prompt, system_prompt="You are a package name extractor. Respond with only the package name.", task="extract")).strip().lower()
+            
+            if package_name == "unknown" or not package_name:
+                return None
+            return package_name
+            
+        except Exception as e:
+            # Fallback to keyword matching
+            return self._extract_package_fallback(text)
+    
+    async def _handle_execute(self, text: str, command: Optional[str] = None) -> str:
         """Handle command execution.
         
         Args:
             text: User input text
+            command: Command already extracted by the recognizer
             
         Returns:
             Response text
@@ -144,10 +212,11 @@ Respond with ONLY the apt package name (one word), nothing else. If you can't de
         # Extract command (this is simplified - you might want better parsing)
         # Look for command after keywords
         keywords = ['run command', 'execute', 'run this']
-        command = None
         
         text_lower = text.lower()
         for keyword in keywords:
+            if command:
+                break
             if keyword in text_lower:
                 # Get everything after the keyword
                 idx = text_lower.index(keyword) + len(keyword)
@@ -158,10 +227,10 @@ Respond with ONLY the apt package name (one word), nothing else. If you can't de
             return "I couldn't figure out which command you want to run."
         
         # Safety check using LLM
-        from kai.ai.llm import LLMEngine
+        from kai.ai.routing import get_llm_for
         
         try:
-            llm = LLMEngine()
+            llm = get_llm_for("safety", self.config)
             safety_prompt = f"""Is this command safe to run on a Linux system?
 
 Command: {command}
@@ -173,11 +242,15 @@ Consider:
 
 Respond with ONLY "safe" or "dangerous", nothing else."""
 
-            safety_check = llm.generate(safety_prompt, system_prompt="You are a command safety analyzer.").strip().lower()
+            safety_check = (await llm.agenerate(
+                safety_prompt, "You are a command safety analyzer.", task="safety",
+                choices=["safe", "dangerous"], raise_errors=True,
+            )).strip().lower()
             
-            if "dangerous" in safety_check:
+            # Only an explicit "safe" lets the command run
+            if safety_check != "safe":
                 return "I can't run that command as it might be dangerous to your system."
-        except:
+        except Exception:
             # If LLM fails, be conservative
             dangerous_keywords = ['rm -rf', 'dd if=', 'mkfs', 'format', '> /dev/sd']
             if any(danger in command.lower() for danger in dangerous_keywords):
@@ -191,7 +264,8 @@ Respond with ONLY "safe" or "dangerous", nothing else."""
         
         try:
             # Execute command
-            result = subprocess.run(
+            result = await asyncio.to_thread(
+                subprocess.run,
                 command,
                 shell=True,
                 capture_output=True,
@@ -1,8 +1,29 @@
 """General query plugin implementation."""
 
+from typing import AsyncIterator, Optional, Tuple
 from kai.plugins.base import Plugin
 from kai.core.intent import Intent
-from kai.ai.llm import LLMEngine
+from kai.ai.routing import get_llm_for
+
+
+# System prompt optimized for voice interaction
+SYSTEM_PROMPT = """You are Kai, a friendly voice assistant for Linux users.
+
+VOICE RESPONSE RULES (CRITICAL):
+- Keep responses SHORT (2-3 sentences maximum)
+- Speak naturally like talking to a friend
+- NEVER use markdown, asterisks, or formatting symbols
+- NO bullet points, numbered lists, or code blocks
+- If listing things, say "first", "second", "also" naturally
+- Be conversational and helpful
+- Get to the point quickly
+- Remember previous conversation context
+
+Example: "To check disk space, just run d-f dash h in your terminal. That shows you how much space is used and available on each drive."
+
+NOT: "Here's how:\n* Run `df -h`\n* This shows disk usage\n**Note:** Requires terminal access"
+
+Remember: Someone is LISTENING to you speak, not reading text."""
 
 
 class GeneralQueryPlugin(Plugin):
@@ -12,7 +33,17 @@ class GeneralQueryPlugin(Plugin):
         super().__init__(
             name="general_query",
             version="1.0.0",
-            intents=["general_query"]
+            intents=["general_query"],
+            exemplars={
+                "general_query": [
+                    "what is linux",
+                    "how do i check disk space",
+                    "tell me a joke",
+                    "what's the difference between apt and snap",
+                    "why is my computer slow",
+                    "explain what a kernel does",
+                ],
+            }
         )
         self.llm = None
         
@@ -37,45 +68,78 @@ class GeneralQueryPlugin(Plugin):
         Returns:
             Response text
         """
-        # Initialize LLM lazily
-        if self.llm is None:
-            try:
-                self.llm = LLMEngine(model="llama3.2:3b")
-            except Exception as e:
-                return f"Error initializing LLM: {str(e)}. Make sure Ollama is running and the model is downloaded."
+        # Joint recognition already produced the answer
+        if intent.entities.get("answer"):
+            return intent.entities["answer"]
         
-        # Create system prompt optimized for voice interaction
-        system_prompt = """You are Kai, a friendly voice assistant for Linux users.
-
-VOICE RESPONSE RULES (CRITICAL):
-- Keep responses SHORT (2-3 sentences maximum)
-- Speak naturally like talking to a friend
-- NEVER use markdown, asterisks, or formatting symbols
-- NO bullet points, numbered lists, or code blocks
-- If listing things, say "first", "second", "also" naturally
-- Be conversational and helpful
-- Get to the point quickly
-- Remember previous conversation context
-
-Example: "To check disk space, just run d-f dash h in your terminal. That shows you how much space is used and available on each drive."
-
-NOT: "Here's how:\n* Run `df -h`\n* This shows disk usage\n**Note:** Requires terminal access"
-
-Remember: Someone is LISTENING to you speak, not reading text."""
+        llm, error = self._get_llm()
+        if error:
+            return error
         
         try:
-            # Build messages with history
-            messages = [{"role": "system", "content": system_prompt}]
-            
-            # Add conversation history (last 6 messages for context)
-            if conversation_history:
-                messages.extend(conversation_history[-6:])
-            
-            # Add current query
-            messages.append({"role": "user", "content": intent.raw_text})
+            messages = self._build_messages(intent, conversation_history)
             
             # Use chat method with history
-            response = self.llm.chat(messages)
+            response = await llm.achat(messages, task="answer")
             return response
         except Exception as e:
             return f"Error processing query: {str(e)}"
+    
+    async def stream_intent_with_history(self, intent: Intent, conversation_history: list) -> AsyncIterator[str]:
+        """Stream the answer to a general query token by token.
+        
+        Args:
+            intent: Intent to handle
+            conversation_history: Previous conversation messages
+            
+        Yields:
+            Response text deltas
+        """
+        if intent.entities.get("answer"):
+            yield intent.entities["answer"]
+            return
+        
+        llm, error = self._get_llm()
+        if error:
+            yield error
+            return
+        
+        messages = self._build_messages(intent, conversation_history)
+        async for chunk in llm.astream_chat(messages, task="answer"):
+            yield chunk
+    
+    def _get_llm(self) -> Tuple[Optional[object], Optional[str]]:
+        """Get the engine for this turn.
+        
+        Resolved on every turn, since the answer route may be downgraded to
+        a fallback model; an engine assigned to ``self.llm`` takes precedence.
+        
+        Returns:
+            Tuple of (engine, error message if it could not be initialized)
+        """
+        if self.llm is not None:
+            return self.llm, None
+        try:
+            return get_llm_for("answer", self.config), None
+        except Exception as e:
+            return None, f"Error initializing LLM: {str(e)}. Make sure Ollama is running and the model is downloaded."
+    
+    def _build_messages(self, intent: Intent, conversation_history: list) -> list:
+        """Build chat messages for a query.
+        
+        Args:
+            intent: Intent to handle
+            conversation_history: Previous conversation messages
+            
+        Returns:
+            List of message dicts
+        """
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+        
+        # Add conversation history (already trimmed to the context budget)
+        if conversation_history:
+            messages.extend(conversation_history)
+        
+        # Add current query
+        messages.append({"role": "user", "content": intent.raw_text})
+        return messages
@@ -1,8 +1,10 @@
 """Plugin manager."""
 
-from typing import Dict, List
+from typing import AsyncIterator, Dict, List, Union
 from kai.core.config import Config
 from kai.core.intent import Intent
+from kai.core.streaming import single_chunk
+from kai.core.tracing import tracer
 from kai.plugins.base import Plugin
 
 
@@ -26,6 +28,7 @@ class PluginManager:
         for plugin_name in enabled:
             try:
                 plugin = await self._load_plugin(plugin_name)
+                plugin.configure(self.config)
                 self.plugins[plugin_name] = plugin
             except Exception as e:
                 print(f"Failed to load plugin {plugin_name}: {e}")
@@ -44,27 +47,38 @@ class PluginManager:
         plugin_instance = getattr(module, "plugin")
         return plugin_instance
     
-    async def execute_intent(self, intent: Intent, conversation_history: list = None) -> str:
+    async def execute_intent(self, intent: Intent, conversation_history: list = None,
+                             stream: bool = False) -> Union[str, AsyncIterator[str]]:
         """Execute an intent using appropriate plugin.
         
         Args:
             intent: Intent to execute
             conversation_history: Optional conversation history for context
+            stream: Return an async iterator of text deltas instead of a string
             
         Returns:
-            Response text
+            Response text, or an async iterator of text deltas if stream is set
         """
-        # Find plugin that can handle this intent
-        for plugin in self.plugins.values():
-            if plugin.can_handle(intent):
-                # Pass history if plugin supports it
-                if hasattr(plugin, 'handle_intent_with_history') and conversation_history:
-                    return await plugin.handle_intent_with_history(intent, conversation_history)
-                else:
-                    return await plugin.handle_intent(intent)
-        
-        # No plugin found
-        return f"I don't know how to handle: {intent.raw_text}"
+        with tracer.span("plugin.execute", intent=intent.name, stream=stream) as span:
+            # Find plugin that can handle this intent
+            for name, plugin in self.plugins.items():
+                if plugin.can_handle(intent):
+                    span.set(plugin=name)
+                    # Plugins that can stream hand back their token iterator, timed until it ends
+                    if stream and hasattr(plugin, 'stream_intent_with_history'):
+                        return tracer.follow(span, plugin.stream_intent_with_history(intent, conversation_history or []))
+                    
+                    # Pass history if plugin supports it
+                    if hasattr(plugin, 'handle_intent_with_history') and conversation_history:
+                        response = await plugin.handle_intent_with_history(intent, conversation_history)
+                    else:
+                        response = await plugin.handle_intent(intent)
+                    return single_chunk(response) if stream else response
+            
+            # No plugin found
+            span.set(plugin=None)
+            response = f"I don't know how to handle: {intent.raw_text}"
+            return single_chunk(response) if stream else response
     
     def list_plugins(self) -> List[str]:
         """List loaded plugins.
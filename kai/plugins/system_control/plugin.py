@@ -12,7 +12,28 @@ class SystemControlPlugin(Plugin):
         super().__init__(
             name="system_control",
             version="1.0.0",
-            intents=["launch_app", "close_app"]
+            intents=["launch_app", "close_app"],
+            patterns={
+                "launch_app": [r"(?:open|launch)\s+(?:the\s+|my\s+)?(?P<app>[\w.+-]+)(?:\s+app)?"],
+                # An app name has a letter; "kill 1234" is a process id, not an app
+                "close_app": [r"(?:close|quit|kill)\s+(?:the\s+|my\s+)?(?P<app>[\w.+-]*[a-z][\w.+-]*)(?:\s+app)?"],
+            },
+            exemplars={
+                "launch_app": [
+                    "open firefox",
+                    "launch the terminal",
+                    "start the file manager",
+                    "can you open my browser",
+                    "bring up the text editor",
+                ],
+                "close_app": [
+                    "close firefox",
+                    "quit the music player",
+                    "kill chrome",
+                    "shut down the browser window",
+                    "exit the text editor",
+                ],
+            }
         )
         
     async def handle_intent(self, intent: Intent) -> str:
@@ -26,6 +26,7 @@ setup(
     install_requires=[
         # Core dependencies
         "ollama>=0.6.0",
+        "httpx>=0.27.0",
         "pyyaml>=6.0",
         "click>=8.1.0",
         "rich>=13.0.0",
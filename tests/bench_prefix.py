@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark prefill work per turn with a sliding vs. an append-only history window.
+
+"before" sends the last six messages, like GeneralQueryPlugin used to, so
+the prompt prefix shifts every turn once the window is full. "after" uses
+ConversationContext, whose window only grows between jumps, so Ollama can
+reuse its KV cache for the system prompt and earlier turns.
+"""
+
+import sys
+from kai.ai.clients import get_llm
+from kai.core.config import Config
+from kai.core.context import ConversationContext
+from kai.plugins.general_query.plugin import SYSTEM_PROMPT
+
+
+QUESTIONS = [
+    "What is a Linux distribution?",
+    "Which one would you suggest for an old laptop?",
+    "How much memory does it need?",
+    "How do I make a bootable USB stick for it?",
+    "What should I do right after installing?",
+    "How do I keep it updated?",
+    "How can I see what is using my disk space?",
+    "And how do I clean up old packages?",
+    "Is a firewall enabled by default?",
+    "How do I turn it on?",
+]
+
+
+def run(llm, history_for, record) -> list:
+    """Ask every question, returning (prefill tokens, prefill seconds) per turn."""
+    turns = []
+    for question in QUESTIONS:
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}] + history_for()
+        messages.append({"role": "user", "content": question})
+        answer = llm.chat(messages, task="answer")
+        usage = llm.usage["answer"]
+        turns.append((usage["prompt_eval_count"], usage["prompt_eval_seconds"]))
+        record(question, answer)
+    return turns
+
+
+def main():
+    config = Config()
+    model = sys.argv[1] if len(sys.argv) > 1 else config.get("models.llm", "llama3.2:3b")
+    llm = get_llm(model)
+    llm.warmup()
+
+    sliding = []
+    before = run(
+        llm,
+        lambda: sliding[-6:],
+        lambda q, a: sliding.extend([{"role": "user", "content": q}, {"role": "assistant", "content": a}])
+    )
+
+    budgets = config.get("context.budget", {})
+    context = ConversationContext(budget=budgets.get(model, budgets.get("default", 1024)))
+    after = run(llm, context.history, context.add_exchange)
+
+    print(f"\nModel: {model}")
+    print("=" * 62)
+    print(f"{'turn':>4}  {'before tokens':>13} {'before s':>9}  {'after tokens':>12} {'after s':>8}")
+    for turn, ((bt, bs), (at, as_)) in enumerate(zip(before, after), 1):
+        print(f"{turn:>4}  {bt:>13} {bs:>9.2f}  {at:>12} {as_:>8.2f}")
+    print("=" * 62)
+    print(f"{'sum':>4}  {sum(t for t, _ in before):>13} {sum(s for _, s in before):>9.2f}  "
+          f"{sum(t for t, _ in after):>12} {sum(s for _, s in after):>8.2f}\n")
+
+
+if __name__ == "__main__":
+    main()
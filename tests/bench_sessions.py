@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Load test: turns per second with many concurrent sessions.
+
+Each simulated user holds a separate session and sends a few queries one
+after another, against a local stand-in for Ollama that takes a fixed time
+per request. With sessions running in parallel, throughput grows with the
+number of users until the scheduler's concurrency limit or the client's
+connection pool (ten connections per host) is reached.
+
+    python -m tests.bench_sessions [users ...]
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import yaml
+
+from kai.core.assistant import Assistant
+from tests.fake_ollama import FakeOllama
+
+TURNS = 3
+DELAY = 0.2  # Seconds the stand-in server takes per request
+CONCURRENCY = 32
+
+
+def reply(body):
+    if body.get("options", {}).get("num_predict") == 8:
+        return "general_query"
+    return "An answer to " + body["messages"][-1]["content"]
+
+
+async def run(assistant: Assistant, users: int) -> float:
+    """Run every user's conversation concurrently, returning elapsed seconds."""
+    async def converse(user):
+        for turn in range(TURNS):
+            await assistant.async_query(f"question {turn} from user {user}", session=f"user{user}")
+
+    start = time.monotonic()
+    await asyncio.gather(*(converse(user) for user in range(users)))
+    return time.monotonic() - start
+
+
+async def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1, 4, 16, 64]
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply, delay=DELAY) as server:
+        import os
+        os.environ["OLLAMA_HOST"] = server.host
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "scheduler": {"concurrency": CONCURRENCY},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+            "context": {"summarize": False},
+            "sessions": {"max_sessions": max(counts) + 1},
+        }))
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+
+        print(f"\n{TURNS} turns per user, {DELAY:.1f}s per LLM request, scheduler concurrency {CONCURRENCY}")
+        print("=" * 52)
+        print(f"{'users':>6} {'turns':>6} {'seconds':>9} {'turns/s':>9} {'speedup':>9}")
+        baseline = None
+        for users in counts:
+            elapsed = await run(assistant, users)
+            rate = users * TURNS / elapsed
+            baseline = baseline or rate
+            print(f"{users:>6} {users * TURNS:>6} {elapsed:>9.2f} {rate:>9.1f} {rate / baseline:>8.1f}x")
+        print("=" * 52)
+        print(f"Sessions: {assistant.sessions.stats()}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
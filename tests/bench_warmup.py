@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Benchmark cold vs. warm first-query latency against a local Ollama."""
+
+import sys
+import time
+from kai.ai.clients import get_llm
+from kai.core.config import Config
+
+
+PROMPT = "Say hello in one short sentence."
+
+
+def unload(llm):
+    """Ask Ollama to drop the model from memory."""
+    llm.client.generate(model=llm.model, prompt="", keep_alive=0)
+    while llm.is_loaded():
+        time.sleep(0.2)
+
+
+def timed_query(llm) -> float:
+    """Time one complete answer."""
+    start = time.monotonic()
+    llm.generate(PROMPT)
+    return time.monotonic() - start
+
+
+def main():
+    model = sys.argv[1] if len(sys.argv) > 1 else Config().get("models.llm", "llama3.2:3b")
+    llm = get_llm(model)
+
+    print(f"\nModel: {model}")
+    print("=" * 50)
+
+    print("Unloading model...")
+    unload(llm)
+    cold = timed_query(llm)
+    print(f"❄️  Cold first query:   {cold:.2f}s")
+
+    print("Unloading model, then preloading it...")
+    unload(llm)
+    llm.load_state = "unknown"
+    llm.warmup()
+    print(f"⏳ Preload took:        {llm.load_seconds:.2f}s (off the critical path)")
+    warm = timed_query(llm)
+    print(f"🔥 Warm first query:   {warm:.2f}s")
+
+    steady = timed_query(llm)
+    print(f"📈 Steady-state query: {steady:.2f}s")
+    print("=" * 50)
+    print(f"Warm-up saves {cold - warm:.2f}s on the first wake-word turn\n")
+
+
+if __name__ == "__main__":
+    main()
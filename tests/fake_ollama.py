@@ -0,0 +1,207 @@
+"""Local stand-in for the Ollama HTTP API used by tests."""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional, Union
+
+
+class FakeOllama:
+    """Minimal Ollama-compatible server running on a background thread.
+
+    Replies are either a fixed string or produced by a callable that receives
+    the decoded request body. An optional delay simulates generation time,
+    token_delay the time between streamed tokens, and load_delay the extra
+    time the first request to an unloaded model takes. Setting error_status
+    makes chat requests fail with that HTTP status, like an overloaded server.
+    installed lists the pulled models reported by /api/tags; left as None,
+    /api/tags is not served, like a server that can't say.
+
+    Like Ollama, it remembers the last prompt per model and only counts
+    messages after the shared prefix in prompt_eval_count (one token per word).
+    """
+
+    def __init__(self, reply: Union[str, Callable[[dict], str]] = "Hello from Kai.", delay: float = 0.0,
+                 load_delay: float = 0.0, token_delay: float = 0.0, installed: Optional[list] = None):
+        self.reply = reply
+        self.installed = installed
+        self.delay = delay
+        self.load_delay = load_delay
+        self.token_delay = token_delay
+        self.error_status = None
+        self.loaded = set()
+        self.requests = []
+        self.disconnects = 0
+        self.prompts = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def host(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "FakeOllama":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _load(self, model: str, keep_alive=None):
+        """Simulate Ollama loading (or unloading) a model."""
+        with self._lock:
+            if keep_alive == 0:
+                self.loaded.discard(model)
+                return
+            cold = model not in self.loaded
+            self.loaded.add(model)
+        if cold:
+            time.sleep(self.load_delay)
+
+    def _prefill(self, model: str, messages: list) -> int:
+        """Count prompt tokens not covered by the cached prefix."""
+        with self._lock:
+            cached = self.prompts.get(model, [])
+            shared = 0
+            while shared < min(len(cached), len(messages)) and cached[shared] == messages[shared]:
+                shared += 1
+            self.prompts[model] = messages
+        return sum(len(m.get("content", "").split()) for m in messages[shared:])
+
+    def _reply_for(self, body: dict) -> str:
+        if callable(self.reply):
+            return self.reply(body)
+        return self.reply
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake.requests.append((self.path, body))
+
+                if self.path == "/api/chat" and fake.error_status:
+                    self._send_json({"error": "server busy"}, status=fake.error_status)
+                elif self.path == "/api/chat":
+                    fake._load(body.get("model", ""), body.get("keep_alive"))
+                    self._chat(body)
+                elif self.path == "/api/embed":
+                    texts = body.get("input", [])
+                    texts = [texts] if isinstance(texts, str) else texts
+                    self._send_json({"model": body.get("model", ""), "embeddings": [_embed(t) for t in texts]})
+                elif self.path == "/api/generate":
+                    fake._load(body.get("model", ""), body.get("keep_alive"))
+                    self._send_json({
+                        "model": body.get("model", ""),
+                        "created_at": "2025-01-01T00:00:00Z",
+                        "response": "",
+                        "done": True,
+                        "done_reason": "load",
+                    })
+                else:
+                    self._send_json({"error": f"unknown endpoint {self.path}"}, status=404)
+
+            def do_GET(self):
+                if self.path == "/api/ps":
+                    self._send_json({"models": [{"name": m, "model": m} for m in sorted(fake.loaded)]})
+                elif self.path == "/api/tags" and fake.installed is not None:
+                    self._send_json({"models": [{"name": m, "model": m} for m in fake.installed]})
+                elif self.path == "/api/version":
+                    self._send_json({"version": "0.0.0-fake"})
+                else:
+                    self._send_json({"error": f"unknown endpoint {self.path}"}, status=404)
+
+            def _chat(self, body: dict):
+                time.sleep(fake.delay)
+                text = fake._reply_for(body)
+                model = body.get("model", "")
+                prefill = fake._prefill(model, body.get("messages", []))
+
+                if not body.get("stream", True):
+                    self._send_json(_chat_part(model, text, done=True, prompt_eval_count=prefill))
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                try:
+                    for token in _tokens(text):
+                        self._write_chunk(_chat_part(model, token, done=False))
+                        time.sleep(fake.token_delay)
+                    self._write_chunk(_chat_part(model, "", done=True, prompt_eval_count=prefill))
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client stopped reading, like a cancelled generation
+                    with fake._lock:
+                        fake.disconnects += 1
+                    self.close_connection = True
+
+            def _write_chunk(self, part: dict):
+                data = (json.dumps(part) + "\n").encode()
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, payload: dict, status: int = 200):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+def _embed(text: str, dimensions: int = 64) -> list:
+    """Deterministic bag-of-words embedding: texts sharing words are similar."""
+    vector = [0.0] * dimensions
+    for word in text.lower().split():
+        vector[int(hashlib.md5(word.encode()).hexdigest(), 16) % dimensions] += 1.0
+    return vector
+
+
+def _tokens(text: str) -> list:
+    """Split text into word-level tokens, keeping leading spaces."""
+    words = text.split(" ")
+    return [words[0]] + [" " + word for word in words[1:]]
+
+
+def _chat_part(model: str, content: str, done: bool, prompt_eval_count: int = 0) -> dict:
+    part = {
+        "model": model,
+        "created_at": "2025-01-01T00:00:00Z",
+        "message": {"role": "assistant", "content": content},
+        "done": done,
+    }
+    if done:
+        part.update({
+            "done_reason": "stop",
+            "eval_count": len(content.split()),
+            "prompt_eval_count": prompt_eval_count,
+            "prompt_eval_duration": prompt_eval_count * 1_000_000,
+        })
+    return part
@@ -0,0 +1,133 @@
+"""Local stand-in for an OpenAI-compatible server (llama.cpp server style) used by tests."""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Union
+from tests.fake_ollama import _embed, _tokens
+
+
+class FakeOpenAI:
+    """Minimal /v1 API running on a background thread.
+
+    Replies are a fixed string or produced by a callable receiving the
+    decoded request body. Completions report usage and llama.cpp-style
+    timings; streams send one server-sent event per word. With ``api_key``
+    set, GET requests without the matching bearer token get a 401.
+    """
+
+    def __init__(self, reply: Union[str, Callable[[dict], str]] = "Hello from Kai.", models=("m",),
+                 api_key=None):
+        self.reply = reply
+        self.models = list(models)
+        self.api_key = api_key
+        self.requests = []
+        self._server = None
+
+    @property
+    def host(self) -> str:
+        """Base URL of the running server."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "FakeOpenAI":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                fake.requests.append((self.path, body, self.headers.get("Authorization")))
+
+                if self.path == "/v1/chat/completions":
+                    if body.get("model") not in fake.models:
+                        self._send_json({"error": {"message": "model not found"}}, status=404)
+                    elif body.get("stream"):
+                        self._stream(body)
+                    else:
+                        self._complete(body)
+                elif self.path == "/v1/embeddings":
+                    texts = body.get("input", [])
+                    texts = [texts] if isinstance(texts, str) else texts
+                    data = [{"index": i, "embedding": _embed(text)} for i, text in enumerate(texts)]
+                    self._send_json({"data": list(reversed(data))})
+                else:
+                    self._send_json({"error": {"message": f"unknown endpoint {self.path}"}}, status=404)
+
+            def do_GET(self):
+                if fake.api_key and self.headers.get("Authorization") != f"Bearer {fake.api_key}":
+                    self._send_json({"error": {"message": "invalid api key"}}, status=401)
+                elif self.path == "/v1/models":
+                    self._send_json({"object": "list", "data": [{"id": m, "object": "model"} for m in fake.models]})
+                else:
+                    self._send_json({"error": {"message": f"unknown endpoint {self.path}"}}, status=404)
+
+            def _reply(self, body: dict) -> str:
+                return fake.reply(body) if callable(fake.reply) else fake.reply
+
+            def _usage(self, body: dict, text: str) -> dict:
+                prompt = sum(len(m.get("content", "").split()) for m in body.get("messages", []))
+                completion = len(_tokens(text))
+                return {
+                    "usage": {"prompt_tokens": prompt, "completion_tokens": completion},
+                    "timings": {"prompt_n": prompt, "prompt_ms": 5.0, "predicted_n": completion, "predicted_ms": 50.0},
+                }
+
+            def _complete(self, body: dict):
+                text = self._reply(body)
+                payload = {"choices": [{"index": 0, "message": {"role": "assistant", "content": text}}]}
+                payload.update(self._usage(body, text))
+                self._send_json(payload)
+
+            def _stream(self, body: dict):
+                text = self._reply(body)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for token in _tokens(text):
+                    self._event({"choices": [{"index": 0, "delta": {"content": token}}]})
+                final = {"choices": []}
+                final.update(self._usage(body, text))
+                self._event(final)
+                self._write(b"data: [DONE]\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _event(self, payload: dict):
+                self._write(f"data: {json.dumps(payload)}\n\n".encode())
+
+            def _write(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, payload: dict, status: int = 200):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
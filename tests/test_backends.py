@@ -0,0 +1,143 @@
+"""Tests for the OpenAI-compatible LLM backend."""
+
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.backends import OpenAIClient
+from kai.ai.cache import ResponseCache
+from kai.ai.clients import ClientRegistry
+from kai.ai.llm import LLMEngine
+from kai.core.assistant import Assistant
+from tests.fake_openai import FakeOpenAI
+
+TTLS = {"default": 0, "classify": 3600}
+
+
+def _chat_bodies(server: FakeOpenAI) -> list:
+    return [body for path, body, _ in server.requests if path == "/v1/chat/completions"]
+
+
+def test_chat_translates_profile_and_usage():
+    """Test profiles become OpenAI parameters and usage fills LLMEngine.usage."""
+    with FakeOpenAI(reply="weather") as server:
+        engine = LLMEngine("m", client=OpenAIClient(server.host + "/v1", api_key="secret"))
+        engine.profiles = {"classify": {"num_predict": 8, "temperature": 0, "stop": ["\n"], "num_ctx": 512,
+                                        "format": "enum"}}
+
+        assert engine.generate("rain?", task="classify", choices=["weather", "other"]) == "weather"
+
+        body = _chat_bodies(server)[0]
+        assert body["max_tokens"] == 8
+        assert body["temperature"] == 0
+        assert body["stop"] == ["\n"]
+        assert "num_ctx" not in body
+        assert body["response_format"]["json_schema"]["schema"] == {"type": "string", "enum": ["weather", "other"]}
+        assert server.requests[0][2] == "Bearer secret"
+        assert engine.usage["classify"]["eval_count"] == 1
+        assert engine.usage["classify"]["eval_seconds"] == pytest.approx(0.05)
+
+
+def test_stream_and_performance():
+    """Test server-sent events stream as deltas with a final usage part."""
+    with FakeOpenAI(reply="It is sunny today.") as server:
+        engine = LLMEngine("m", client=OpenAIClient(server.host))
+
+        deltas = list(engine.stream_chat([{"role": "user", "content": "weather?"}], task="answer"))
+
+        assert "".join(deltas) == "It is sunny today."
+        assert len(deltas) == 4
+        assert _chat_bodies(server)[0]["stream_options"] == {"include_usage": True}
+        assert engine.usage["answer"]["eval_count"] == 4
+        assert engine.performance("answer")["tokens_per_second"] == pytest.approx(80.0)
+
+
+@pytest.mark.asyncio
+async def test_async_paths_and_cache(monkeypatch):
+    """Test async chat, streaming and embeddings through the shared registry."""
+    with FakeOpenAI(reply="Hi there") as server:
+        registry = ClientRegistry()
+        registry.set_backend("openai")
+        registry.set_cache(ResponseCache(ttls=TTLS))
+        from kai.ai import llm
+        monkeypatch.setattr(llm, "registry", registry)
+        engine = registry.engine("m", server.host)
+
+        assert await engine.achat([{"role": "user", "content": "hi"}], task="classify") == "Hi there"
+        assert await engine.achat([{"role": "user", "content": "hi"}], task="classify") == "Hi there"
+        assert len(_chat_bodies(server)) == 1
+
+        deltas = [d async for d in engine.astream_chat([{"role": "user", "content": "hi"}])]
+        assert deltas == ["Hi", " there"]
+
+        vectors = await engine.aembed(["one", "two"])
+        assert len(vectors) == 2 and vectors[0] != vectors[1]
+        assert engine.is_loaded()
+        await registry.aclose()
+        registry.close()
+
+
+def test_missing_model_is_an_error_and_fails_over(monkeypatch):
+    """Test a server without the model reports an error and pools move on."""
+    with FakeOpenAI(models=["other"]) as without, FakeOpenAI(reply="found") as with_model:
+        assert LLMEngine("m", client=OpenAIClient(without.host)).generate("hi").startswith("Error")
+
+        from kai.ai import llm
+        registry = ClientRegistry()
+        monkeypatch.setattr(llm, "registry", registry)
+        registry.set_backend("openai")
+        pool = registry.set_hosts([without.host, with_model.host], check_interval=60)
+        try:
+            assert pool.check() == {without.host: True, with_model.host: True}
+            assert registry.engine("m").generate("hi") == "found"
+            assert pool.stats()[without.host]["failovers"] == 1
+            assert pool.stats()[without.host]["healthy"] is True
+        finally:
+            registry.close()
+
+
+def test_health_check_sends_the_api_key():
+    """Test host pool health checks authenticate like the backend client does."""
+    with FakeOpenAI(api_key="secret") as server:
+        registry = ClientRegistry()
+        registry.set_backend("openai", api_key="secret")
+        pool = registry.set_hosts([server.host], check_interval=60)
+        try:
+            assert pool.check() == {server.host: True}
+            registry.set_backend("openai", api_key="wrong")
+            assert pool.check() == {server.host: False}
+        finally:
+            registry.close()
+
+
+@pytest.mark.asyncio
+async def test_assistant_selects_backend_from_config(monkeypatch):
+    """Test models.backend: openai serves a whole turn from an OpenAI-compatible server."""
+    def reply(body):
+        return "general_query" if body.get("max_tokens") == 8 else "From llama.cpp."
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOpenAI(reply=reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "backend": "openai", "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": None}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+        }))
+        monkeypatch.setenv("OPENAI_BASE_URL", server.host)
+
+        from kai.ai import clients, llm
+        registry = ClientRegistry()
+        monkeypatch.setattr(clients, "registry", registry)
+        monkeypatch.setattr(llm, "registry", registry)
+        import kai.core.assistant as assistant_module
+        monkeypatch.setattr(assistant_module, "registry", registry)
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        assert registry.backend == "openai"
+        assert await assistant.async_query("tell me something") == "From llama.cpp."
+        assert len(_chat_bodies(server)) == 2
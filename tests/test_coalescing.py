@@ -0,0 +1,91 @@
+"""Tests for coalescing identical concurrent LLM requests."""
+
+import asyncio
+import threading
+import pytest
+from kai.ai.llm import LLMEngine
+from tests.fake_ollama import FakeOllama
+
+MESSAGES = [{"role": "user", "content": "is rm -rf / safe?"}]
+
+
+def _chats(server: FakeOllama) -> int:
+    return sum(1 for endpoint, _ in server.requests if endpoint == "/api/chat")
+
+
+@pytest.mark.asyncio
+async def test_identical_async_requests_share_one_generation():
+    """Test concurrent identical requests fan out from one model call."""
+    with FakeOllama(reply="dangerous", delay=0.2) as server:
+        engine = LLMEngine("m", host=server.host)
+
+        replies = await asyncio.gather(*(engine.achat(MESSAGES, task="safety") for _ in range(5)))
+
+        assert replies == ["dangerous"] * 5
+        assert _chats(server) == 1
+        assert engine.coalesced == {"safety": 4}
+        assert engine.latency_stats()["safety"]["calls"] == 1
+
+
+def test_identical_requests_from_threads_share_one_generation():
+    """Test callers on different threads (CLI, GUI, daemon) are coalesced too."""
+    with FakeOllama(reply="safe", delay=0.2) as server:
+        engine = LLMEngine("m", host=server.host)
+        replies = []
+        threads = [threading.Thread(target=lambda: replies.append(engine.chat(MESSAGES, task="safety")))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert replies == ["safe"] * 3
+        assert _chats(server) == 1
+        assert engine.coalesced == {"safety": 2}
+
+
+@pytest.mark.asyncio
+async def test_different_requests_are_not_coalesced():
+    """Test messages, options and format all distinguish requests."""
+    with FakeOllama(reply="ok", delay=0.1) as server:
+        engine = LLMEngine("m", host=server.host)
+        engine.profiles = {"classify": {"num_predict": 8}}
+
+        await asyncio.gather(
+            engine.achat(MESSAGES),
+            engine.achat([{"role": "user", "content": "something else"}]),
+            engine.achat(MESSAGES, task="classify"),
+            engine.achat(MESSAGES, format="json"),
+        )
+
+        assert _chats(server) == 4
+        assert engine.coalesced == {}
+
+
+@pytest.mark.asyncio
+async def test_leader_error_reaches_every_waiter():
+    """Test a failed generation is reported to all coalesced callers."""
+    with FakeOllama(delay=0.1) as server:
+        server.error_status = 400
+        engine = LLMEngine("m", host=server.host)
+
+        replies = await asyncio.gather(*(engine.achat(MESSAGES) for _ in range(3)))
+
+        assert all(reply.startswith("Error in chat") for reply in replies)
+        assert _chats(server) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_hands_over_to_a_waiter():
+    """Test waiters send their own request when the shared one is cancelled."""
+    with FakeOllama(reply="answer", delay=0.2) as server:
+        engine = LLMEngine("m", host=server.host)
+
+        leader = asyncio.ensure_future(engine.achat(MESSAGES))
+        await asyncio.sleep(0.05)
+        follower = asyncio.ensure_future(engine.achat(MESSAGES))
+        await asyncio.sleep(0.05)
+        leader.cancel()
+
+        assert await asyncio.wait_for(follower, 2) == "answer"
+        assert _chats(server) == 2
@@ -0,0 +1,132 @@
+"""Tests for the token-budgeted conversation context."""
+
+import threading
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from kai.core.context import MESSAGE_OVERHEAD, ConversationContext, estimate_tokens
+from tests.fake_ollama import FakeOllama
+
+
+def words(n: int) -> str:
+    """Text of n four-character tokens."""
+    return " ".join(["abc"] * n)
+
+
+def test_history_fits_budget():
+    """Test only the newest messages that fit the budget are sent."""
+    context = ConversationContext(budget=100)
+    for i in range(10):
+        context.add_exchange(f"question {i} " + words(10), f"answer {i} " + words(10))
+
+    history, tokens = context.snapshot()
+    assert tokens <= 100
+    assert history[-1]["content"].startswith("answer 9")
+    assert tokens == sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD for m in history)
+
+
+def test_token_counts_cached_per_message():
+    """Test each message is counted once, however often history is read."""
+    counted = []
+
+    def count(text):
+        counted.append(text)
+        return estimate_tokens(text)
+
+    context = ConversationContext(budget=1000, count_tokens=count)
+    context.add_exchange("hello", "hi there")
+    for _ in range(5):
+        context.history()
+    assert counted == ["hello", "hi there"]
+
+
+def test_background_summary_replaces_old_turns():
+    """Test old turns are folded into the summary off the calling thread."""
+    release = threading.Event()
+    calls = []
+
+    def summarizer(summary, messages):
+        calls.append((summary, [m["content"] for m in messages]))
+        release.wait(5)
+        return "the user is called Sam"
+
+    context = ConversationContext(budget=60, summarizer=summarizer)
+    for i in range(4):
+        context.add_exchange(f"q{i} " + words(5), f"a{i} " + words(5))
+
+    # Adding messages never waits for the summarizer
+    assert calls and not context.summary
+    assert context.tokens() <= 60
+
+    release.set()
+    context.wait(5)
+    assert calls[0][1][0].startswith("q0")
+
+    history = context.history()
+    assert history[0]["role"] == "system"
+    assert "Sam" in history[0]["content"]
+    assert context.stats["compactions"] == 1
+    assert all(not m["content"].startswith("q0") for m in context.messages())
+
+
+def test_drops_without_summarizer():
+    """Test old messages are dropped when summaries are disabled."""
+    context = ConversationContext(budget=40)
+    for i in range(6):
+        context.add_exchange(f"q{i} " + words(5), f"a{i} " + words(5))
+
+    assert context.stats["dropped_messages"] > 0
+    assert context.messages()[-1]["content"].startswith("a5")
+    assert not context.summary
+
+
+def test_failed_summary_keeps_messages():
+    """Test a failing summarizer leaves history intact."""
+    def summarizer(summary, messages):
+        raise RuntimeError("model unavailable")
+
+    context = ConversationContext(budget=40, summarizer=summarizer)
+    for i in range(3):
+        context.add_exchange(f"q{i} " + words(5), f"a{i} " + words(5))
+    context.wait(5)
+
+    assert context.stats["failures"] >= 1
+    assert context.messages()[0]["content"].startswith("q0")
+
+
+@pytest.mark.asyncio
+async def test_assistant_reports_prompt_tokens(monkeypatch):
+    """Test the assistant sends budgeted history and reports its size."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply="Sure " + words(30)) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "context": {"budget": {"default": 120}, "summarize": False},
+            "plugins": {"enabled": ["general_query"]},
+            "intents": {"classifier": "llm"},
+            "cache": {"enabled": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        for i in range(4):
+            await assistant.async_query(f"what is thing number {i}")
+            assert 0 < assistant.prompt_tokens <= 120 + 20
+
+        answers = [body for endpoint, body in server.requests
+                   if endpoint == "/api/chat" and body["messages"][0]["content"].startswith("You are Kai")]
+        history_tokens = sum(
+            estimate_tokens(m["content"]) + MESSAGE_OVERHEAD for m in answers[-1]["messages"][1:-1]
+        )
+        assert history_tokens <= 120
+
+        await clients.registry.aclose()
@@ -0,0 +1,187 @@
+"""Tests for the Kai daemon and its thin client."""
+
+import asyncio
+import socket
+import tempfile
+import threading
+import time
+import pytest
+import yaml
+from pathlib import Path
+from click.testing import CliRunner
+from kai.ai.clients import ClientRegistry
+from kai.cli import main
+from kai.core.assistant import Assistant
+from kai.core.daemon import DaemonClient, DaemonError, KaiDaemon
+from tests.fake_ollama import FakeOllama
+
+ANSWER = "The daemon is warm. It remembers you."
+
+
+def _reply(body):
+    return "general_query" if body.get("options", {}).get("num_predict") == 8 else ANSWER
+
+
+@pytest.fixture
+def daemon(monkeypatch):
+    """Run a daemon on a temporary socket, backed by a fake Ollama server."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply, token_delay=0.01) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": None}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+            "context": {"summarize": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients, llm
+        import kai.core.assistant as assistant_module
+        registry = ClientRegistry()
+        monkeypatch.setattr(clients, "registry", registry)
+        monkeypatch.setattr(llm, "registry", registry)
+        monkeypatch.setattr(assistant_module, "registry", registry)
+
+        assistant = Assistant(str(config_path))
+        kai_daemon = KaiDaemon(assistant, str(Path(tmpdir) / "kai.sock"))
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_until_complete, args=(kai_daemon.serve_forever(),))
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not DaemonClient.is_running(kai_daemon.path):
+            assert time.monotonic() < deadline, "daemon did not start"
+            time.sleep(0.01)
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        kai_daemon.server = server
+        try:
+            yield kai_daemon
+        finally:
+            loop.call_soon_threadsafe(kai_daemon.stop)
+            thread.join(5)
+            loop.close()
+            registry.close()
+
+
+def _answer_requests(server: FakeOllama) -> list:
+    return [body for endpoint, body in server.requests
+            if endpoint == "/api/chat" and body.get("options", {}).get("num_predict") != 8]
+
+
+def test_streams_response_and_keeps_history_across_clients(daemon):
+    """Test queries stream token by token and later clients see earlier turns."""
+    with DaemonClient.connect(daemon.path) as client:
+        stream = client.query("are you warm?")
+        deltas = list(stream)
+
+        assert "".join(deltas) == ANSWER
+        assert len(deltas) > 1
+        assert stream.text == ANSWER
+        assert stream.time_to_first_token is not None
+        assert stream.prompt_tokens > 0
+
+    with DaemonClient.connect(daemon.path) as client:
+        assert "".join(client.query("do you remember?")) == ANSWER
+        assert client.stats()["routes"]["answer"]["calls"] == 2
+
+        messages = _answer_requests(daemon.server)[-1]["messages"]
+        assert any(message["content"] == "are you warm?" for message in messages)
+
+        client.clear_history()
+        assert daemon.assistant.get_history() == []
+
+    assert daemon.stats["connections"] >= 2
+    assert daemon.stats["queries"] == 2
+
+
+def test_no_daemon_means_in_process_fallback():
+    """Test connecting without a daemon, or to a stale socket file, returns None."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "kai.sock")
+        assert DaemonClient.connect(path) is None
+
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        assert Path(path).exists()
+        assert DaemonClient.connect(path) is None
+        assert not DaemonClient.is_running(path)
+
+
+def test_second_daemon_refuses_a_live_socket(daemon):
+    """Test a daemon never steals the socket of one that is running."""
+    other = KaiDaemon(daemon.assistant, daemon.path)
+    with pytest.raises(RuntimeError, match="already listening"):
+        asyncio.run(other.start())
+    assert DaemonClient.is_running(daemon.path)
+
+
+def test_disconnecting_client_stops_generation(daemon):
+    """Test the daemon stops generating when the client hangs up mid-stream."""
+    daemon.server.reply = lambda body: (
+        "general_query" if body.get("options", {}).get("num_predict") == 8
+        else " ".join(f"word{i}" for i in range(200))
+    )
+    client = DaemonClient.connect(daemon.path)
+    stream = iter(client.query("talk for a while"))
+    next(stream)
+    client.close()
+
+    deadline = time.monotonic() + 3
+    while daemon.server.disconnects == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert daemon.server.disconnects >= 1
+
+    with DaemonClient.connect(daemon.path) as client:
+        assert client.stats()["routes"]
+
+
+def test_failed_stream_frees_the_session(daemon, monkeypatch):
+    """Test an error mid-stream closes the stream so the session's next query is not blocked."""
+    send = daemon._send
+
+    async def failing_send(writer, message):
+        if "delta" in message:
+            raise ValueError("bad payload")
+        await send(writer, message)
+
+    monkeypatch.setattr(daemon, "_send", failing_send)
+    with DaemonClient.connect(daemon.path) as client:
+        with pytest.raises(DaemonError, match="bad payload"):
+            list(client.query("first"))
+        monkeypatch.setattr(daemon, "_send", send)
+        assert "".join(client.query("second")) == ANSWER
+    assert daemon.stats["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_idle_sessions_are_swept_on_a_timer(monkeypatch):
+    """Test the daemon evicts idle sessions even when no new session is created."""
+    from kai.core import daemon as daemon_module
+    from kai.core.context import ConversationContext
+    from kai.core.session import SessionManager
+
+    class StubAssistant:
+        sessions = SessionManager(ConversationContext, idle_timeout=0.05)
+
+    monkeypatch.setattr(daemon_module, "SESSION_SWEEP_INTERVAL", 0.02)
+    sessions = StubAssistant.sessions
+    sessions.get("client-1")
+    sweeper = asyncio.create_task(KaiDaemon(StubAssistant())._sweep_sessions())
+    await asyncio.sleep(0.2)
+    sweeper.cancel()
+    assert sessions.evicted == 1
+    assert len(sessions) == 0
+
+
+def test_cli_query_uses_running_daemon(daemon):
+    """Test kai query prints the streamed answer from the daemon."""
+    result = CliRunner().invoke(main, ["query", "--socket", daemon.path, "are", "you", "there?"])
+
+    assert result.exit_code == 0, result.output
+    assert ANSWER in result.output
+    assert "first token" in result.output
+    assert daemon.stats["queries"] == 1
@@ -0,0 +1,120 @@
+"""Tests for spreading requests over several Ollama hosts."""
+
+import asyncio
+import pytest
+from kai.ai.clients import ClientRegistry
+from kai.ai.hosts import HostPool
+from kai.ai.llm import LLMEngine
+from tests.fake_ollama import FakeOllama
+
+
+def _dead_host() -> str:
+    """URL of a port nothing listens on any more."""
+    server = FakeOllama().start()
+    host = server.host
+    server.stop()
+    return host
+
+
+def _chats(server: FakeOllama) -> int:
+    return sum(1 for endpoint, _ in server.requests if endpoint == "/api/chat")
+
+
+def test_prefers_lowest_latency_host():
+    """Test every host is sampled once, then the faster one takes the traffic."""
+    with FakeOllama(reply="fast") as fast, FakeOllama(reply="slow", delay=0.3) as slow:
+        engine = LLMEngine("m")
+        engine.pool = HostPool([slow.host, fast.host])
+
+        replies = [engine.generate("hi") for _ in range(6)]
+
+        assert replies.count("slow") == 1
+        assert _chats(slow) == 1
+        assert _chats(fast) == 5
+        stats = engine.pool.stats()
+        assert stats[slow.host]["latency"] > stats[fast.host]["latency"]
+        assert stats[fast.host]["requests"] == 5
+
+
+def test_fails_over_from_unreachable_host():
+    """Test a refused connection moves the request on and marks the host down."""
+    dead = _dead_host()
+    with FakeOllama(reply="up") as live:
+        engine = LLMEngine("m")
+        engine.pool = HostPool([dead, live.host])
+
+        assert engine.generate("hi") == "up"
+        assert engine.generate("again") == "up"
+
+        stats = engine.pool.stats()
+        assert stats[dead]["healthy"] is False
+        assert stats[dead]["failures"] == 1  # Down hosts are tried last, not again
+        assert stats[live.host]["requests"] == 2
+        assert engine.pool.candidates() == [live.host, dead]
+
+
+def test_fails_over_on_server_error_and_stream():
+    """Test 5xx responses fail over, including before the first streamed token."""
+    with FakeOllama(reply="busy") as busy, FakeOllama(reply="spare reply") as spare:
+        busy.error_status = 503
+        engine = LLMEngine("m")
+        engine.pool = HostPool([busy.host, spare.host])
+
+        assert "".join(engine.stream_chat([{"role": "user", "content": "hi"}])) == "spare reply"
+        assert engine.pool.stats()[busy.host]["failovers"] == 1
+        assert engine.performance(None)["samples"] == 1
+
+
+def test_client_errors_do_not_fail_over():
+    """Test errors that would repeat on every host are reported, not retried."""
+    with FakeOllama() as first, FakeOllama() as second:
+        first.error_status = second.error_status = 400
+        engine = LLMEngine("m")
+        engine.pool = HostPool([first.host, second.host])
+
+        assert engine.generate("hi").startswith("Error generating response")
+        assert _chats(first) + _chats(second) == 1
+        assert all(stats["healthy"] for stats in engine.pool.stats().values())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_spread_by_in_flight_count():
+    """Test concurrent requests go to the host with fewer requests in flight."""
+    with FakeOllama(reply="a", delay=0.2) as a, FakeOllama(reply="b", delay=0.2) as b:
+        engine = LLMEngine("m")
+        engine.pool = HostPool([a.host, b.host])
+
+        replies = await asyncio.gather(*(engine.agenerate(f"q{i}") for i in range(4)))
+
+        assert sorted(replies) == ["a", "a", "b", "b"]
+        assert all(stats["in_flight"] == 0 for stats in engine.pool.stats().values())
+
+
+def test_health_check_marks_hosts_down_and_back_up():
+    """Test health checks take dead hosts out and bring recovered ones back."""
+    dead = _dead_host()
+    with FakeOllama() as live:
+        pool = HostPool([dead, live.host], check_timeout=1.0)
+        pool.record_error(live.host, ConnectionError("blip"))
+        assert pool.stats()[live.host]["healthy"] is False
+
+        assert pool.check() == {dead: False, live.host: True}
+        stats = pool.stats()
+        assert stats[live.host]["healthy"] is True
+        assert stats[dead]["healthy"] is False
+
+
+def test_registry_attaches_pool_to_default_host_engines():
+    """Test set_hosts pools engines without an explicit host, old and new."""
+    registry = ClientRegistry()
+    before = registry.engine("m")
+    pinned = registry.engine("m", "http://127.0.0.1:1")
+
+    pool = registry.set_hosts(["http://127.0.0.1:2", "http://127.0.0.1:3"], check_interval=60)
+    try:
+        assert before.pool is pool
+        assert registry.engine("other").pool is pool
+        assert pinned.pool is None
+    finally:
+        registry.set_hosts(None)
+    assert before.pool is None
@@ -0,0 +1,82 @@
+"""Tests for the embedding-based intent classifier."""
+
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.config import Config
+from kai.core.exemplars import ExemplarIndex
+from kai.core.intent import IntentRecognizer
+from tests.fake_ollama import FakeOllama
+
+
+EXEMPLARS = {
+    "launch_app": ["open firefox", "launch the terminal"],
+    "install_package": ["install vim", "set up the docker package"],
+    "general_query": ["what is linux", "tell me a joke"],
+}
+
+
+@pytest.mark.asyncio
+async def test_classify_nearest_exemplar():
+    """Test utterances map to the intent of their nearest exemplar."""
+    registry = ClientRegistry()
+
+    with FakeOllama() as server:
+        index = ExemplarIndex(registry.engine("nomic-embed-text", server.host))
+        assert await index.build(EXEMPLARS) == 6
+
+        name, score = await index.classify("please launch the browser")
+        assert name == "launch_app"
+        assert 0.0 < score <= 1.0
+
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_incremental_rebuild_from_disk():
+    """Test a reloaded index only embeds new exemplars."""
+    registry = ClientRegistry()
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama() as server:
+        path = Path(tmpdir) / "intent_index.npz"
+        embedder = registry.engine("nomic-embed-text", server.host)
+        await ExemplarIndex(embedder, path).build(EXEMPLARS)
+
+        exemplars = dict(EXEMPLARS, close_app=["close firefox"])
+        index = ExemplarIndex(embedder, path)
+        assert await index.build(exemplars) == 1
+        assert await index.build(exemplars) == 0
+
+        embed_calls = [body for endpoint, body in server.requests if endpoint == "/api/embed"]
+        assert embed_calls[-1]["input"] == ["close firefox"]
+
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_recognizer_uses_embedding_classifier(monkeypatch):
+    """Test the recognizer answers from the index when selected in config."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama() as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({"intents": {"classifier": "embedding", "fast_path": False}}))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        recognizer = IntentRecognizer(Config(str(config_path)))
+        recognizer.exemplars = {intent: list(texts) for intent, texts in EXEMPLARS.items()}
+        await recognizer.prepare()
+
+        async def no_llm(text):
+            raise AssertionError("LLM should not be called")
+
+        monkeypatch.setattr(recognizer, "_recognize_with_llm", no_llm)
+
+        intent = await recognizer.recognize("install the vim editor")
+        assert intent.name == "install_package"
+        assert (Path(tmpdir) / "intent_index.npz").exists()
+
+        await clients.registry.aclose()
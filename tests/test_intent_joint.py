@@ -0,0 +1,83 @@
+"""Tests for joint intent, entity and answer recognition."""
+
+import json
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.config import Config
+from kai.core.intent import IntentRecognizer
+from kai.plugins.general_query.plugin import GeneralQueryPlugin
+from tests.fake_ollama import FakeOllama
+
+
+def joint_reply(body: dict) -> str:
+    """Answer like a model constrained to the joint schema."""
+    assert body["format"]["properties"]["intent"]["enum"]
+    text = body["messages"][-1]["content"].lower()
+    if "htop" in text:
+        return json.dumps({"intent": "install_package", "app": None, "package": "htop", "command": None, "answer": None})
+    if "nonsense" in text:
+        return "not json"
+    return json.dumps({"intent": "general_query", "app": None, "package": None, "command": None,
+                       "answer": "Linux is an open source operating system."})
+
+
+@pytest.fixture
+def joint_recognizer(monkeypatch):
+    """Recognizer in joint mode with the rule fast path off, against a fake server."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=joint_reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({"intents": {"joint": True, "fast_path": False}}))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        yield IntentRecognizer(Config(str(config_path))), server
+
+
+@pytest.mark.asyncio
+async def test_joint_answer_needs_single_call(joint_recognizer):
+    """Test a general query is classified and answered by one chat request."""
+    recognizer, server = joint_recognizer
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "Hello!"}]
+
+    intent = await recognizer.recognize("so what is linux anyway", history)
+    assert intent.name == "general_query"
+    assert recognizer.stats["joint"] == 1
+
+    response = await GeneralQueryPlugin().handle_intent_with_history(intent, history)
+    assert response == "Linux is an open source operating system."
+
+    chats = [body for endpoint, body in server.requests if endpoint == "/api/chat"]
+    assert len(chats) == 1
+    assert chats[0]["messages"][1:3] == history
+
+
+@pytest.mark.asyncio
+async def test_joint_extracts_entities(joint_recognizer):
+    """Test command intents carry their entities and no answer."""
+    recognizer, _ = joint_recognizer
+
+    intent = await recognizer.recognize("could you get me htop")
+    assert intent.name == "install_package"
+    assert intent.entities == {"package": "htop"}
+
+
+@pytest.mark.asyncio
+async def test_invalid_joint_reply_falls_back(joint_recognizer, monkeypatch):
+    """Test an unparseable reply falls through to the classifier."""
+    recognizer, _ = joint_recognizer
+
+    async def classify(text):
+        from kai.core.intent import Intent
+        return Intent(name="general_query", confidence=0.8, entities={}, raw_text=text)
+
+    monkeypatch.setattr(recognizer, "_recognize_with_llm", classify)
+
+    intent = await recognizer.recognize("nonsense words")
+    assert intent.name == "general_query"
+    assert "answer" not in intent.entities
+    assert recognizer.stats["joint"] == 0
@@ -0,0 +1,87 @@
+"""Tests for the rule-based intent fast path."""
+
+import pytest
+import subprocess
+import tempfile
+from pathlib import Path
+from kai.core.config import Config
+from kai.core.intent import IntentRecognizer
+from kai.plugins.command_executor import plugin as command_executor
+from kai.plugins.system_control import plugin as system_control
+
+
+@pytest.fixture
+def recognizer():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        recognizer = IntentRecognizer(Config(str(Path(tmpdir) / "config.yaml")))
+        recognizer.register_plugins([system_control, command_executor])
+        yield recognizer
+
+
+@pytest.mark.parametrize("text, name, entities", [
+    ("open firefox", "launch_app", {"app": "firefox"}),
+    ("Please open the terminal app.", "launch_app", {"app": "terminal"}),
+    ("close firefox", "close_app", {"app": "firefox"}),
+    ("install htop", "install_package", {"package": "htop"}),
+    ("sudo apt install vim", "install_package", {"package": "vim"}),
+    ("execute ls -la", "execute_command", {}),
+    ("What is Linux?", "general_query", {}),
+])
+def test_unambiguous_rules(recognizer, text, name, entities):
+    """Test unambiguous utterances clear the fast-path threshold."""
+    match = recognizer.rules.match(text)
+
+    assert match.name == name
+    assert match.entities == entities
+    assert match.confidence >= recognizer.fast_path_threshold
+
+
+@pytest.mark.parametrize("text", [
+    "how do I install vim",
+    "install vim and open firefox",
+    "can you open the file I downloaded yesterday",
+    "I would like to get some coffee later",
+    "get started",
+    "kill 1234",
+])
+def test_ambiguous_rules_defer_to_llm(recognizer, text):
+    """Test ambiguous utterances stay below the fast-path threshold."""
+    match = recognizer.rules.match(text)
+
+    assert match is None or match.confidence < recognizer.fast_path_threshold
+
+
+@pytest.mark.asyncio
+async def test_fast_path_skips_llm(recognizer, monkeypatch):
+    """Test fast-path turns never call the LLM and are counted."""
+    async def no_llm(text):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr(recognizer, "_recognize_with_llm", no_llm)
+
+    intent = await recognizer.recognize("open firefox")
+
+    assert intent.name == "launch_app"
+    assert intent.entities == {"app": "firefox"}
+    assert recognizer.fast_path_stats()["fast_path_fraction"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_fast_path_command_keeps_the_users_case(recognizer, monkeypatch):
+    """Test a fast-path command runs exactly as said, not as the normalized text the rules match."""
+    from kai.ai import routing
+
+    def no_model(task, config):
+        raise RuntimeError("no safety model")
+
+    ran = []
+    monkeypatch.setattr(routing, "get_llm_for", no_model)
+    monkeypatch.setattr(subprocess, "run",
+                        lambda command, **kwargs: ran.append(command) or subprocess.CompletedProcess(command, 0, "", ""))
+    monkeypatch.setattr(recognizer, "_recognize_with_llm", None)
+
+    intent = await recognizer.recognize("Execute ls /Home/User/Docs!")
+
+    assert intent.name == "execute_command"
+    assert await command_executor.handle_intent(intent) == "Command executed successfully."
+    assert ran == ["ls /Home/User/Docs!"]
@@ -0,0 +1,141 @@
+"""Tests for latency percentiles from recorded traces."""
+
+import json
+import random
+import tempfile
+from pathlib import Path
+from click.testing import CliRunner
+from kai.cli import main
+from kai.core.latency import P2Quantile, _offset_of, latency_report, parse_window, read_traces
+from kai.core.tracing import Tracer
+
+DAY = 86400.0
+
+
+def _turn(tracer: Tracer, intent: str, model: str, stt: float, classify: float, ttft: float,
+          total: float, first_audio: float = None) -> dict:
+    """Build a voice turn the way the pipeline and LLMEngine trace it."""
+    start = 1000.0
+    turn = tracer.start("turn", start=start, intent=intent)
+    tracer.record("stt", start, start + stt, parent=turn)
+    tracer.record("intent.recognize", start + stt, start + stt + classify, parent=turn)
+    tracer.record("llm", start + stt, start + stt + classify, parent=turn, task="classify", model="tiny", ttft=0.01)
+    tracer.record("llm", start + stt + classify, start + total, parent=turn, task="answer", model=model, ttft=ttft)
+    if first_audio is not None:
+        turn.set(first_audio=first_audio)
+    turn.finish(start + total)
+    return tracer.recent[-1]
+
+
+def test_p2_estimates_track_exact_percentiles():
+    """Test the streaming estimates stay close to exact percentiles of a skewed distribution."""
+    rng = random.Random(7)
+    samples = [rng.lognormvariate(0, 0.6) for _ in range(20000)]
+    ordered = sorted(samples)
+
+    for q, tolerance in ((0.5, 0.03), (0.9, 0.05), (0.99, 0.1)):
+        estimator = P2Quantile(q)
+        for sample in samples:
+            estimator.add(sample)
+        exact = ordered[int(q * len(ordered))]
+        assert abs(estimator.value - exact) / exact < tolerance, (q, estimator.value, exact)
+
+    few = P2Quantile(0.5)
+    for sample in (3.0, 1.0, 2.0):
+        few.add(sample)
+    assert few.value == 2.0
+    assert P2Quantile(0.9).value is None
+
+
+def test_report_breaks_stages_down_by_intent_and_model():
+    """Test each stage is summarized overall, per intent and per answering model."""
+    tracer = Tracer(enabled=True)
+    report_records = [
+        _turn(tracer, "general_query", "llama3.2:3b", stt=0.8, classify=0.2, ttft=0.5, total=3.0, first_audio=1.9),
+        _turn(tracer, "general_query", "llama3.2:3b", stt=1.0, classify=0.3, ttft=0.7, total=4.0, first_audio=2.4),
+        _turn(tracer, "system_control", "llama3.2:1b", stt=0.6, classify=0.1, ttft=0.2, total=1.5),
+    ]
+    with tracer.span("wake"):
+        pass
+    report_records.append(tracer.recent[-1])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "traces.jsonl"
+        path.write_text("".join(json.dumps(record) + "\n" for record in report_records) + "not json\n")
+        report = latency_report(path)
+
+    assert report.turns == 3
+    overall = report.summary()["all"]
+    assert list(overall) == ["wake", "stt", "classify", "ttft", "first_audio", "total"]
+    assert overall["stt"]["count"] == 3 and overall["stt"]["p50"] == 0.8
+    assert overall["first_audio"]["count"] == 2
+    assert overall["total"]["max"] == 4.0
+
+    by_intent = report.summary("intent")
+    assert set(by_intent) == {"general_query", "system_control"}
+    assert by_intent["general_query"]["ttft"]["count"] == 2
+    assert "first_audio" not in by_intent["system_control"]
+
+    by_model = report.summary("model")
+    assert set(by_model) == {"llama3.2:3b", "llama3.2:1b"}  # The classifier's model isn't the answer's
+    assert by_model["llama3.2:1b"]["ttft"]["p50"] == 0.2
+
+
+def test_wake_and_listen_outside_a_turn_are_reported():
+    """Test the wake detector and SpeechRecognizer.listen count when traced on their own."""
+    tracer = Tracer(enabled=True)
+    tracer.record("wake", 1000.0, 1000.3, threshold=500.0)
+    with tracer.span("stt.listen", timeout=5):
+        tracer.record("stt.recognize", 1000.4, 1001.0)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "traces.jsonl"
+        path.write_text("".join(json.dumps(record) + "\n" for record in tracer.recent))
+        overall = latency_report(path).summary()["all"]
+
+    assert overall["wake"]["count"] == 1
+    assert overall["stt"]["count"] == 1
+
+
+def test_time_window_seeks_past_older_traces():
+    """Test a window only reads recent lines, found by binary search rather than a full scan."""
+    now = 100 * DAY
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "traces.jsonl"
+        with open(path, "w") as f:
+            for hour in range(24 * 90):
+                timestamp = now - 90 * DAY + hour * 3600
+                f.write(json.dumps({"name": "turn", "timestamp": timestamp, "duration": 1.0,
+                                    "attributes": {}, "spans": []}) + "\n")
+
+        assert latency_report(path, parse_window("7d"), now=now).turns == 24 * 7
+        assert latency_report(path, parse_window("all"), now=now).turns == 24 * 90
+
+        with open(path, "rb") as f:
+            offset = _offset_of(f, now - DAY)
+        assert offset > 0.95 * path.stat().st_size
+        assert all(record["timestamp"] >= now - DAY for record in read_traces(path, now - DAY))
+
+    assert parse_window("30m") == 1800
+    assert parse_window("1.5h") == 5400
+
+
+def test_cli_stats_prints_percentile_tables():
+    """Test kai stats prints stage percentiles and rejects a bad window."""
+    tracer = Tracer(enabled=True)
+    records = [_turn(tracer, "general_query", "m", stt=0.5, classify=0.1, ttft=0.3, total=2.0, first_audio=1.2)
+               for _ in range(3)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "traces.jsonl"
+        path.write_text("".join(json.dumps(record) + "\n" for record in records))
+
+        result = CliRunner().invoke(main, ["stats", "--path", str(path), "--since", "all"])
+        assert result.exit_code == 0, result.output
+        assert "3 turns" in result.output
+        assert "time to first audio" in result.output
+        assert "general_query" in result.output
+        assert "1.20s" in result.output
+
+        result = CliRunner().invoke(main, ["stats", "--path", str(path), "--since", "soon"])
+        assert result.exit_code == 2
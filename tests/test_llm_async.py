@@ -0,0 +1,119 @@
+"""Tests for the native asyncio LLM path."""
+
+import asyncio
+import time
+import pytest
+import tempfile
+from pathlib import Path
+from kai.ai import clients
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from tests.fake_ollama import FakeOllama
+
+
+DELAY = 0.3
+
+
+def reply(body):
+    """Classify everything as a general query, answer everything else."""
+    system = body["messages"][0]["content"]
+    if "intent classifier" in system:
+        return "general_query"
+    return "Concurrent answer."
+
+
+@pytest.mark.asyncio
+async def test_concurrent_achat_overlaps():
+    """Test N concurrent chats take roughly max rather than sum latency."""
+    registry = ClientRegistry()
+    count = 5
+
+    with FakeOllama(reply="Done.", delay=DELAY) as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        messages = [{"role": "user", "content": "hello"}]
+
+        start = time.monotonic()
+        responses = await asyncio.gather(*(llm.achat(messages) for _ in range(count)))
+        elapsed = time.monotonic() - start
+
+        await registry.aclose()
+
+    assert responses == ["Done."] * count
+    assert elapsed < DELAY * count / 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_assistant_queries(monkeypatch):
+    """Test async_query does not block the loop during generation."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply, delay=DELAY) as server:
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        assistant = Assistant(str(Path(tmpdir) / "config.yaml"))
+        await assistant.initialize()
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        # A timer on the same loop must keep ticking while queries run
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.05)
+                ticks += 1
+
+        timer = asyncio.create_task(ticker())
+        count = 4
+        start = time.monotonic()
+        # Turns of one session run in order, so each query gets its own session
+        responses = await asyncio.gather(*(
+            assistant.async_query(f"what is question {i}", session=f"s{i}") for i in range(count)
+        ))
+        elapsed = time.monotonic() - start
+        timer.cancel()
+
+        await clients.registry.aclose()
+
+    assert responses == ["Concurrent answer."] * count
+    # Two sequential round-trips per query (classify, answer), overlapped across queries
+    assert elapsed < 2 * DELAY * count / 2
+    assert ticks >= int(elapsed / 0.05) // 2
+
+
+@pytest.mark.asyncio
+async def test_query_cancellation():
+    """Test an in-flight generation can be cancelled promptly."""
+    registry = ClientRegistry()
+
+    with FakeOllama(reply="Too slow.", delay=2.0) as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        task = asyncio.create_task(llm.agenerate("hello"))
+        await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert time.monotonic() - start < 0.5
+
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_raise_errors_instead_of_error_text():
+    """Test generate/agenerate raise failures on request instead of answering with the error."""
+    import ollama
+
+    registry = ClientRegistry()
+    with FakeOllama(reply="Done.") as server:
+        server.error_status = 404
+        llm = registry.engine("llama3.2:3b", server.host)
+
+        assert (await llm.agenerate("hello")).startswith("Error generating response")
+        with pytest.raises(ollama.ResponseError):
+            await llm.agenerate("hello", raise_errors=True)
+        with pytest.raises(ollama.ResponseError):
+            await asyncio.to_thread(llm.generate, "hello", raise_errors=True)
+
+        await registry.aclose()
+    registry.close()
@@ -0,0 +1,119 @@
+"""Tests for the LLM response cache."""
+
+import asyncio
+import tempfile
+import threading
+import time
+import pytest
+from pathlib import Path
+from kai.ai.cache import ResponseCache
+from kai.ai.clients import ClientRegistry
+from tests.fake_ollama import FakeOllama
+
+
+TTLS = {"default": 0, "classify": 60}
+
+
+def test_memory_lru_eviction():
+    """Test least recently used entries are evicted from memory."""
+    cache = ResponseCache(memory_entries=2, ttls=TTLS)
+
+    cache.put("a", "1", "classify")
+    cache.put("b", "2", "classify")
+    assert cache.get("a") == "1"
+    cache.put("c", "3", "classify")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_expiry_and_disabled_tasks():
+    """Test entries expire and tasks without a TTL are not cached."""
+    cache = ResponseCache(ttls={"classify": 0.05})
+
+    cache.put("a", "1", "classify")
+    cache.put("b", "2", "answer")
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+
+    time.sleep(0.1)
+    assert cache.get("a") is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_disk_tier_survives_restart():
+    """Test responses persist in SQLite and the disk tier is size-limited."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "cache.db")
+        cache = ResponseCache(path=path, disk_entries=2, ttls=TTLS)
+        for key in ("a", "b", "c"):
+            cache.put(key, key.upper(), "classify")
+        cache.close()
+
+        reopened = ResponseCache(path=path, ttls=TTLS)
+        assert reopened.get("a") is None
+        assert reopened.get("c") == "C"
+
+        stats = reopened.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["disk_entries"] == 2
+        assert stats["total_evictions"] == 1
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_async_disk_access_stays_off_the_event_loop():
+    """Test aget/aput reach SQLite on other threads and hit access times are written in batches."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = str(Path(tmpdir) / "cache.db")
+        cache = ResponseCache(path=path, memory_entries=1, ttls=TTLS)
+        loop_thread = threading.get_ident()
+        db_threads = set()
+        cache._db.set_trace_callback(lambda statement: db_threads.add(threading.get_ident()))
+
+        cache.aput("a", "A", "classify")
+        cache.aput("b", "B", "classify")  # Pushes "a" out of the memory tier
+        await asyncio.to_thread(cache._writer.submit(lambda: None).result)
+        assert await cache.aget("a") == "A"
+        assert await cache.aget("missing") is None
+        assert db_threads and loop_thread not in db_threads
+        assert list(cache._touched) == ["a"]  # Written with the next write, not per hit
+
+        cache.close()
+        reopened = ResponseCache(path=path, ttls=TTLS)
+        assert reopened.stats()["total_disk_hits"] == 1
+        reopened.close()
+
+
+def test_replaced_cache_is_closed():
+    """Test installing a new cache closes the one it replaces."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        registry = ClientRegistry()
+        first = ResponseCache(path=str(Path(tmpdir) / "cache.db"), ttls=TTLS)
+        registry.set_cache(first)
+        registry.set_cache(first)
+        assert first._db is not None
+
+        registry.set_cache(ResponseCache(ttls=TTLS))
+        assert first._db is None
+        registry.close()
+
+
+def test_engine_serves_repeats_from_cache():
+    """Test repeated task calls hit Ollama once, untagged calls every time."""
+    registry = ClientRegistry()
+    registry.set_cache(ResponseCache(ttls=TTLS))
+
+    with FakeOllama(reply="install_package") as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        for _ in range(3):
+            assert llm.generate("install vim", task="classify") == "install_package"
+        llm.generate("install vim")
+
+        assert len(server.requests) == 2
+
+    stats = registry.cache.stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+    registry.close()
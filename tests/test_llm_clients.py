@@ -0,0 +1,38 @@
+"""Tests for the shared LLM client registry."""
+
+from kai.ai.clients import ClientRegistry
+from tests.fake_ollama import FakeOllama
+
+
+def test_engine_shared_per_model():
+    """Test engines and clients are shared per model and host."""
+    registry = ClientRegistry()
+
+    first = registry.engine("llama3.2:3b", "http://127.0.0.1:1")
+    second = registry.engine("llama3.2:3b", "http://127.0.0.1:1")
+    other = registry.engine("llama3.2:1b", "http://127.0.0.1:1")
+
+    assert first is second
+    assert other is not first
+    assert other.client is first.client
+
+    stats = registry.stats()
+    assert stats["clients_created"] == 1
+    assert stats["engines_created"] == 2
+    assert stats["engines_reused"] == 1
+
+
+def test_keepalive_connection_reused():
+    """Test consecutive requests reuse one keep-alive connection."""
+    registry = ClientRegistry()
+
+    with FakeOllama(reply="general_query") as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        for _ in range(3):
+            assert llm.generate("hello") == "general_query"
+
+    stats = registry.stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+    registry.close()
@@ -0,0 +1,76 @@
+"""Tests for per-task generation profiles."""
+
+import pytest
+from kai.ai.clients import ClientRegistry
+from kai.core.config import Config
+from tests.fake_ollama import FakeOllama
+
+
+PROFILES = {
+    "classify": {"num_predict": 8, "temperature": 0.0, "stop": ["\n"], "format": "enum"},
+    "answer": {"num_predict": 200, "num_ctx": None},
+}
+
+
+def chat_bodies(server):
+    return [body for endpoint, body in server.requests if endpoint == "/api/chat"]
+
+
+@pytest.mark.asyncio
+async def test_profile_options_and_enum_format():
+    """Test a task's profile is sent to Ollama and enum answers are unwrapped."""
+    registry = ClientRegistry()
+    registry.set_profiles(PROFILES)
+
+    with FakeOllama(reply='"general_query"') as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        result = await llm.agenerate("what is linux", task="classify", choices=["general_query", "launch_app"])
+
+        assert result == "general_query"
+        body = chat_bodies(server)[-1]
+        assert body["options"] == {"num_predict": 8, "temperature": 0.0, "stop": ["\n"]}
+        assert body["format"] == {"type": "string", "enum": ["general_query", "launch_app"]}
+
+        await registry.aclose()
+
+
+def test_calls_without_profile_use_defaults():
+    """Test untasked calls send no options and explicit formats win."""
+    registry = ClientRegistry()
+    registry.set_profiles(PROFILES)
+
+    with FakeOllama(reply='{"a": 1}') as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        llm.generate("hello")
+        llm.chat([{"role": "user", "content": "hi"}], task="classify", format="json")
+
+        untasked, explicit = chat_bodies(server)
+        assert "options" not in untasked and "format" not in untasked
+        assert explicit["format"] == "json"
+        assert explicit["options"]["num_predict"] == 8
+
+        registry.close()
+
+
+@pytest.mark.asyncio
+async def test_streams_use_profile_and_profiles_propagate():
+    """Test streaming calls apply the profile, including one set after creation."""
+    registry = ClientRegistry()
+
+    with FakeOllama(reply="Hi there.") as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        registry.set_profiles(PROFILES)
+
+        chunks = [chunk async for chunk in llm.astream_chat([{"role": "user", "content": "hi"}], task="answer")]
+        assert "".join(chunks) == "Hi there."
+        assert chat_bodies(server)[-1]["options"] == {"num_predict": 200}
+
+        await registry.aclose()
+
+
+def test_default_profiles_keep_short_tasks_short():
+    """Test the shipped profiles cap one-word tasks at a few tokens."""
+    profiles = Config.DEFAULT_CONFIG["profiles"]
+    for task in ["classify", "extract", "safety"]:
+        assert profiles[task]["num_predict"] <= 12
+        assert profiles[task]["temperature"] == 0.0
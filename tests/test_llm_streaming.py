@@ -0,0 +1,81 @@
+"""Tests for streamed LLM responses."""
+
+import pytest
+import tempfile
+from pathlib import Path
+from kai.ai.llm import LLMEngine
+from kai.core.config import Config
+from kai.core.intent import Intent
+from kai.core.streaming import ResponseStream, iter_sentences, single_chunk
+from kai.plugins.manager import PluginManager
+from tests.fake_ollama import FakeOllama
+
+
+class FakeClient:
+    """Stand-in for ollama.Client that streams fixed tokens."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def chat(self, model, messages, stream=False, **kwargs):
+        if stream:
+            return iter({"message": {"content": token}} for token in self.tokens)
+        return {"message": {"content": "".join(self.tokens)}}
+
+
+def test_iter_sentences():
+    """Test grouping token deltas into sentences."""
+    deltas = ["Hel", "lo there", ". How", " are you?", " Fine"]
+    assert list(iter_sentences(deltas)) == ["Hello there.", "How are you?", "Fine"]
+
+
+def test_stream_chat_yields_deltas():
+    """Test sync token streaming from LLMEngine."""
+    llm = LLMEngine()
+    llm.client = FakeClient(["Hi", " there", "."])
+
+    assert list(llm.stream_chat([{"role": "user", "content": "hello"}])) == ["Hi", " there", "."]
+
+
+def test_stream_chat_raises_instead_of_yielding_errors():
+    """Test a failure mid-stream raises after the deltas so far, never as text in the answer."""
+    class FailingClient:
+        def chat(self, model, messages, stream=False, **kwargs):
+            yield {"message": {"content": "Partial"}}
+            raise ConnectionError("server went away")
+
+    llm = LLMEngine()
+    llm.client = FailingClient()
+    deltas = []
+
+    with pytest.raises(ConnectionError):
+        for delta in llm.stream_chat([{"role": "user", "content": "hello"}]):
+            deltas.append(delta)
+    assert deltas == ["Partial"]
+
+
+@pytest.mark.asyncio
+async def test_response_stream_records_timing():
+    """Test stream completion callback and time to first token."""
+    completed = []
+    stream = ResponseStream(single_chunk("Done."), on_complete=completed.append)
+
+    assert await stream.collect() == "Done."
+    assert completed == ["Done."]
+    assert stream.time_to_first_token is not None
+
+
+@pytest.mark.asyncio
+async def test_execute_intent_stream(monkeypatch):
+    """Test PluginManager returns a token stream for general queries."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply="Linux is a kernel.") as server:
+        config = Config(str(Path(tmpdir) / "config.yaml"))
+        manager = PluginManager(config)
+        await manager.load_plugins()
+
+        monkeypatch.setattr(manager.plugins["general_query"], "llm", LLMEngine(host=server.host))
+
+        intent = Intent(name="general_query", confidence=0.9, entities={}, raw_text="What is Linux?")
+        chunks = await manager.execute_intent(intent, [], stream=True)
+
+        assert [chunk async for chunk in chunks] == ["Linux", " is", " a", " kernel."]
@@ -0,0 +1,165 @@
+"""Tests for the Prometheus-style metrics exporter."""
+
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import pytest
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core import metrics as metrics_module
+from kai.core.assistant import Assistant
+from kai.core.metrics import CONTENT_TYPE, MetricsExporter, MetricsRegistry, observe_trace
+from kai.core.tracing import Tracer, tracer
+from tests.fake_ollama import FakeOllama
+
+
+def test_render_uses_the_text_exposition_format():
+    """Test counters, cumulative histogram buckets and collector families render as Prometheus expects."""
+    registry = MetricsRegistry()
+    requests = registry.counter("kai_test_total", "Test counter.", ["model"])
+    latency = registry.histogram("kai_test_seconds", "Test histogram.", buckets=(0.1, 1.0))
+    requests.inc(model='say "hi"\n')
+    requests.inc(2, model="m")
+    for value in (0.05, 0.5, 0.5, 3.0):
+        latency.observe(value)
+    assert registry.counter("kai_test_total", "Registered again.") is requests
+
+    text = registry.render([lambda: [("kai_test_gauge", "gauge", "Test gauge.", [({"state": "busy"}, 1.5)])],
+                            lambda: 1 / 0])
+
+    assert text.endswith("\n")
+    lines = text.splitlines()
+    assert lines[:4] == [
+        "# HELP kai_test_total Test counter.",
+        "# TYPE kai_test_total counter",
+        'kai_test_total{model="m"} 2',
+        'kai_test_total{model="say \\"hi\\"\\n"} 1',
+    ]
+    assert 'kai_test_seconds_bucket{le="0.1"} 1' in lines
+    assert 'kai_test_seconds_bucket{le="1"} 3' in lines
+    assert 'kai_test_seconds_bucket{le="+Inf"} 4' in lines
+    assert "kai_test_seconds_sum 4.05" in lines
+    assert "kai_test_seconds_count 4" in lines
+    assert "# TYPE kai_test_gauge gauge" in lines
+    assert 'kai_test_gauge{state="busy"} 1.5' in lines  # The failing collector is skipped
+
+
+def test_traces_update_turn_intent_plugin_llm_tts_and_wake_metrics():
+    """Test observe_trace maps the spans of a finished trace onto the metrics."""
+    local = Tracer(enabled=True)
+    local.subscribe(observe_trace)
+    local.subscribe(observe_trace)  # Idempotent
+    turns = metrics_module.turns.value(intent="general_query", source="voice")
+    intents = metrics_module.intents.value(intent="general_query", method="llm")
+    plugins = metrics_module.plugin_seconds.count(plugin="general_query")
+    answers = metrics_module.llm_requests.value(model="m", task="answer", cached="false")
+    cached = metrics_module.llm_requests.value(model="m", task="classify", cached="true")
+    tokens = metrics_module.llm_tokens.value(model="m")
+    speeds = metrics_module.llm_speed.count(model="m")
+    synthesized = metrics_module.tts_seconds.count()
+    wakes = metrics_module.wake_triggers.value()
+
+    start = time.monotonic()
+    local.record("wake", start - 0.3, start)
+    turn = local.start("turn", start=start, source="voice", intent="general_query")
+    local.record("intent.recognize", start, start + 0.1, parent=turn, intent="general_query", method="llm")
+    local.record("llm", start, start + 0.01, parent=turn, model="m", task="classify", cached=True)
+    local.record("plugin.execute", start + 0.1, start + 1.0, parent=turn, plugin="general_query")
+    local.record("llm", start + 0.1, start + 1.0, parent=turn, model="m", task="answer", cached=False,
+                 ttft=0.2, tokens_per_second=30.0, output_tokens=24)
+    local.record("tts.synthesize", start + 0.5, start + 0.7, parent=turn)
+    turn.finish(start + 1.2, first_audio=0.8)
+
+    assert metrics_module.turns.value(intent="general_query", source="voice") == turns + 1
+    assert metrics_module.intents.value(intent="general_query", method="llm") == intents + 1
+    assert metrics_module.plugin_seconds.count(plugin="general_query") == plugins + 1
+    assert metrics_module.llm_requests.value(model="m", task="answer", cached="false") == answers + 1
+    assert metrics_module.llm_requests.value(model="m", task="classify", cached="true") == cached + 1
+    assert metrics_module.llm_tokens.value(model="m") == tokens + 24
+    assert metrics_module.llm_speed.count(model="m") == speeds + 1  # Cache hits have no speed
+    assert metrics_module.tts_seconds.count() == synthesized + 1
+    assert metrics_module.wake_triggers.value() == wakes + 1
+
+
+def test_exporter_serves_http_and_writes_the_textfile():
+    """Test /metrics is served with the Prometheus content type and the textfile is replaced atomically."""
+    registry = MetricsRegistry()
+    registry.counter("kai_test_total", "Test counter.").inc(3)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        textfile = Path(tmpdir) / "collector" / "kai.prom"
+        exporter = MetricsExporter(port=0, textfile=str(textfile), interval=0.05, registry=registry)
+        exporter.collectors.append(lambda: [("kai_test_up", "gauge", "Test gauge.", [({}, 1)])])
+        exporter.start()
+        try:
+            with urllib.request.urlopen(exporter.address, timeout=5) as response:
+                assert response.headers["Content-Type"] == CONTENT_TYPE
+                body = response.read().decode()
+            assert "kai_test_total 3" in body and "kai_test_up 1" in body
+
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(exporter.address.replace("/metrics", "/other"), timeout=5)
+            assert error.value.code == 404
+
+            registry.counter("kai_test_total", "Test counter.").inc()
+        finally:
+            exporter.stop()
+
+        assert exporter.address is None
+        assert "kai_test_total 4" in textfile.read_text()
+        assert [path.name for path in textfile.parent.iterdir()] == ["kai.prom"]
+
+
+@pytest.mark.asyncio
+async def test_assistant_exports_turn_and_cache_metrics(monkeypatch):
+    """Test an Assistant with metrics enabled counts its turns and reports cache and session state."""
+    def reply(body):
+        return "general_query" if body.get("options", {}).get("num_predict") == 8 else "Measured answer."
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": None}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": True, "persistent": False},
+            "context": {"summarize": False},
+            "metrics": {"enabled": True, "port": None},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients, llm
+        import kai.core.assistant as assistant_module
+        registry = ClientRegistry()
+        monkeypatch.setattr(clients, "registry", registry)
+        monkeypatch.setattr(llm, "registry", registry)
+        monkeypatch.setattr(assistant_module, "registry", registry)
+        # The tracer is process-wide; put it back as found
+        monkeypatch.setattr(tracer, "enabled", tracer.enabled)
+        monkeypatch.setattr(tracer, "path", tracer.path)
+
+        assistant = Assistant(str(config_path))
+        assert tracer.enabled and tracer.path is None  # Spans for metrics, but no trace file
+        await assistant.initialize(preload=False)
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+        turns = metrics_module.turns.value(intent="general_query", source="text")
+        plugins = metrics_module.plugin_seconds.count(plugin="general_query")
+
+        assistant.start_metrics()
+        try:
+            assert await assistant.async_query("first") == "Measured answer."
+            stream = await assistant.async_query("second", stream=True)
+            assert await stream.collect() == "Measured answer."
+            text = assistant.metrics_exporter.render()
+        finally:
+            assistant.stop_metrics()
+
+        assert metrics_module.turns.value(intent="general_query", source="text") == turns + 2
+        assert metrics_module.plugin_seconds.count(plugin="general_query") == plugins + 2
+        assert 'kai_sessions{state="active"} 1' in text
+        assert 'kai_llm_cache_lookups_total{result="miss"}' in text
+        assert "kai_llm_cache_hit_ratio" in text
+        assert not (Path(tmpdir) / "traces.jsonl").exists()
@@ -0,0 +1,60 @@
+"""Tests for prompt-prefix stability across conversation turns."""
+
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry, get_llm
+from kai.core.assistant import Assistant
+from kai.core.context import ConversationContext
+from kai.plugins.general_query.plugin import SYSTEM_PROMPT
+from tests.fake_ollama import FakeOllama
+
+
+def test_window_only_grows_between_jumps():
+    """Test most prompts extend the previous prompt instead of shifting it."""
+    context = ConversationContext(budget=200)
+    previous, shifts = [], 0
+    for i in range(30):
+        context.add_exchange(f"question {i} about something", f"answer {i} with a few more words")
+        history, tokens = context.snapshot()
+        assert tokens <= 200
+        if history[:len(previous)] != previous:
+            shifts += 1
+        previous = history
+
+    # A sliding window would shift on nearly every turn once full
+    assert 0 < shifts <= 6
+
+
+@pytest.mark.asyncio
+async def test_follow_up_turns_only_prefill_new_messages(monkeypatch):
+    """Test the system prompt and earlier turns are not re-evaluated."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply="It is a thing.") as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+        llm = get_llm("llama3.2:3b")
+
+        await assistant.async_query("what is a kernel")
+        first = llm.usage["answer"]["prompt_eval_count"]
+        assert first > len(SYSTEM_PROMPT.split())
+
+        for question in ["what is a shell", "what is a process", "what is a thread"]:
+            await assistant.async_query(question)
+            # Previous answer plus the new question: 4 + 4 words
+            assert llm.usage["answer"]["prompt_eval_count"] == 8
+            assert llm.usage["answer"]["prompt_eval_seconds"] > 0
+
+        await clients.registry.aclose()
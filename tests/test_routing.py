@@ -0,0 +1,128 @@
+"""Tests for task-based model routing."""
+
+import pytest
+import tempfile
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.ai.routing import ModelRouter
+from kai.core.assistant import Assistant
+from tests.fake_ollama import FakeOllama
+
+
+def test_routes_fall_back_to_default():
+    """Test unrouted and None-routed tasks use the default model."""
+    router = ModelRouter("big", {"classify": "small", "extract": "small", "summarize": None})
+
+    assert router.model_for("classify") == "small"
+    assert router.model_for("summarize") == "big"
+    assert router.model_for("answer") == "big"
+    assert router.models() == ["big", "small"]
+
+
+def test_uninstalled_route_falls_back_to_default(monkeypatch):
+    """Test a routed model the server doesn't have is replaced by the default model."""
+    with FakeOllama(installed=["big"]) as server:
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        router = ModelRouter("big", {"classify": "small"})
+        assert router.model_for("classify") == "small"  # Not asked yet
+        assert router.check_installed() == {"big": True, "small": False}
+        assert router.model_for("classify") == "big"
+        assert router.primary_for("classify") == "small"
+
+        server.installed = ["big", "small:latest"]
+        router.check_installed()
+        assert router.model_for("classify") == "small"
+
+        # Routing never asks the server itself
+        def no_probe():
+            raise AssertionError("model_for must not block on the server")
+
+        monkeypatch.setattr(clients.get_llm("small"), "is_installed", no_probe)
+        assert router.model_for("classify") == "small"
+
+
+def test_one_router_per_config():
+    """Test plugins and the assistant share the router of their configuration."""
+    from kai.ai.routing import router_for
+    from kai.core.config import Config
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        config = Config(str(Path(tmpdir) / "config.yaml"))
+        assert router_for(config) is router_for(config)
+        assert router_for(Config(str(Path(tmpdir) / "config.yaml"))) is not router_for(config)
+
+
+@pytest.mark.asyncio
+async def test_safety_check_refuses_unless_explicitly_safe(monkeypatch):
+    """Test a command only runs when the safety model answers exactly "safe"."""
+    from kai.plugins.command_executor.plugin import CommandExecutorPlugin
+
+    verdict = {"reply": "safe"}
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=lambda body: verdict["reply"]) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({"models": {"llm": "m", "routes": {"safety": None}},
+                                          "cache": {"enabled": False}}))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+        from kai.ai import clients
+        from kai.core.config import Config
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        plugin = CommandExecutorPlugin()
+        plugin.config = Config(str(config_path))
+
+        assert await plugin._handle_execute("run command echo hi") == "Command executed. Output: hi"
+
+        verdict["reply"] = "Sorry, I can't tell."
+        assert "dangerous" in await plugin._handle_execute("run command echo hi")
+
+        # An unreachable model falls back to the keyword check instead of running anything unchecked
+        server.error_status = 404
+        assert "dangerous" in await plugin._handle_execute("run command rm -rf /tmp/kai-nothing")
+        assert await plugin._handle_execute("run command echo hi") == "Command executed. Output: hi"
+
+
+@pytest.mark.asyncio
+async def test_assistant_routes_and_preloads_both_models(monkeypatch):
+    """Test classification and answers go to their own models, both kept loaded."""
+    def reply(body):
+        return "general_query" if body["model"] == "small" else "An answer."
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "big", "routes": {"classify": "small", "extract": "small", "safety": "small"}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": "small"}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        assert assistant.resident_models() == ["big", "small"]
+        assistant.warmer.preload(wait=True)
+        assert server.loaded == {"big", "small"}
+
+        assert await assistant.async_query("tell me about the moon") == "An answer."
+
+        models = [body["model"] for endpoint, body in server.requests if endpoint == "/api/chat"]
+        assert models == ["small", "big"]
+
+        stats = assistant.route_stats()
+        assert stats["classify"]["model"] == "small"
+        assert stats["answer"]["model"] == "big"
+        assert stats["classify"]["calls"] == 1
+        assert stats["answer"]["mean_seconds"] > 0
+
+        await clients.registry.aclose()
@@ -0,0 +1,119 @@
+"""Tests for the long-lived event-loop runtime."""
+
+import asyncio
+import tempfile
+import threading
+import time
+import pytest
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from kai.core.runtime import Runtime
+from tests.fake_ollama import FakeOllama
+
+
+def test_submit_from_many_threads_shares_one_loop():
+    """Test coroutines from any thread run concurrently on the same loop."""
+    runtime = Runtime()
+
+    async def which_loop():
+        await asyncio.sleep(0.1)
+        return asyncio.get_running_loop()
+
+    futures = []
+    threads = [threading.Thread(target=lambda: futures.append(runtime.submit(which_loop()))) for _ in range(8)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    loops = {future.result(2) for future in futures}
+
+    assert loops == {runtime.loop}
+    assert time.monotonic() - start < 0.5
+    assert runtime.run(which_loop()) is runtime.loop
+    assert runtime.stats["completed"] == 9
+    assert runtime.shutdown()
+
+
+def test_shutdown_drains_then_cancels_stragglers():
+    """Test shutdown waits for in-flight work, cancels what overruns, and refuses new work."""
+    runtime = Runtime()
+    cleaned = []
+
+    async def work(seconds):
+        await asyncio.sleep(seconds)
+        return seconds
+
+    async def cleanup():
+        cleaned.append(asyncio.get_running_loop())
+
+    quick = runtime.submit(work(0.1))
+    slow = runtime.submit(work(10))
+
+    assert not runtime.shutdown(timeout=0.3, cleanup=cleanup)
+    assert quick.result() == 0.1
+    assert slow.cancelled()
+    assert len(cleaned) == 1
+    assert not runtime.running
+    assert runtime.stats["cancelled"] == 1
+
+    with pytest.raises(RuntimeError, match="shut down"):
+        runtime.submit(work(0))
+
+
+def test_run_on_the_loop_thread_is_refused():
+    """Test a blocking run() from inside the loop fails instead of deadlocking."""
+    runtime = Runtime()
+
+    async def nested():
+        runtime.run(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="runtime loop"):
+        runtime.run(nested(), timeout=2)
+    runtime.shutdown()
+
+
+def test_sync_queries_reuse_loop_and_connections(monkeypatch):
+    """Test query(), stream_query() and submit() share one loop and its pooled connection."""
+    def reply(body):
+        return "general_query" if body.get("options", {}).get("num_predict") == 8 else "Warm answer."
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": None}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+            "context": {"summarize": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients, llm
+        import kai.core.assistant as assistant_module
+        registry = ClientRegistry()
+        monkeypatch.setattr(clients, "registry", registry)
+        monkeypatch.setattr(llm, "registry", registry)
+        monkeypatch.setattr(assistant_module, "registry", registry)
+
+        assistant = Assistant(str(config_path))
+        assistant.start()
+        assistant._model_check.join(5)  # The startup check of installed models uses its own connection
+        before = registry.stats()
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        assert assistant.query("one") == "Warm answer."
+        assert "".join(assistant.stream_query("two")) == "Warm answer."
+        assert assistant.submit("three", session="other").result(5) == "Warm answer."
+
+        stats = registry.stats()
+        assert stats["requests"] - before["requests"] == 6
+        assert stats["connections_opened"] - before["connections_opened"] == 1
+        assert [m["content"] for m in assistant.get_history()] == ["one", "Warm answer.", "two", "Warm answer."]
+
+        assert assistant.shutdown()
+        assert assistant.runtime.stats["submitted"] == 4
@@ -0,0 +1,125 @@
+"""Tests for priority scheduling of LLM requests."""
+
+import asyncio
+import threading
+import time
+import pytest
+from kai.ai.llm import LLMEngine
+from kai.ai.scheduler import BACKGROUND, INTERACTIVE, LLMScheduler
+from tests.fake_ollama import FakeOllama
+
+
+def test_interactive_requests_jump_the_queue():
+    """Test waiting interactive requests are admitted before earlier background ones."""
+    scheduler = LLMScheduler(concurrency=1)
+    held = scheduler.acquire(None, INTERACTIVE)
+    order = []
+
+    def wait(priority):
+        lease = scheduler.acquire(None, priority)
+        order.append(priority)
+        scheduler.release(lease)
+
+    background = threading.Thread(target=wait, args=(BACKGROUND,))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=wait, args=(INTERACTIVE,))
+    interactive.start()
+    time.sleep(0.05)
+
+    assert scheduler.stats()["background"]["waiting"] == 1
+    scheduler.release(held)
+    background.join(1)
+    interactive.join(1)
+
+    assert order == [INTERACTIVE, BACKGROUND]
+    assert scheduler.stats()["background"]["max_wait_seconds"] >= 0.1
+
+
+def test_background_waits_for_interactive_even_with_free_slots():
+    """Test background work never runs alongside a turn on the same server."""
+    scheduler = LLMScheduler(concurrency=4)
+    turn = scheduler.acquire("h", INTERACTIVE)
+    started = threading.Event()
+
+    def background():
+        lease = scheduler.acquire("h", BACKGROUND)
+        started.set()
+        scheduler.release(lease)
+
+    threading.Thread(target=background, daemon=True).start()
+    assert not started.wait(0.1)
+    # Other servers are unaffected
+    other = scheduler.acquire("other", BACKGROUND)
+    scheduler.release(other)
+
+    scheduler.release(turn)
+    assert started.wait(1)
+
+
+def test_interactive_request_preempts_background_generation():
+    """Test a running summary is cut off for a turn, then requeued and finished."""
+    long_reply = " ".join(f"word{i}" for i in range(40))
+
+    def reply(body):
+        return long_reply if body["messages"][-1]["content"] == "summarize" else "Quick answer."
+
+    with FakeOllama(reply=reply, token_delay=0.02) as server:
+        engine = LLMEngine("m", host=server.host)
+        engine.scheduler = LLMScheduler(concurrency=1)
+        summary = {}
+
+        worker = threading.Thread(
+            target=lambda: summary.update(text=engine.chat([{"role": "user", "content": "summarize"}], task="summarize"))
+        )
+        worker.start()
+        time.sleep(0.2)
+
+        start = time.monotonic()
+        assert engine.chat([{"role": "user", "content": "hi"}], task="answer") == "Quick answer."
+        assert time.monotonic() - start < 0.5
+
+        worker.join(5)
+        assert summary["text"] == long_reply
+        assert server.disconnects >= 1
+
+        stats = engine.scheduler.stats()
+        assert stats["background"]["preempted"] == 1
+        assert stats["background"]["requests"] == 2
+        assert engine.latency_stats()["answer"]["last_wait_seconds"] < 0.5
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    """Test a cancelled async waiter neither holds nor leaks a slot."""
+    scheduler = LLMScheduler(concurrency=1)
+    held = await scheduler.aacquire(None)
+
+    waiter = asyncio.ensure_future(scheduler.aacquire(None))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    scheduler.release(held)
+    lease = await asyncio.wait_for(scheduler.aacquire(None, BACKGROUND), 1)
+    scheduler.release(lease)
+    assert scheduler.stats()["interactive"]["running"] == 0
+    assert scheduler.stats()["background"]["running"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_reported_per_task():
+    """Test async calls report the time they queued behind another request."""
+    with FakeOllama(reply="ok", delay=0.2) as server:
+        engine = LLMEngine("m", host=server.host)
+        engine.scheduler = LLMScheduler(concurrency=1)
+
+        await asyncio.gather(
+            engine.achat([{"role": "user", "content": "a"}], task="classify"),
+            engine.achat([{"role": "user", "content": "b"}], task="answer"),
+        )
+
+        waits = sorted(stats["last_wait_seconds"] for stats in engine.latency_stats().values())
+        assert waits[0] < 0.1
+        assert waits[1] >= 0.15
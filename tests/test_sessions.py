@@ -0,0 +1,130 @@
+"""Tests for concurrent conversation sessions."""
+
+import asyncio
+import tempfile
+import time
+import pytest
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from kai.core.context import ConversationContext
+from kai.core.session import DEFAULT_SESSION, SessionManager
+from tests.fake_ollama import FakeOllama
+
+DELAY = 0.1
+
+
+def _reply(body):
+    if body.get("options", {}).get("num_predict") == 8:
+        return "general_query"
+    return "Answer to " + body["messages"][-1]["content"]
+
+
+async def _assistant(tmpdir: str, server: FakeOllama, monkeypatch, **sessions) -> Assistant:
+    config_path = Path(tmpdir) / "config.yaml"
+    config_path.write_text(yaml.dump({
+        "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+        "intents": {"fast_path": False},
+        "slo": {"fallbacks": {"answer": None}},
+        "scheduler": {"concurrency": 64},
+        "plugins": {"enabled": ["general_query"]},
+        "cache": {"enabled": False},
+        "context": {"summarize": False},
+        "sessions": sessions,
+    }))
+    monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+    from kai.ai import clients, llm
+    import kai.core.assistant as assistant_module
+    registry = ClientRegistry()
+    monkeypatch.setattr(clients, "registry", registry)
+    monkeypatch.setattr(llm, "registry", registry)
+    monkeypatch.setattr(assistant_module, "registry", registry)
+
+    assistant = Assistant(str(config_path))
+    await assistant.initialize(preload=False)
+    # The plugin instance is shared across tests; drop any engine it cached
+    monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+    return assistant
+
+
+@pytest.mark.asyncio
+async def test_many_sessions_run_concurrently_with_isolated_history(monkeypatch):
+    """Test 20 sessions x 3 turns take about as long as one session's 3 turns."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply, delay=DELAY) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+
+        async def converse(user):
+            return [await assistant.async_query(f"{user} turn {turn}", session=user) for turn in range(3)]
+
+        users = [f"user{i}" for i in range(20)]
+        start = time.monotonic()
+        replies = await asyncio.gather(*(converse(user) for user in users))
+        elapsed = time.monotonic() - start
+
+        # Serially: 20 sessions * 3 turns * 2 LLM calls * DELAY = 12s
+        assert elapsed < 20 * 3 * 2 * DELAY / 4
+        for user, answers in zip(users, replies):
+            assert answers == [f"Answer to {user} turn {turn}" for turn in range(3)]
+            history = [message["content"] for message in assistant.get_history(user)]
+            assert history == [text for turn in range(3)
+                               for text in (f"{user} turn {turn}", f"Answer to {user} turn {turn}")]
+        assert assistant.get_history() == []
+        assert assistant.session_stats()["sessions"]["active"] == 21
+
+
+@pytest.mark.asyncio
+async def test_turns_of_one_session_run_in_order(monkeypatch):
+    """Test a session's second query waits for, and sees, the first exchange."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply, delay=DELAY) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+
+        first = await assistant.async_query("first", stream=True, session="s")
+        second = asyncio.ensure_future(assistant.async_query("second", session="s"))
+        other = await assistant.async_query("elsewhere", session="t")
+        await asyncio.sleep(DELAY)
+
+        # Another session was answered while "s" is held by the unread stream
+        assert other == "Answer to elsewhere"
+        assert not second.done()
+
+        assert await first.collect() == "Answer to first"
+        assert await second == "Answer to second"
+        answer = [body for endpoint, body in server.requests
+                  if endpoint == "/api/chat" and body["messages"][-1]["content"] == "second"
+                  and body.get("options", {}).get("num_predict") != 8][0]
+        assert [m["content"] for m in answer["messages"][1:-1]] == ["first", "Answer to first"]
+
+
+@pytest.mark.asyncio
+async def test_closed_stream_frees_its_session(monkeypatch):
+    """Test an abandoned stream does not block the session."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+
+        stream = await assistant.async_query("hello", stream=True, session="s")
+        await stream.__anext__()
+        await stream.aclose()
+
+        assert await asyncio.wait_for(assistant.async_query("again", session="s"), 2) == "Answer to again"
+        assert [m["content"] for m in assistant.get_history("s")] == ["again", "Answer to again"]
+
+
+def test_idle_and_excess_sessions_are_evicted():
+    """Test eviction of idle sessions and of the least recently used beyond the limit."""
+    manager = SessionManager(ConversationContext, idle_timeout=60, max_sessions=3)
+    manager.get()
+    old = manager.get("old")
+    manager.get("recent")
+    old.last_active -= 120
+    manager.get(DEFAULT_SESSION).last_active -= 120
+
+    assert manager.evict_idle() == 1
+    assert set(manager.ids()) == {DEFAULT_SESSION, "recent"}
+
+    manager.get("a")
+    manager.get("b")
+    assert set(manager.ids()) == {DEFAULT_SESSION, "a", "b"}
+    assert manager.stats() == {"active": 3, "busy": 0, "evicted": 2}
+    assert manager.get("recent", create=False) is None
@@ -0,0 +1,138 @@
+"""Tests for SLO-driven model downgrade."""
+
+import logging
+import time
+import pytest
+from kai.ai import clients, slo
+from kai.ai.clients import ClientRegistry
+from kai.ai.routing import ModelRouter
+from kai.ai.slo import SLOGuard, SLOPolicy
+from tests.fake_ollama import FakeOllama
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+def slow_big(body: dict) -> str:
+    """Make the big model slow to respond."""
+    if body["model"] == "big":
+        time.sleep(0.15)
+    return "Hello there, how are you?"
+
+
+@pytest.fixture
+def router(monkeypatch):
+    """Router with a slow primary and a fast fallback for answers."""
+    with FakeOllama(reply=slow_big, installed=["big", "small"]) as server:
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+        monkeypatch.setattr(slo, "guard", SLOGuard())
+
+        router = ModelRouter(
+            "big",
+            fallbacks={"answer": "small"},
+            policy=SLOPolicy(ttft=0.1, tokens_per_second=0.0, min_samples=2, recovery_seconds=0.3)
+        )
+        router.check_installed()
+        yield router
+
+        clients.registry.close()
+
+
+def test_policy_needs_enough_samples():
+    """Test a model is only judged after min_samples calls."""
+    policy = SLOPolicy(ttft=1.0, tokens_per_second=10.0, min_samples=3)
+
+    assert policy.violation({"samples": 2, "ttft": 5.0, "tokens_per_second": 1.0}) is None
+    assert "first token" in policy.violation({"samples": 3, "ttft": 5.0, "tokens_per_second": 20.0})
+    assert "tokens/s" in policy.violation({"samples": 3, "ttft": 0.5, "tokens_per_second": 4.0})
+    assert policy.violation({"samples": 3, "ttft": 0.5, "tokens_per_second": None}) is None
+
+
+@pytest.mark.asyncio
+async def test_downgrade_and_recovery(router, caplog):
+    """Test a slow primary is replaced, retried after cool-down, and replaced again."""
+    caplog.set_level(logging.INFO, logger="kai.ai.slo")
+
+    for _ in range(2):
+        assert router.model_for("answer") == "big"
+        await router.engine("answer").achat(MESSAGES, task="answer")
+
+    assert router.model_for("answer") == "small"
+    assert slo.guard.active() == {"answer": "small"}
+    assert "switching big -> small" in caplog.text
+
+    # Fallback traffic does not count against the primary's window
+    await router.engine("answer").achat(MESSAGES, task="answer")
+    assert router.model_for("answer") == "small"
+
+    time.sleep(0.35)
+    assert router.model_for("answer") == "big"
+    assert slo.guard.active() == {}
+    assert "retrying big" in caplog.text
+
+    for _ in range(2):
+        await router.engine("answer").achat(MESSAGES, task="answer")
+    assert router.model_for("answer") == "small"
+
+    assert [(s["from"], s["to"]) for s in slo.guard.switches] == [
+        ("big", "small"), ("small", "big"), ("big", "small")
+    ]
+    assert "answer (fallback)" in router.stats()
+
+
+@pytest.mark.asyncio
+async def test_no_downgrade_to_a_missing_model(monkeypatch):
+    """Test a slow primary is kept when the fallback isn't installed."""
+    with FakeOllama(reply=slow_big, installed=["big"]) as server:
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+        monkeypatch.setattr(slo, "guard", SLOGuard())
+        router = ModelRouter("big", fallbacks={"answer": "small"},
+                             policy=SLOPolicy(ttft=0.1, tokens_per_second=0.0, min_samples=2))
+        assert router.check_installed() == {"big": True, "small": False}
+
+        for _ in range(3):
+            await router.engine("answer").achat(MESSAGES, task="answer")
+        assert router.model_for("answer") == "big"
+        assert slo.guard.active() == {}
+        assert not any(body["model"] == "small" for _, body in server.requests)
+        clients.registry.close()
+
+
+@pytest.mark.asyncio
+async def test_selection_never_asks_the_server(router, monkeypatch):
+    """Test the guard stays on the primary while the fallback's state is unknown, without probing."""
+    small = clients.get_llm("small")
+    monkeypatch.setattr(small, "installed", None)
+
+    def probe():
+        raise AssertionError("is_installed() called while selecting a model")
+
+    monkeypatch.setattr(small, "is_installed", probe)
+
+    for _ in range(3):
+        await router.engine("answer").achat(MESSAGES, task="answer")
+    assert router.model_for("answer") == "big"
+    assert slo.guard.active() == {}
+
+
+@pytest.mark.asyncio
+async def test_streaming_measures_ttft_and_speed():
+    """Test streamed calls record time to first token and tokens per second."""
+    registry = ClientRegistry()
+
+    with FakeOllama(reply="one two three four five", delay=0.1, token_delay=0.01) as server:
+        llm = registry.engine("big", server.host)
+        chunks = [chunk async for chunk in llm.astream_chat(MESSAGES, task="answer")]
+        assert len(chunks) == 5
+
+        performance = llm.performance("answer")
+        assert performance["samples"] == 1
+        assert performance["ttft"] >= 0.1
+        assert 10 < performance["tokens_per_second"] < 200
+
+        llm.reset_performance("answer")
+        assert llm.performance("answer")["samples"] == 0
+
+        await registry.aclose()
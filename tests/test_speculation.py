@@ -0,0 +1,103 @@
+"""Tests for speculative general-query answers."""
+
+import asyncio
+import pytest
+import tempfile
+import time
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from tests.fake_ollama import FakeOllama
+
+
+ANSWER = " ".join(f"word{i}" for i in range(40))
+
+
+def replies(intent: str, classify_delay: float = 0.2):
+    """Classify as the given intent after a delay; answer everything else."""
+    def reply(body: dict) -> str:
+        if "intent classifier" in body["messages"][0]["content"]:
+            time.sleep(classify_delay)
+            return intent
+        return ANSWER
+    return reply
+
+
+@pytest.fixture
+def make_assistant(monkeypatch):
+    """Build a speculative assistant with only the general query plugin."""
+    tmpdir = tempfile.TemporaryDirectory()
+
+    async def make(server):
+        config_path = Path(tmpdir.name) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "intents": {"speculative": True, "fast_path": False},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients
+        monkeypatch.setattr(clients, "registry", ClientRegistry())
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        # The plugin instance is shared across tests; drop any engine it cached
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+        return assistant
+
+    yield make
+    tmpdir.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_speculation_hit_overlaps_classification(make_assistant):
+    """Test the answer is generated while the intent is being classified."""
+    with FakeOllama(reply=replies("general_query"), token_delay=0.01) as server:
+        assistant = await make_assistant(server)
+
+        started = time.monotonic()
+        response = await assistant.async_query("tell me something")
+        elapsed = time.monotonic() - started
+
+        assert response == ANSWER
+        # Classification (0.2s) and the answer (40 x 10ms) ran side by side
+        assert elapsed < 0.55
+        assert assistant.speculation_stats() == {
+            "launched": 1, "hits": 1, "misses": 0, "wasted_tokens": 0, "hit_rate": 1.0
+        }
+        assert assistant.get_history()[-1]["content"] == ANSWER
+
+
+@pytest.mark.asyncio
+async def test_speculation_miss_cancels_promptly(make_assistant):
+    """Test a non-general intent cancels the speculative answer."""
+    with FakeOllama(reply=replies("launch_app", classify_delay=0.05), token_delay=0.02) as server:
+        assistant = await make_assistant(server)
+
+        response = await assistant.async_query("do the thing")
+        assert response.startswith("I don't know how to handle")
+
+        stats = assistant.speculation_stats()
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.0
+        assert 0 < stats["wasted_tokens"] < 40
+
+        # The server sees the stream closed long before it would have finished
+        for _ in range(50):
+            if server.disconnects:
+                break
+            await asyncio.sleep(0.02)
+        assert server.disconnects == 1
+
+
+@pytest.mark.asyncio
+async def test_speculation_streams(make_assistant):
+    """Test an adopted speculative answer can be streamed."""
+    with FakeOllama(reply=replies("general_query", classify_delay=0.05)) as server:
+        assistant = await make_assistant(server)
+
+        stream = await assistant.async_query("tell me something", stream=True)
+        assert await stream.collect() == ANSWER
+        assert assistant.speculation["hits"] == 1
@@ -0,0 +1,142 @@
+"""Tests for per-turn latency tracing."""
+
+import asyncio
+import json
+import tempfile
+import time
+import pytest
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.core.assistant import Assistant
+from kai.core.tracing import NOOP_SPAN, Tracer, tracer
+from tests.fake_ollama import FakeOllama
+
+
+def _by_name(trace: dict) -> dict:
+    return {span["name"]: span for span in trace["spans"]}
+
+
+def test_nested_spans_are_written_as_one_line_per_trace():
+    """Test spans attach to the current span, and the trace is written when the root ends."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "traces.jsonl"
+        local = Tracer(path=str(path), enabled=True)
+
+        async def turn():
+            with local.span("turn", session="default") as root:
+                async def stage(name):
+                    with local.span(name):
+                        await asyncio.sleep(0.02)
+
+                await asyncio.gather(stage("stt"), stage("intent"))
+                local.record("llm", time.monotonic() - 0.01, model="m")
+                local.annotate(intent="general_query")
+                assert local.current() is root
+
+        asyncio.run(turn())
+        with local.span("wake"):
+            pass
+        local.close()
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [trace["name"] for trace in lines] == ["turn", "wake"]
+        trace = lines[0]
+        spans = _by_name(trace)
+        assert trace["attributes"] == {"session": "default", "intent": "general_query"}
+        assert spans["turn"]["parent"] is None and spans["turn"]["start"] == 0
+        assert {spans[name]["parent"] for name in ("stt", "intent", "llm")} == {spans["turn"]["id"]}
+        assert spans["llm"]["attributes"] == {"model": "m"}
+        assert spans["stt"]["duration"] >= 0.02
+        assert trace["duration"] >= spans["stt"]["duration"]
+        assert lines[1]["trace_id"] != trace["trace_id"]
+
+
+def test_disabled_tracer_costs_next_to_nothing():
+    """Test a disabled tracer hands out the shared no-op span and records nothing."""
+    local = Tracer()
+    assert local.span("stt") is NOOP_SPAN
+    assert local.start("turn") is NOOP_SPAN
+    assert local.current() is NOOP_SPAN
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        with local.span("stt") as span:
+            span.set(status="success")
+    per_call = (time.perf_counter() - start) / 100000
+
+    assert not local.recent and local.stats["spans"] == 0
+    assert per_call < 5e-6
+
+
+@pytest.mark.asyncio
+async def test_followed_stream_keeps_the_span_open():
+    """Test work done while a followed stream is consumed belongs to the span."""
+    local = Tracer(enabled=True)
+
+    async def chunks():
+        for word in ("one", "two"):
+            local.record("llm.token", time.monotonic(), word=word)
+            yield word
+
+    with local.span("turn") as turn:
+        stream = local.follow(turn, chunks())
+    assert turn.end is None
+
+    assert [chunk async for chunk in stream] == ["one", "two"]
+    assert turn.end is not None
+    trace = local.recent[-1]
+    assert [span["name"] for span in trace["spans"]] == ["turn", "llm.token", "llm.token"]
+
+
+@pytest.mark.asyncio
+async def test_assistant_turns_are_traced(monkeypatch):
+    """Test a turn's trace covers intent recognition, the plugin and the LLM call."""
+    def reply(body):
+        return "general_query" if body.get("options", {}).get("num_predict") == 8 else "Traced answer."
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=reply) as server:
+        config_path = Path(tmpdir) / "config.yaml"
+        config_path.write_text(yaml.dump({
+            "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+            "intents": {"fast_path": False},
+            "slo": {"fallbacks": {"answer": None}},
+            "plugins": {"enabled": ["general_query"]},
+            "cache": {"enabled": False},
+            "context": {"summarize": False},
+            "tracing": {"enabled": True},
+        }))
+        monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+        from kai.ai import clients, llm
+        import kai.core.assistant as assistant_module
+        registry = ClientRegistry()
+        monkeypatch.setattr(clients, "registry", registry)
+        monkeypatch.setattr(llm, "registry", registry)
+        monkeypatch.setattr(assistant_module, "registry", registry)
+        # The tracer is process-wide; put it back as found
+        monkeypatch.setattr(tracer, "enabled", tracer.enabled)
+        monkeypatch.setattr(tracer, "path", tracer.path)
+
+        assistant = Assistant(str(config_path))
+        await assistant.initialize(preload=False)
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+
+        assert await assistant.async_query("first") == "Traced answer."
+        stream = await assistant.async_query("second", stream=True)
+        assert await stream.collect() == "Traced answer."
+        tracer.close()
+
+        traces = [json.loads(line) for line in (Path(tmpdir) / "traces.jsonl").read_text().splitlines()]
+        assert [trace["name"] for trace in traces] == ["turn", "turn"]
+        for trace, streamed in zip(traces, (False, True)):
+            spans = _by_name(trace)
+            assert trace["attributes"] == {"session": "default", "stream": streamed, "intent": "general_query"}
+            assert spans["intent.recognize"]["attributes"]["method"] == "llm"
+            assert spans["plugin.execute"]["attributes"]["plugin"] == "general_query"
+            answers = [span for span in trace["spans"]
+                       if span["name"] == "llm" and span["attributes"]["task"] == "answer"]
+            assert len(answers) == 1 and answers[0]["attributes"]["model"] == "m"
+            assert answers[0]["start"] + answers[0]["duration"] <= trace["duration"] + 1e-6
+            plugin = spans["plugin.execute"]
+            assert plugin["start"] + plugin["duration"] >= answers[0]["start"] + answers[0]["duration"] - 1e-6
@@ -0,0 +1,310 @@
+"""Tests for the staged voice pipeline, with stand-ins for microphone, STT and TTS."""
+
+import array
+import asyncio
+import tempfile
+import threading
+import time
+import pytest
+import yaml
+from pathlib import Path
+from kai.ai.clients import ClientRegistry
+from kai.audio.pipeline import EnergyDetector, Stage, VoicePipeline
+from kai.core.assistant import Assistant
+from kai.core.tracing import tracer
+from tests.fake_ollama import FakeOllama
+
+CHUNK = 1024
+LOUD = array.array("h", [8000] * CHUNK).tobytes()
+QUIET = bytes(CHUNK * 2)
+# Wake, a short utterance, then enough silence to end it
+UTTERANCE = [LOUD] * 5 + [QUIET] + [LOUD] * 5 + [QUIET] * 5
+
+
+class FakeSource:
+    """Plays back frames, then keeps sending silence until closed if asked to."""
+
+    def __init__(self, frames, hold: bool = False, interval: float = 0.001):
+        self.frames = list(frames)
+        self.hold = hold
+        self.interval = interval
+        self.closed = threading.Event()
+
+    def read(self) -> bytes:
+        time.sleep(self.interval)
+        if self.frames:
+            return self.frames.pop(0)
+        if self.hold and not self.closed.is_set():
+            return QUIET
+        return b""
+
+    def close(self):
+        self.closed.set()
+
+
+class FakePlayer:
+    """Records played audio; with block=True each play waits until stop()."""
+
+    def __init__(self, block: bool = False):
+        self.block = block
+        self.played = []
+        self.started = threading.Event()
+        self.stopped = threading.Event()
+
+    def play(self, audio):
+        self.started.set()
+        if self.block:
+            self.stopped.wait(5)
+        self.played.append(audio)
+
+    def stop(self):
+        self.stopped.set()
+
+
+def _reply(body):
+    if body.get("options", {}).get("num_predict") == 8:
+        return "general_query"
+    return "First sentence. Second sentence. Third sentence."
+
+
+async def _assistant(tmpdir: str, server: FakeOllama, monkeypatch) -> Assistant:
+    config_path = Path(tmpdir) / "config.yaml"
+    config_path.write_text(yaml.dump({
+        "models": {"llm": "m", "preload": False, "routes": {"classify": None, "extract": None, "safety": None}},
+        "intents": {"fast_path": False},
+        "slo": {"fallbacks": {"answer": None}},
+        "plugins": {"enabled": ["general_query"]},
+        "cache": {"enabled": False},
+        "context": {"summarize": False},
+    }))
+    monkeypatch.setenv("OLLAMA_HOST", server.host)
+
+    from kai.ai import clients, llm
+    import kai.core.assistant as assistant_module
+    registry = ClientRegistry()
+    monkeypatch.setattr(clients, "registry", registry)
+    monkeypatch.setattr(llm, "registry", registry)
+    monkeypatch.setattr(assistant_module, "registry", registry)
+
+    assistant = Assistant(str(config_path))
+    await assistant.initialize(preload=False)
+    # The plugin instance is shared across tests; drop any engine it cached
+    monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", None)
+    return assistant
+
+
+def _pipeline(assistant, source, player, **kwargs) -> VoicePipeline:
+    kwargs.setdefault("sleep_reply", None)
+    return VoicePipeline(
+        assistant, source, lambda audio: ("what happened today", "success"),
+        synthesizer=str.upper, player=player, detector=EnergyDetector(threshold=1000),
+        silence_seconds=0.2, wake_reply=None, **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_utterance_flows_through_every_stage(monkeypatch):
+    """Test one utterance is transcribed, answered, synthesized and played sentence by sentence."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+        events = []
+        player = FakePlayer()
+        pipeline = _pipeline(assistant, FakeSource(UTTERANCE), player,
+                             on_event=lambda event, payload: events.append(event))
+
+        await asyncio.wait_for(pipeline.run(), 10)
+
+        assert player.played == ["FIRST SENTENCE.", "SECOND SENTENCE.", "THIRD SENTENCE."]
+        assert [e for e in events if e not in ("delta", "spoken", "first_audio")] == [
+            "wake", "utterance", "text", "intent", "response"]
+        assert events.count("first_audio") == 1
+        assert [m["content"] for m in assistant.get_history(session="voice")] == [
+            "what happened today", "First sentence. Second sentence. Third sentence."]
+
+        stats = pipeline.stats()
+        assert list(stats) == ["capture", "wake", "stt", "nlu", "plugin", "tts", "playback"]
+        assert stats["capture"]["items"] == len(UTTERANCE)
+        assert stats["wake"]["items"] == len(UTTERANCE)
+        assert [stats[name]["items"] for name in ("stt", "nlu", "plugin")] == [1, 1, 1]
+        assert stats["tts"]["items"] == stats["playback"]["items"] == 3
+        assert all(stage["errors"] == 0 for stage in stats.values())
+
+
+@pytest.mark.asyncio
+async def test_failed_answer_is_reported_not_spoken(monkeypatch):
+    """Test an error mid-answer ends the turn with an event and the error reply, not the error text."""
+    class FailingEngine:
+        async def astream_chat(self, messages, task=None):
+            yield "First sentence. "
+            raise ConnectionError("server went away")
+
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+        monkeypatch.setattr(assistant.plugin_manager.plugins["general_query"], "llm", FailingEngine())
+        events = []
+        player = FakePlayer()
+        pipeline = _pipeline(assistant, FakeSource(UTTERANCE), player,
+                             on_event=lambda event, payload: events.append((event, payload)))
+
+        await asyncio.wait_for(pipeline.run(), 10)
+
+        assert player.played == ["FIRST SENTENCE.", "SORRY, SOMETHING WENT WRONG"]
+        errors = [payload for event, payload in events if event == "error"]
+        assert len(errors) == 1 and isinstance(errors[0], ConnectionError)
+        assert "response" not in [event for event, _ in events]
+        assert assistant.get_history(session="voice") == []
+        assert not assistant.session("voice").lock.locked()
+        assert pipeline.stats()["plugin"]["errors"] == 1
+
+
+@pytest.mark.asyncio
+async def test_voice_turn_trace_ends_after_the_last_sentence(monkeypatch):
+    """Test the turn's trace spans every stage and closes once playback is done."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+        monkeypatch.setattr(tracer, "enabled", True)
+        monkeypatch.setattr(tracer, "path", None)
+        tracer.recent.clear()
+        pipeline = _pipeline(assistant, FakeSource(UTTERANCE), FakePlayer())
+
+        await asyncio.wait_for(pipeline.run(), 10)
+
+        wake, turn = list(tracer.recent)
+        assert wake["name"] == "wake"
+        assert turn["name"] == "turn"
+        assert turn["attributes"]["intent"] == "general_query"
+        assert 0 < turn["attributes"]["first_audio"] <= turn["duration"]
+        names = [span["name"] for span in turn["spans"]]
+        for name in ("stt", "nlu", "intent.recognize", "plugin", "plugin.execute", "llm"):
+            assert name in names
+        assert names.count("tts") == names.count("playback") == 3
+        last = max(span["start"] + span["duration"] for span in turn["spans"] if span["name"] == "playback")
+        assert last <= turn["duration"] + 1e-6
+
+
+@pytest.mark.asyncio
+async def test_interrupt_stops_playback_and_frees_the_session(monkeypatch):
+    """Test interrupt() cancels the turn mid-speech while capture keeps reading."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply, token_delay=0.02) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+        player = FakePlayer(block=True)
+        source = FakeSource(UTTERANCE, hold=True)
+        pipeline = _pipeline(assistant, source, player)
+        await pipeline.start()
+
+        assert await asyncio.to_thread(player.started.wait, 5)
+        assert pipeline.responding
+        frames = pipeline.stats()["wake"]["items"]
+        await asyncio.sleep(0.1)
+        # The microphone is still read while Kai speaks
+        assert pipeline.stats()["wake"]["items"] > frames
+
+        assert pipeline.interrupt() >= 1
+        assert player.stopped.is_set()
+        await asyncio.sleep(0.1)
+        assert not pipeline.responding
+        assert not assistant.session("voice").lock.locked()
+        assert pipeline.stats()["playback"]["cancelled"] >= 1
+        assert len(player.played) <= 1
+
+        # The session takes the next turn right away
+        assert await asyncio.wait_for(assistant.async_query("again", session="voice"), 5)
+        await pipeline.stop()
+
+
+@pytest.mark.asyncio
+async def test_going_back_to_sleep_is_announced(monkeypatch):
+    """Test the pipeline says so when it stops listening after a quiet spell."""
+    with tempfile.TemporaryDirectory() as tmpdir, FakeOllama(reply=_reply) as server:
+        assistant = await _assistant(tmpdir, server, monkeypatch)
+        player = FakePlayer()
+        source = FakeSource([LOUD] * 5, hold=True)
+        events = []
+        pipeline = _pipeline(assistant, source, player, awake_seconds=0.1, sleep_reply="Going to sleep",
+                             on_event=lambda event, payload: events.append(event))
+        await pipeline.start()
+
+        for _ in range(100):
+            if "GOING TO SLEEP" in player.played:
+                break
+            await asyncio.sleep(0.02)
+        assert player.played == ["GOING TO SLEEP"]
+        assert events[:2] == ["wake", "sleep"]
+        await pipeline.stop()
+
+
+def test_wake_needs_consecutive_loud_frames():
+    """Test the detector calibrates on ambient noise, then wakes on a sustained loud sound."""
+    detector = EnergyDetector(calibration_frames=3, wake_frames=2)
+    assert not any(detector.is_wake(QUIET) for _ in range(3))
+    assert detector.threshold == 300.0
+    assert detector.energy(LOUD) == 8000.0
+
+    assert not detector.is_wake(LOUD)
+    assert not detector.is_wake(QUIET)
+    assert not detector.is_wake(LOUD)
+    assert detector.is_wake(LOUD)
+
+
+@pytest.mark.asyncio
+async def test_stage_backpressure_and_dropping():
+    """Test put() waits while a stage is full and offer() drops the oldest item instead."""
+    release = asyncio.Event()
+    seen = []
+
+    async def slow(item):
+        await release.wait()
+        seen.append(item)
+
+    stage = Stage("slow", slow, maxsize=1)
+    stage.start()
+    await stage.put(1)
+    await asyncio.sleep(0)  # Worker takes item 1
+    await stage.put(2)
+
+    blocked = asyncio.ensure_future(stage.put(3))
+    await asyncio.sleep(0.05)
+    assert not blocked.done()
+
+    release.set()
+    await asyncio.wait_for(blocked, 1)
+    await stage.queue.join()
+    assert seen == [1, 2, 3]
+
+    release.clear()
+    await stage.put(4)
+    await asyncio.sleep(0)
+    assert stage.offer(5)
+    assert not stage.offer(6)
+    release.set()
+    await stage.queue.join()
+    assert seen == [1, 2, 3, 4, 6]
+    assert stage.stats()["dropped"] == 1
+    assert stage.stats()["max_depth"] == 1
+    await stage.stop()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_a_stage_item_keeps_the_stage_running():
+    """Test cancel() abandons only the current item and counts it."""
+    stopped = []
+
+    async def handler(item):
+        if item == "hang":
+            await asyncio.sleep(10)
+
+    stage = Stage("work", handler, maxsize=2, on_cancel=lambda: stopped.append(True))
+    stage.start()
+    await stage.put("hang")
+    await asyncio.sleep(0.01)
+    assert stage.busy
+
+    assert stage.cancel() == 1
+    await stage.put("next")
+    await asyncio.wait_for(stage.queue.join(), 1)
+
+    stats = stage.stats()
+    assert stats["cancelled"] == 1
+    assert stats["items"] == 1
+    assert stopped == [True]
+    await stage.stop()
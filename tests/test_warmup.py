@@ -0,0 +1,56 @@
+"""Tests for model warm-up and keep-alive."""
+
+import time
+from kai.ai.clients import ClientRegistry
+from kai.ai.warmup import ModelWarmer
+from tests.fake_ollama import FakeOllama
+
+
+def test_preload_makes_first_query_warm():
+    """Test preloading removes model load time from the first query."""
+    registry = ClientRegistry()
+
+    with FakeOllama(reply="Hi.", load_delay=0.3) as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        assert not llm.is_loaded()
+
+        warmer = ModelWarmer([llm])
+        warmer.preload(wait=True)
+        assert warmer.states() == {"llama3.2:3b": "loaded"}
+        assert llm.is_loaded()
+        assert llm.load_seconds >= 0.3
+
+        start = time.monotonic()
+        assert llm.generate("hello") == "Hi."
+        assert time.monotonic() - start < 0.3
+
+    registry.close()
+
+
+def test_keepalive_hints_sent_periodically():
+    """Test the keep-alive loop touches the model until stopped."""
+    registry = ClientRegistry()
+    registry.set_keep_alive("30m")
+
+    with FakeOllama() as server:
+        llm = registry.engine("llama3.2:3b", server.host)
+        warmer = ModelWarmer([llm], interval=0.05)
+        warmer.start()
+        time.sleep(0.3)
+        warmer.stop()
+
+        hints = [body for path, body in server.requests if path == "/api/generate"]
+        assert len(hints) >= 3
+        assert all(body["keep_alive"] == "30m" for body in hints)
+
+    registry.close()
+
+
+def test_failed_warmup_state():
+    """Test an unreachable server marks the model as failed."""
+    registry = ClientRegistry()
+    llm = registry.engine("llama3.2:3b", "http://127.0.0.1:9")
+
+    assert not llm.warmup()
+    assert llm.load_state == "failed"
+    registry.close()